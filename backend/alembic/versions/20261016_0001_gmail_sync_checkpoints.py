@@ -0,0 +1,39 @@
+"""gmail history sync checkpoints
+
+Revision ID: 20261016_0001
+Revises: 20260805_0001
+Create Date: 2026-10-16 09:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261016_0001"
+down_revision = "20260805_0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "gmail_sync_checkpoints",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("account_email", sa.String(length=320), nullable=False),
+        sa.Column("history_id", sa.String(length=64), nullable=False),
+        sa.Column("ingestion_run_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["ingestion_run_id"], ["ingestion_runs.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_gmail_sync_checkpoints_account_email"),
+        "gmail_sync_checkpoints",
+        ["account_email"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_gmail_sync_checkpoints_account_email"), table_name="gmail_sync_checkpoints")
+    op.drop_table("gmail_sync_checkpoints")
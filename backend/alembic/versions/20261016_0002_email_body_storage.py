@@ -0,0 +1,36 @@
+"""content-addressed email body storage
+
+Revision ID: 20261016_0002
+Revises: 20261016_0001
+Create Date: 2026-10-16 10:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261016_0002"
+down_revision = "20261016_0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "email_bodies",
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("codec", sa.String(length=16), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("content_hash"),
+    )
+    op.add_column("processed_emails", sa.Column("html_body_key", sa.String(length=64), nullable=True))
+    op.add_column("processed_emails", sa.Column("text_body_key", sa.String(length=64), nullable=True))
+    op.add_column("processed_emails", sa.Column("raw_mime_key", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("processed_emails", "raw_mime_key")
+    op.drop_column("processed_emails", "text_body_key")
+    op.drop_column("processed_emails", "html_body_key")
+    op.drop_table("email_bodies")
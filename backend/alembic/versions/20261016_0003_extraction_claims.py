@@ -0,0 +1,27 @@
+"""extraction work-queue claims
+
+Revision ID: 20261016_0003
+Revises: 20261016_0002
+Create Date: 2026-10-16 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261016_0003"
+down_revision = "20261016_0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("processed_emails", sa.Column("extraction_claimed_by", sa.String(length=64), nullable=True))
+    op.add_column(
+        "processed_emails",
+        sa.Column("extraction_lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("processed_emails", "extraction_lease_expires_at")
+    op.drop_column("processed_emails", "extraction_claimed_by")
@@ -0,0 +1,31 @@
+"""record parser name and version per email
+
+Revision ID: 20261016_0005
+Revises: 20261016_0004
+Create Date: 2026-10-16 16:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261016_0005"
+down_revision = "20261016_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("processed_emails", sa.Column("parser_name", sa.String(length=64), nullable=True))
+    op.add_column("processed_emails", sa.Column("parser_version", sa.Integer(), nullable=True))
+    op.create_index(
+        "ix_processed_emails_parser_name_version",
+        "processed_emails",
+        ["parser_name", "parser_version"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_processed_emails_parser_name_version", table_name="processed_emails")
+    op.drop_column("processed_emails", "parser_version")
+    op.drop_column("processed_emails", "parser_name")
@@ -0,0 +1,29 @@
+"""store the RFC 822 Message-ID per email
+
+Revision ID: 20261017_0001
+Revises: 20261016_0005
+Create Date: 2026-10-17 09:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0001"
+down_revision = "20261016_0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("processed_emails", sa.Column("rfc822_message_id", sa.Text(), nullable=True))
+    op.create_index(
+        "ix_processed_emails_rfc822_message_id",
+        "processed_emails",
+        ["rfc822_message_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_processed_emails_rfc822_message_id", table_name="processed_emails")
+    op.drop_column("processed_emails", "rfc822_message_id")
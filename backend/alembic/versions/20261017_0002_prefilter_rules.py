@@ -0,0 +1,22 @@
+"""record which prefilter rules skipped an email
+
+Revision ID: 20261017_0002
+Revises: 20261017_0001
+Create Date: 2026-10-17 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0002"
+down_revision = "20261017_0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("processed_emails", sa.Column("prefilter_rules", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("processed_emails", "prefilter_rules")
@@ -49,6 +49,8 @@ def run_gmail_cron(
             jobs_found=response.jobs_found,
             jobs_created=response.jobs_created,
             duplicates_skipped=response.duplicates_skipped,
+            remaining_pending=extraction_result.remaining_pending,
+            stopped_due_to_budget=extraction_result.stopped_due_to_budget,
             errors=len(response.errors),
         )
         return response
@@ -2,16 +2,18 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 
 from app.api.deps import get_db
 from app.db.models import ProcessedEmail
 from app.schemas.email import ProcessedEmailListResponse, ProcessedEmailResponse
 from app.schemas.extraction import EmailExtractionResponse
+from app.services.body_storage import EmailBodies, get_body_storage
 from app.services.extraction_service import ExtractionService
 
 router = APIRouter()
-extraction_service = ExtractionService()
+body_storage = get_body_storage()
+extraction_service = ExtractionService(body_storage=body_storage)
 
 
 @router.get("", response_model=ProcessedEmailListResponse)
@@ -21,10 +23,17 @@ def list_processed_emails(
 ) -> ProcessedEmailListResponse:
     emails = db.scalars(
         select(ProcessedEmail)
+        .options(
+            undefer(ProcessedEmail.raw_html_body),
+            undefer(ProcessedEmail.plain_text_body),
+            undefer(ProcessedEmail.has_raw_mime),
+        )
         .order_by(ProcessedEmail.received_date.desc().nullslast(), ProcessedEmail.id.desc())
         .limit(limit)
     ).all()
-    items = [ProcessedEmailResponse.model_validate(email) for email in emails]
+    items = [
+        _email_response(email, bodies) for email, bodies in zip(emails, body_storage.load_many(db, emails))
+    ]
     return ProcessedEmailListResponse(total=len(items), items=items)
 
 
@@ -35,3 +44,12 @@ def extract_email(email_id: int, db: Session = Depends(get_db)) -> EmailExtracti
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Email not found.")
     db.commit()
     return EmailExtractionResponse.model_validate(result)
+
+
+def _email_response(email: ProcessedEmail, bodies: EmailBodies) -> ProcessedEmailResponse:
+    response = ProcessedEmailResponse.model_validate(email)
+    if email.html_body_key is None and email.text_body_key is None and email.raw_mime_key is None:
+        return response
+    return response.model_copy(
+        update={"raw_html_body": bodies.html_body, "plain_text_body": bodies.plain_text_body}
+    )
@@ -28,8 +28,30 @@ class Settings(BaseSettings):
     google_client_id: str | None = Field(default=None, alias="GOOGLE_CLIENT_ID")
     google_client_secret: str | None = Field(default=None, alias="GOOGLE_CLIENT_SECRET")
     gmail_token_json: str | None = Field(default=None, alias="GMAIL_TOKEN_JSON")
+    gmail_account_email: str | None = Field(default=None, alias="GMAIL_ACCOUNT_EMAIL")
+    gmail_discovery_document_path: Path | None = Field(default=None, alias="GMAIL_DISCOVERY_DOCUMENT_PATH")
     gmail_query: str = Field(default="is:unread", alias="GMAIL_QUERY")
     gmail_max_results: int = Field(default=50, alias="GMAIL_MAX_RESULTS")
+    gmail_batch_size: int = Field(default=50, alias="GMAIL_BATCH_SIZE")
+    gmail_raw_only: bool = Field(default=False, alias="GMAIL_RAW_ONLY")
+    gmail_metadata_prefilter: bool = Field(default=False, alias="GMAIL_METADATA_PREFILTER")
+    gmail_fetch_workers: int = Field(default=1, alias="GMAIL_FETCH_WORKERS")
+    gmail_quota_units_per_second: float = Field(default=250.0, alias="GMAIL_QUOTA_UNITS_PER_SECOND")
+    gmail_incremental_sync: bool = Field(default=False, alias="GMAIL_INCREMENTAL_SYNC")
+    gmail_history_label_id: str | None = Field(default="INBOX", alias="GMAIL_HISTORY_LABEL_ID")
+    extraction_chunk_size: int = Field(default=100, alias="EXTRACTION_CHUNK_SIZE")
+    extraction_parse_workers: int = Field(default=1, alias="EXTRACTION_PARSE_WORKERS")
+    extraction_time_budget_seconds: float = Field(default=0.0, alias="EXTRACTION_TIME_BUDGET_SECONDS")
+    extraction_lease_seconds: int = Field(default=300, alias="EXTRACTION_LEASE_SECONDS")
+    html_parser_engine: str = Field(default="html.parser", alias="HTML_PARSER_ENGINE")
+    parse_cache_max_entries: int = Field(default=1024, alias="PARSE_CACHE_MAX_ENTRIES")
+    parse_cache_persistent: bool = Field(default=False, alias="PARSE_CACHE_PERSISTENT")
+    ingestion_pipeline_enabled: bool = Field(default=False, alias="INGESTION_PIPELINE_ENABLED")
+    ingestion_pipeline_queue_size: int = Field(default=4, alias="INGESTION_PIPELINE_QUEUE_SIZE")
+    body_storage_backend: str = Field(default="inline", alias="BODY_STORAGE_BACKEND")
+    body_storage_compression: str = Field(default="zlib", alias="BODY_STORAGE_COMPRESSION")
+    body_storage_s3_endpoint_url: str | None = Field(default=None, alias="BODY_STORAGE_S3_ENDPOINT_URL")
+    body_storage_s3_bucket: str = Field(default="petromatch", alias="BODY_STORAGE_S3_BUCKET")
     cron_secret: str | None = Field(default=None, alias="CRON_SECRET")
     allowed_origins: str = Field(default="http://localhost:3000", alias="ALLOWED_ORIGINS")
     db_pool_size: int = Field(default=1, alias="DB_POOL_SIZE")
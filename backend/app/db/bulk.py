@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Column, inspect
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+
+
+def row_values(instance: Base) -> dict[str, Any]:
+    values: dict[str, Any] = {}
+    for attribute in inspect(type(instance)).column_attrs:
+        column = attribute.columns[0]
+        if not isinstance(column, Column):
+            continue
+        value = getattr(instance, attribute.key)
+        if value is None and column.default is not None:
+            value = column.default.arg(None) if column.default.is_callable else column.default.arg
+        if value is None and (column.primary_key or column.server_default is not None):
+            continue
+        values[column.key] = value
+    return values
+
+
+def insert_on_conflict_do_nothing(
+    db: Session,
+    model: type[Base],
+    rows: Sequence[dict[str, Any]],
+    *,
+    index_elements: list[str] | None = None,
+    returning: Sequence[Any] = (),
+) -> list[Row[Any]]:
+    if not rows:
+        return []
+
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Bulk conflict-ignoring inserts are not supported on {dialect_name}.")
+
+    statement = insert(model.__table__).on_conflict_do_nothing(index_elements=index_elements)
+    if not returning:
+        db.execute(statement, list(rows))
+        return []
+    # executemany + RETURNING is sent as multi-row VALUES statements ("insertmanyvalues").
+    return list(db.execute(statement.returning(*returning), list(rows)).all())
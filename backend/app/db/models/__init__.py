@@ -1,5 +1,8 @@
+from app.db.models.email_body import EmailBody
+from app.db.models.gmail_sync_checkpoint import GmailSyncCheckpoint
 from app.db.models.ingestion_run import IngestionRun
 from app.db.models.job import Job
+from app.db.models.parse_cache_entry import ParseCacheEntry
 from app.db.models.processed_email import ProcessedEmail
 
-__all__ = ["IngestionRun", "Job", "ProcessedEmail"]
+__all__ = ["EmailBody", "GmailSyncCheckpoint", "IngestionRun", "Job", "ParseCacheEntry", "ProcessedEmail"]
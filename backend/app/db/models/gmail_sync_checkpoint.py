@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class GmailSyncCheckpoint(Base):
+    __tablename__ = "gmail_sync_checkpoints"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    account_email: Mapped[str] = mapped_column(String(320), nullable=False, unique=True, index=True)
+    history_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    ingestion_run_id: Mapped[int | None] = mapped_column(
+        ForeignKey("ingestion_runs.id", ondelete="SET NULL"), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import JSON
+
+from app.db.base import Base
+
+JSONVariant = JSON().with_variant(JSONB(astext_type=Text()), "postgresql")
+
+
+class ParseCacheEntry(Base):
+    __tablename__ = "parse_cache_entries"
+
+    parser_source: Mapped[str] = mapped_column(String(64), primary_key=True)
+    parser_version: Mapped[int] = mapped_column(Integer, primary_key=True)
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    opportunities: Mapped[list[dict[str, Any]]] = mapped_column(JSONVariant, nullable=False, default=list)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -3,9 +3,9 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import DateTime, Integer, String, Text, func
+from sqlalchemy import DateTime, Index, Integer, String, Text, func, or_
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 from sqlalchemy.types import JSON
 
 from app.db.base import Base
@@ -15,6 +15,7 @@ JSONVariant = JSON().with_variant(JSONB(astext_type=Text()), "postgresql")
 
 class ProcessedEmail(Base):
     __tablename__ = "processed_emails"
+    __table_args__ = (Index("ix_processed_emails_parser_name_version", "parser_name", "parser_version"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     gmail_message_id: Mapped[str] = mapped_column(String(255), nullable=False, unique=True, index=True)
@@ -24,13 +25,22 @@ class ProcessedEmail(Base):
     recipients: Mapped[list[str]] = mapped_column(JSONVariant, nullable=False, default=list)
     subject: Mapped[str | None] = mapped_column(Text, nullable=True)
     received_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
-    raw_html_body: Mapped[str | None] = mapped_column(Text, nullable=True)
-    plain_text_body: Mapped[str | None] = mapped_column(Text, nullable=True)
-    raw_mime: Mapped[str | None] = mapped_column(Text, nullable=True)
+    raw_html_body: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)
+    plain_text_body: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)
+    raw_mime: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)
+    html_body_key: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    text_body_key: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    raw_mime_key: Mapped[str | None] = mapped_column(String(64), nullable=True)
     headers: Mapped[dict[str, Any] | None] = mapped_column(JSONVariant, nullable=True)
+    rfc822_message_id: Mapped[str | None] = mapped_column(Text, nullable=True, index=True)
+    prefilter_rules: Mapped[str | None] = mapped_column(String(64), nullable=True)
     status: Mapped[str] = mapped_column(String(32), nullable=False, default="ingested", index=True)
     error_summary: Mapped[str | None] = mapped_column(Text, nullable=True)
     extraction_status: Mapped[str] = mapped_column(String(32), nullable=False, default="pending", index=True)
+    extraction_claimed_by: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    extraction_lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    parser_name: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    parser_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
     parsed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     jobs_extracted_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     parsing_error: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -39,8 +49,6 @@ class ProcessedEmail(Base):
         DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
     )
 
-    jobs: Mapped[list["Job"]] = relationship(back_populates="processed_email", cascade="all, delete-orphan")
+    has_raw_mime: Mapped[bool] = column_property(or_(raw_mime_key.is_not(None), raw_mime.is_not(None)), deferred=True)
 
-    @property
-    def has_raw_mime(self) -> bool:
-        return bool(self.raw_mime)
+    jobs: Mapped[list["Job"]] = relationship(back_populates="processed_email", cascade="all, delete-orphan")
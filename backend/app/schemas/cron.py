@@ -16,6 +16,7 @@ class DailyIngestionResponse(ORMModel):
     gmail: dict[str, int] | None = None
     airswift: dict[str, Any] | None = None
     sources: dict[str, dict[str, Any]] | None = None
+    pipeline: dict[str, dict[str, float]] | None = None
 
 
 class GmailCronResponse(ORMModel):
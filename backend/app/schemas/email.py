@@ -20,6 +20,8 @@ class ProcessedEmailResponse(ORMModel):
     status: str
     error_summary: str | None = None
     extraction_status: str
+    parser_name: str | None = None
+    parser_version: int | None = None
     parsed_at: datetime | None = None
     jobs_extracted_count: int
     parsing_error: str | None = None
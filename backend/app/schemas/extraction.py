@@ -13,6 +13,8 @@ class ExtractionRunResponse(ORMModel):
     jobs_created: int
     duplicates_skipped: int
     errors: list[str] = []
+    remaining_pending: int = 0
+    stopped_due_to_budget: bool = False
 
 
 class EmailExtractionResponse(ORMModel):
@@ -0,0 +1,393 @@
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from typing import Any
+
+from bs4 import Tag
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.base import Base
+from app.db.models import ProcessedEmail
+from app.services.body_storage import BodyStorage
+from app.services.extraction_service import ExtractionService
+from app.services.gmail_client import GmailClient, gmail_discovery_document
+from app.services.parsers import EmailParseContext, GenericEmailParser, LinkedInEmailParser, ParseCache
+from app.services.parsers.templates import TemplateCache
+from app.services.parsers.utils import (
+    HTML_PARSER_ENGINES,
+    BlockIndex,
+    closest_repeating_block,
+    html_to_soup,
+    visible_text,
+)
+from app.testing.fakes import (
+    FakeGmailApi,
+    fake_gmail_messages,
+    linkedin_digest_html,
+    linkedin_table_digest_html,
+    linkedin_text_digest,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run local PetroMatch performance benchmarks against in-process fakes.")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    gmail_fetch = subparsers.add_parser("gmail-fetch", help="Compare per-message and batched Gmail fetches.")
+    gmail_fetch.add_argument("--messages", type=int, default=200)
+    gmail_fetch.add_argument("--latency-ms", type=float, default=40.0, help="Simulated latency per HTTP round trip.")
+    gmail_fetch.add_argument("--batch-size", type=int, default=50)
+    gmail_fetch.add_argument("--workers", type=int, default=4)
+
+    gmail_startup = subparsers.add_parser(
+        "gmail-startup",
+        help="Compare cold-start Gmail service construction and the list_message_ids critical path.",
+    )
+    gmail_startup.add_argument("--iterations", type=int, default=20)
+    gmail_startup.add_argument("--latency-ms", type=float, default=40.0, help="Simulated latency per HTTP round trip.")
+
+    extraction = subparsers.add_parser("extraction", help="Count database round trips spent extracting jobs.")
+    extraction.add_argument("--emails", type=int, default=20)
+    extraction.add_argument("--jobs-per-email", type=int, default=25)
+
+    parse_pool = subparsers.add_parser("parse-pool", help="Compare in-process and multi-process email parsing.")
+    parse_pool.add_argument("--emails", type=int, default=200)
+    parse_pool.add_argument("--jobs-per-email", type=int, default=25)
+    parse_pool.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts to compare.")
+
+    parse_cache = subparsers.add_parser("parse-cache", help="Compare cold and cached parsing of repeated digests.")
+    parse_cache.add_argument("--emails", type=int, default=200)
+    parse_cache.add_argument("--distinct", type=int, default=20, help="Distinct digest bodies among the emails.")
+    parse_cache.add_argument("--jobs-per-email", type=int, default=25)
+
+    html_engine = subparsers.add_parser("html-engine", help="Compare HTML_PARSER_ENGINE options on LinkedIn digests.")
+    html_engine.add_argument("--emails", type=int, default=100)
+    html_engine.add_argument("--jobs-per-email", type=int, default=25)
+
+    block_detection = subparsers.add_parser(
+        "block-detection",
+        help="Compare per-anchor subtree rendering with the one-pass BlockIndex on a table-based digest.",
+    )
+    block_detection.add_argument("--jobs", type=int, default=200)
+    block_detection.add_argument("--description-sentences", default="0,60", help="Comma-separated card sizes.")
+
+    card_templates = subparsers.add_parser(
+        "card-templates",
+        help="Compare heuristic LinkedIn field extraction with learned card templates.",
+    )
+    card_templates.add_argument("--emails", type=int, default=100)
+    card_templates.add_argument("--jobs-per-email", type=int, default=25)
+    card_templates.add_argument("--description-sentences", type=int, default=20)
+
+    text_parsing = subparsers.add_parser("text-parsing", help="Measure plain-text digest parsing in lines per second.")
+    text_parsing.add_argument("--jobs", type=int, default=500)
+    text_parsing.add_argument("--iterations", type=int, default=3)
+
+    args = parser.parse_args()
+    if args.benchmark == "text-parsing":
+        benchmark_text_parsing(jobs=args.jobs, iterations=args.iterations)
+    elif args.benchmark == "card-templates":
+        benchmark_card_templates(
+            emails=args.emails,
+            jobs_per_email=args.jobs_per_email,
+            description_sentences=args.description_sentences,
+        )
+    elif args.benchmark == "block-detection":
+        benchmark_block_detection(
+            jobs=args.jobs,
+            description_sentences=[int(value) for value in args.description_sentences.split(",")],
+        )
+    elif args.benchmark == "html-engine":
+        benchmark_html_engine(emails=args.emails, jobs_per_email=args.jobs_per_email)
+    elif args.benchmark == "parse-cache":
+        benchmark_parse_cache(emails=args.emails, distinct=args.distinct, jobs_per_email=args.jobs_per_email)
+    elif args.benchmark == "parse-pool":
+        benchmark_parse_pool(
+            emails=args.emails,
+            jobs_per_email=args.jobs_per_email,
+            worker_counts=[int(value) for value in args.workers.split(",")],
+        )
+    elif args.benchmark == "extraction":
+        benchmark_extraction(emails=args.emails, jobs_per_email=args.jobs_per_email)
+    elif args.benchmark == "gmail-startup":
+        benchmark_gmail_startup(iterations=args.iterations, latency_ms=args.latency_ms)
+    elif args.benchmark == "gmail-fetch":
+        benchmark_gmail_fetch(
+            messages=args.messages,
+            latency_ms=args.latency_ms,
+            batch_size=args.batch_size,
+            workers=args.workers,
+        )
+
+
+def benchmark_gmail_fetch(*, messages: int, latency_ms: float, batch_size: int, workers: int) -> None:
+    service = FakeGmailApi(fake_gmail_messages(messages), latency_seconds=latency_ms / 1000)
+    client = GmailClient()
+    client.rate_limiter = None
+    client._new_service = lambda: service
+    message_ids = list(service.messages_by_id)
+    chunks = [message_ids[start : start + batch_size] for start in range(0, len(message_ids), batch_size)]
+
+    def sequential() -> None:
+        for message_id in message_ids:
+            client.get_message_full(message_id)
+            client.get_message_raw_mime(message_id)
+
+    def fetch_chunk(chunk: list[str]) -> None:
+        client.get_messages_batch(chunk, format="full")
+        client.get_messages_batch(chunk, format="raw")
+
+    def batched() -> None:
+        for chunk in chunks:
+            fetch_chunk(chunk)
+
+    def parallel_batched() -> None:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(fetch_chunk, chunks))
+
+    print(f"messages={messages} latency_ms={latency_ms} batch_size={batch_size} workers={workers}")
+    for name, run in (("sequential", sequential), ("batched", batched), ("parallel_batched", parallel_batched)):
+        service.round_trips = 0
+        elapsed = _timed(run)
+        print(f"{name}: round_trips={service.round_trips} seconds={elapsed:.3f} messages_per_second={messages / elapsed:.1f}")
+
+
+def benchmark_gmail_startup(*, iterations: int, latency_ms: float) -> None:
+    from google.oauth2.credentials import Credentials
+    from googleapiclient.discovery import build
+
+    credentials = Credentials(token="benchmark-token")
+
+    def discovery_build() -> None:
+        for _ in range(iterations):
+            build("gmail", "v1", credentials=credentials)
+
+    def cached_document_cold() -> None:
+        for _ in range(iterations):
+            gmail_discovery_document.cache_clear()
+            _client_with_credentials(credentials)._new_service()
+
+    def cached_document_warm() -> None:
+        for _ in range(iterations):
+            _client_with_credentials(credentials)._new_service()
+
+    print(f"iterations={iterations} latency_ms={latency_ms}")
+    for name, run in (
+        ("discovery_build", discovery_build),
+        ("cached_document_cold", cached_document_cold),
+        ("cached_document_warm", cached_document_warm),
+    ):
+        elapsed = _timed(run)
+        print(f"service_{name}: ms_per_service={elapsed * 1000 / iterations:.2f}")
+
+    service = FakeGmailApi(fake_gmail_messages(10), latency_seconds=latency_ms / 1000)
+    for name, account_email in (("profile_lookup", None), ("configured_account", "petromatch@example.com")):
+        service.round_trips = 0
+
+        def list_ids() -> None:
+            for _ in range(iterations):
+                client = GmailClient(account_email=account_email)
+                client.rate_limiter = None
+                client._new_service = lambda: service
+                client.list_message_ids(query="is:unread", max_results=50)
+
+        elapsed = _timed(list_ids)
+        print(
+            f"list_message_ids_{name}: round_trips_per_run={service.round_trips / iterations:.1f} "
+            f"ms_per_run={elapsed * 1000 / iterations:.1f}"
+        )
+
+
+def benchmark_extraction(*, emails: int, jobs_per_email: int) -> None:
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    statements: Counter[str] = Counter()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statement(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements[statement.split(None, 1)[0].upper()] += 1
+
+    with Session(engine, expire_on_commit=False) as db:
+        for index in range(emails):
+            first_job_id = 2_000_000_000 + index * jobs_per_email
+            db.add(
+                ProcessedEmail(
+                    gmail_message_id=f"bench-{index:05d}",
+                    source="gmail",
+                    sender="LinkedIn Jobs <jobs-listings@linkedin.com>",
+                    subject="LinkedIn job alert",
+                    received_date=datetime(2026, 7, 28, 10, 0, tzinfo=UTC),
+                    raw_html_body=linkedin_digest_html(range(first_job_id, first_job_id + jobs_per_email)),
+                    status="ingested",
+                    extraction_status="pending",
+                )
+            )
+        db.commit()
+        statements.clear()
+        service = ExtractionService(body_storage=BodyStorage())
+        result = None
+
+        def run() -> None:
+            nonlocal result
+            result = service.run_pending(db)
+
+        elapsed = _timed(run)
+
+    print(f"emails={emails} jobs_per_email={jobs_per_email} jobs_created={result.jobs_created}")
+    print(f"seconds={elapsed:.3f} jobs_per_second={result.jobs_found / elapsed:.1f}")
+    for kind in ("SELECT", "INSERT", "UPDATE", "SAVEPOINT"):
+        print(f"{kind.lower()}_statements={statements[kind]} per_email={statements[kind] / max(emails, 1):.1f}")
+
+
+def benchmark_parse_pool(*, emails: int, jobs_per_email: int, worker_counts: list[int]) -> None:
+    contexts = [
+        EmailParseContext(
+            sender="LinkedIn Jobs <jobs-listings@linkedin.com>",
+            subject="LinkedIn job alert",
+            html_body=linkedin_digest_html(range(index * jobs_per_email, (index + 1) * jobs_per_email)),
+            plain_text_body=None,
+        )
+        for index in range(emails)
+    ]
+    service = ExtractionService(body_storage=BodyStorage(), parse_cache=ParseCache(0))
+    print(f"emails={emails} jobs_per_email={jobs_per_email} cpu_count={os.cpu_count()}")
+    for workers in worker_counts:
+        if workers <= 1:
+            elapsed = _timed(lambda: [service.parse_context(context) for context in contexts])
+        else:
+            with service.parse_pool(workers, len(contexts)) as pool:
+                service.parse_contexts(contexts[:workers], pool)
+                elapsed = _timed(lambda: service.parse_contexts(contexts, pool))
+        print(f"workers={workers}: seconds={elapsed:.3f} emails_per_second={emails / elapsed:.1f}")
+
+
+def benchmark_block_detection(*, jobs: int, description_sentences: list[int]) -> None:
+    for sentences in description_sentences:
+        html = linkedin_table_digest_html(range(jobs), description_sentences=sentences)
+        soup = html_to_soup(html)
+        anchors = soup.find_all("a", href=True)
+        rendering = _timed(lambda: [_closest_block_by_rendering(anchor) for anchor in anchors])
+        indexed = _timed(lambda: _blocks_with_index(soup, anchors))
+        print(
+            f"jobs={jobs} description_sentences={sentences} html_bytes={len(html)} anchors={len(anchors)} "
+            f"rendering_seconds={rendering:.3f} block_index_seconds={indexed:.3f}"
+        )
+
+
+def benchmark_card_templates(*, emails: int, jobs_per_email: int, description_sentences: int) -> None:
+    contexts = [
+        EmailParseContext(
+            sender="LinkedIn Jobs <jobs-listings@linkedin.com>",
+            subject="LinkedIn job alert",
+            html_body=linkedin_table_digest_html(
+                range(index * jobs_per_email, (index + 1) * jobs_per_email),
+                description_sentences=description_sentences,
+            ),
+            plain_text_body=None,
+        )
+        for index in range(emails)
+    ]
+    print(f"emails={emails} jobs_per_email={jobs_per_email} description_sentences={description_sentences}")
+    for label, templates in (("heuristics", TemplateCache(0)), ("templates", TemplateCache())):
+        parser = LinkedInEmailParser(templates)
+        elapsed = _timed(lambda: [parser.parse(context) for context in contexts])
+        stats = templates.stats()
+        print(
+            f"{label}: seconds={elapsed:.3f} emails_per_second={emails / elapsed:.1f} "
+            f"hits={stats['hits']} misses={stats['misses']} learned={stats['learned']}"
+        )
+
+
+def benchmark_text_parsing(*, jobs: int, iterations: int) -> None:
+    text = linkedin_text_digest(jobs)
+    line_count = len(text.splitlines())
+    print(f"jobs={jobs} lines={line_count}")
+    for parser in (LinkedInEmailParser(), GenericEmailParser()):
+        elapsed = min(_timed(lambda: parser._parse_text(text)) for _ in range(iterations))
+        print(f"{parser.source}: jobs={len(parser._parse_text(text))} lines_per_second={line_count / elapsed:.0f}")
+
+
+def _blocks_with_index(soup: Any, anchors: list[Any]) -> list[Any]:
+    block_index = BlockIndex(soup)
+    return [closest_repeating_block(anchor, block_index) for anchor in anchors]
+
+
+def _closest_block_by_rendering(anchor: Any) -> Any:
+    for parent in anchor.parents:
+        if not isinstance(parent, Tag):
+            continue
+        text = visible_text(parent) or ""
+        links = parent.find_all("a", href=True)
+        if 20 <= len(text) <= 1200 and len(links) <= 8:
+            return parent
+    return anchor
+
+
+def benchmark_html_engine(*, emails: int, jobs_per_email: int) -> None:
+    contexts = [
+        EmailParseContext(
+            sender="LinkedIn Jobs <jobs-listings@linkedin.com>",
+            subject="LinkedIn job alert",
+            html_body=linkedin_digest_html(range(index * jobs_per_email, (index + 1) * jobs_per_email)),
+            plain_text_body=None,
+        )
+        for index in range(emails)
+    ]
+    parser = LinkedInEmailParser()
+    print(f"emails={emails} jobs_per_email={jobs_per_email}")
+    for engine in HTML_PARSER_ENGINES:
+        os.environ["HTML_PARSER_ENGINE"] = engine
+        get_settings.cache_clear()
+        try:
+            elapsed = _timed(lambda: [parser.parse(context) for context in contexts])
+        except RuntimeError as exc:
+            print(f"{engine}: skipped ({exc})")
+            continue
+        print(f"{engine}: seconds={elapsed:.3f} emails_per_second={emails / elapsed:.1f}")
+
+
+def benchmark_parse_cache(*, emails: int, distinct: int, jobs_per_email: int) -> None:
+    bodies = [
+        linkedin_digest_html(range(index * jobs_per_email, (index + 1) * jobs_per_email)) for index in range(distinct)
+    ]
+    contexts = [
+        EmailParseContext(
+            sender="LinkedIn Jobs <jobs-listings@linkedin.com>",
+            subject="LinkedIn job alert",
+            html_body=bodies[index % distinct],
+            plain_text_body=None,
+        )
+        for index in range(emails)
+    ]
+    print(f"emails={emails} distinct={distinct} jobs_per_email={jobs_per_email}")
+    for label, cache in (("uncached", ParseCache(0)), ("cached", ParseCache(distinct))):
+        service = ExtractionService(body_storage=BodyStorage(), parse_cache=cache)
+        elapsed = _timed(lambda: [service.parse_context(context) for context in contexts])
+        print(
+            f"{label}: seconds={elapsed:.3f} emails_per_second={emails / elapsed:.1f} "
+            f"hits={cache.hits} misses={cache.misses}"
+        )
+
+
+def _client_with_credentials(credentials: Any) -> GmailClient:
+    client = GmailClient()
+    client._credentials = credentials
+    return client
+
+
+def _timed(run: Callable[[], None]) -> float:
+    started = time.perf_counter()
+    run()
+    return max(time.perf_counter() - started, 1e-9)
+
+
+if __name__ == "__main__":
+    main()
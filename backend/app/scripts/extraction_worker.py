@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import time
+from collections.abc import Callable
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.db.session import SessionLocal
+from app.services.extraction_service import (
+    EmailExtractionResult,
+    ExtractionResult,
+    ExtractionService,
+    default_worker_id,
+    summarize_extraction,
+)
+
+logger = get_logger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Extract jobs from pending emails with claim-based worker processes.")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=None, help="Emails claimed per lease.")
+    parser.add_argument("--lease-seconds", type=float, default=None)
+    parser.add_argument(
+        "--poll-seconds",
+        type=float,
+        default=0.0,
+        help="Keep polling for new emails at this interval instead of exiting once the queue is empty.",
+    )
+    args = parser.parse_args()
+
+    options = (args.batch_size, args.lease_seconds, args.poll_seconds)
+    if args.workers <= 1:
+        results = [_run_process(options)]
+    else:
+        with multiprocessing.get_context("spawn").Pool(args.workers) as pool:
+            results = pool.map(_run_process, [options] * args.workers)
+    for result in results:
+        print(
+            f"DONE: processed={result.emails_processed} parsed={result.emails_parsed} "
+            f"failed={result.emails_failed} jobs_created={result.jobs_created} "
+            f"duplicates={result.duplicates_skipped}"
+        )
+
+
+def run_extraction_worker(
+    worker_id: str,
+    *,
+    batch_size: int | None = None,
+    lease_seconds: float | None = None,
+    poll_seconds: float = 0.0,
+    session_factory: Callable[[], Session] = SessionLocal,
+    service: ExtractionService | None = None,
+) -> ExtractionResult:
+    service = service or ExtractionService()
+    batch_size = batch_size or get_settings().extraction_chunk_size
+    results: list[EmailExtractionResult] = []
+    with session_factory() as db:
+        while True:
+            email_ids = service.claim_pending(db, worker_id, limit=batch_size, lease_seconds=lease_seconds)
+            db.commit()
+            if not email_ids:
+                if poll_seconds <= 0:
+                    break
+                time.sleep(poll_seconds)
+                continue
+            results.extend(service.extract_claimed(db, worker_id, email_ids))
+            db.commit()
+    result = summarize_extraction(results)
+    logger.info("extraction_worker_completed", worker_id=worker_id, emails_processed=result.emails_processed)
+    return result
+
+
+def _run_process(options: tuple[int | None, float | None, float]) -> ExtractionResult:
+    batch_size, lease_seconds, poll_seconds = options
+    return run_extraction_worker(
+        default_worker_id(),
+        batch_size=batch_size,
+        lease_seconds=lease_seconds,
+        poll_seconds=poll_seconds,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import mmap
+import re
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.parser import BytesHeaderParser
+from email.policy import default
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import IngestionRun, ProcessedEmail
+from app.db.session import SessionLocal
+from app.services.gmail_ingestion_service import GmailIngestionService
+
+MBOX_SEPARATOR = b"\nFrom "
+MBOXRD_ESCAPED_FROM = re.compile(rb"^>(>*From )", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class MailboxImportResult:
+    messages_read: int
+    emails_stored: int
+    duplicates_skipped: int
+    non_job_alerts_skipped: int
+    failures: int
+    errors: list[str]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill processed emails from an mbox file or a directory of .eml files.")
+    parser.add_argument("path", type=Path, help="Google Takeout .mbox file or a directory containing .eml files.")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument(
+        "--include-all",
+        action="store_true",
+        help="Store every message instead of only likely job alerts.",
+    )
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        result = import_mailbox(db, args.path, batch_size=args.batch_size, include_all=args.include_all)
+    print(
+        f"DONE: read={result.messages_read} stored={result.emails_stored} "
+        f"duplicates={result.duplicates_skipped} non_job_alerts={result.non_job_alerts_skipped} "
+        f"failures={result.failures}"
+    )
+    for error in result.errors[:20]:
+        print(error)
+
+
+def import_mailbox(
+    db: Session,
+    path: Path,
+    *,
+    batch_size: int = 500,
+    include_all: bool = False,
+    progress: Callable[[str], None] = print,
+) -> MailboxImportResult:
+    service = GmailIngestionService()
+    header_parser = BytesHeaderParser(policy=default)
+    run = IngestionRun(source="mailbox_import", status="started")
+    db.add(run)
+    db.commit()
+
+    started = time.perf_counter()
+    read = stored = duplicates = non_job_alerts = failures = 0
+    errors: list[str] = []
+    batch: dict[str, ProcessedEmail | Exception] = {}
+
+    def flush() -> None:
+        nonlocal stored, duplicates, failures
+        # Mail already ingested from Gmail has a different gmail_message_id, so match it on Message-ID.
+        rfc822_ids = {
+            record.rfc822_message_id: message_id
+            for message_id, record in batch.items()
+            if isinstance(record, ProcessedEmail) and record.rfc822_message_id
+        }
+        existing = db.scalars(
+            select(ProcessedEmail.rfc822_message_id).where(ProcessedEmail.rfc822_message_id.in_(rfc822_ids))
+        ).all()
+        for rfc822_id in existing:
+            del batch[rfc822_ids[rfc822_id]]
+        outcome = service.store_records(db, list(batch), batch)
+        db.commit()
+        stored += outcome.stored
+        duplicates += outcome.conflicts + len(existing)
+        failures += outcome.failures
+        errors.extend(outcome.errors)
+        batch.clear()
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        progress(
+            f"read={read} stored={stored} duplicates={duplicates} "
+            f"non_job_alerts={non_job_alerts} failures={failures} messages_per_second={read / elapsed:.0f}"
+        )
+
+    for raw_bytes in iter_mailbox_messages(path):
+        read += 1
+        headers = service.headers_from_message(header_parser.parsebytes(raw_bytes))
+        message_id = mailbox_message_id(headers, raw_bytes)
+        if not include_all and not service.parser_registry.is_job_alert_candidate(
+            service.header_value(headers, "From"),
+            service.header_value(headers, "Subject"),
+        ):
+            non_job_alerts += 1
+            continue
+        if message_id in batch:
+            duplicates += 1
+            continue
+        try:
+            message = {"id": message_id, "threadId": service.header_value(headers, "X-GM-THRID")}
+            record = service.build_record(message, raw_bytes)
+            record.source = "mailbox_import"
+            batch[message_id] = record
+        except Exception as exc:  # noqa: BLE001
+            batch[message_id] = exc
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    run.status = "completed" if failures == 0 else "completed_with_errors"
+    run.emails_seen = read
+    run.emails_processed = stored
+    run.emails_skipped = duplicates + non_job_alerts
+    run.jobs_created = 0
+    run.jobs_skipped_duplicate = 0
+    run.jobs_failed = 0
+    run.error_summary = "\n".join(errors[:20]) or None
+    run.finished_at = datetime.now(UTC)
+    db.commit()
+    return MailboxImportResult(
+        messages_read=read,
+        emails_stored=stored,
+        duplicates_skipped=duplicates,
+        non_job_alerts_skipped=non_job_alerts,
+        failures=failures,
+        errors=errors,
+    )
+
+
+def iter_mailbox_messages(path: Path) -> Iterator[bytes]:
+    if path.is_dir():
+        for eml_path in sorted(path.rglob("*.eml")):
+            yield eml_path.read_bytes()
+        return
+    yield from iter_mbox_messages(path)
+
+
+def iter_mbox_messages(path: Path) -> Iterator[bytes]:
+    with path.open("rb") as handle:
+        if path.stat().st_size == 0:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if mapped[:5] == b"From ":
+                start = 0
+            else:
+                separator = mapped.find(MBOX_SEPARATOR)
+                if separator == -1:
+                    return
+                start = separator + 1
+            while start < len(mapped):
+                end = mapped.find(MBOX_SEPARATOR, start)
+                end = len(mapped) if end == -1 else end + 1
+                body_start = mapped.find(b"\n", start, end) + 1
+                if body_start > 0:
+                    yield MBOXRD_ESCAPED_FROM.sub(rb"\1", mapped[body_start:end])
+                start = end
+
+
+def mailbox_message_id(headers: dict[str, str], raw_bytes: bytes) -> str:
+    source = (GmailIngestionService.header_value(headers, "Message-ID") or "").strip().encode("utf-8") or raw_bytes
+    return f"import:{hashlib.sha256(source).hexdigest()}"
+
+
+if __name__ == "__main__":
+    main()
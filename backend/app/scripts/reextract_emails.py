@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.db.bulk import insert_on_conflict_do_nothing, row_values
+from app.db.models import Job, ProcessedEmail
+from app.db.session import SessionLocal
+from app.services.extraction_service import ExtractionService, ParsedEmail
+from app.services.parsers import ParserRegistry
+
+logger = get_logger(__name__)
+EXTRACTED_STATUSES = ("parsed", "partially_parsed", "no_jobs_found", "failed")
+JOB_UPDATE_FIELDS = (
+    "external_id",
+    "job_url",
+    "dedupe_fingerprint",
+    "job_title",
+    "company",
+    "location",
+    "posted_date",
+    "received_date",
+    "raw_text",
+    "source_payload",
+)
+
+
+@dataclass(frozen=True)
+class ReextractionResult:
+    emails_selected: int
+    emails_reextracted: int
+    jobs_updated: int
+    jobs_created: int
+    jobs_removed: int
+    failures: int
+    errors: list[str]
+
+
+@dataclass(frozen=True)
+class _ChunkChanges:
+    email_rows: list[dict[str, Any]]
+    job_updates: list[dict[str, Any]]
+    job_inserts: list[dict[str, Any]]
+    job_deletes: list[int]
+    failures: int
+    errors: list[str]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-extract emails whose jobs came from an older parser version.")
+    parser.add_argument("--apply", action="store_true", help="Persist updates. Defaults to dry-run.")
+    parser.add_argument("--parser", dest="parser_source", default=None, help="Only re-extract this parser's emails.")
+    parser.add_argument(
+        "--include-unversioned",
+        action="store_true",
+        help="Also re-extract emails parsed before parser versions were recorded.",
+    )
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        result = reextract_emails(
+            db,
+            apply=args.apply,
+            parser_source=args.parser_source,
+            include_unversioned=args.include_unversioned,
+            chunk_size=args.chunk_size,
+        )
+    mode = "APPLIED" if args.apply else "DRY RUN"
+    print(
+        f"{mode}: selected={result.emails_selected} reextracted={result.emails_reextracted} "
+        f"jobs_updated={result.jobs_updated} jobs_created={result.jobs_created} "
+        f"jobs_removed={result.jobs_removed} failures={result.failures}"
+    )
+    for error in result.errors[:20]:
+        print(error)
+
+
+def reextract_emails(
+    db: Session,
+    *,
+    apply: bool,
+    parser_source: str | None = None,
+    include_unversioned: bool = False,
+    chunk_size: int | None = None,
+    service: ExtractionService | None = None,
+    progress: Callable[[str], None] = print,
+) -> ReextractionResult:
+    service = service or ExtractionService()
+    settings = get_settings()
+    chunk_size = max(1, chunk_size or settings.extraction_chunk_size)
+    email_ids = stale_email_ids(
+        db,
+        service.parser_registry,
+        parser_source=parser_source,
+        include_unversioned=include_unversioned,
+    )
+    logger.info("reextraction_started", emails=len(email_ids), apply=apply)
+
+    totals = {"emails": 0, "updated": 0, "created": 0, "removed": 0, "failures": 0}
+    errors: list[str] = []
+    with service.parse_pool(settings.extraction_parse_workers, len(email_ids)) as pool:
+        for start in range(0, len(email_ids), chunk_size):
+            emails = service.load_emails(db, email_ids[start : start + chunk_size])
+            parsed_emails = service.parse_emails(db, emails, pool)
+            changes = _chunk_changes(db, service, emails, parsed_emails)
+            if apply:
+                created, changes = _apply_chunk(db, service, emails, parsed_emails, changes)
+            else:
+                created = len(changes.job_inserts)
+            totals["emails"] += len(changes.email_rows)
+            totals["updated"] += len(changes.job_updates)
+            totals["created"] += created
+            totals["removed"] += len(changes.job_deletes)
+            totals["failures"] += changes.failures
+            errors.extend(changes.errors)
+            if apply:
+                db.commit()
+            progress(f"reextracted={totals['emails']}/{len(email_ids)}")
+
+    logger.info("reextraction_completed", emails=totals["emails"], failures=totals["failures"], apply=apply)
+    return ReextractionResult(
+        emails_selected=len(email_ids),
+        emails_reextracted=totals["emails"],
+        jobs_updated=totals["updated"],
+        jobs_created=totals["created"],
+        jobs_removed=totals["removed"],
+        failures=totals["failures"],
+        errors=errors,
+    )
+
+
+def stale_email_ids(
+    db: Session,
+    parser_registry: ParserRegistry,
+    *,
+    parser_source: str | None = None,
+    include_unversioned: bool = False,
+) -> list[int]:
+    conditions = [
+        and_(
+            ProcessedEmail.parser_name == parser.source,
+            or_(ProcessedEmail.parser_version.is_(None), ProcessedEmail.parser_version < parser.version),
+        )
+        for parser in parser_registry.parsers
+        if parser_source in (None, parser.source)
+    ]
+    if include_unversioned:
+        conditions.append(ProcessedEmail.parser_name.is_(None))
+    if not conditions:
+        return []
+    return list(
+        db.scalars(
+            select(ProcessedEmail.id)
+            .where(ProcessedEmail.status == "ingested")
+            .where(ProcessedEmail.extraction_status.in_(EXTRACTED_STATUSES))
+            .where(or_(*conditions))
+            .order_by(ProcessedEmail.id.asc())
+        )
+    )
+
+
+def _apply_chunk(
+    db: Session,
+    service: ExtractionService,
+    emails: list[ProcessedEmail],
+    parsed_emails: list[ParsedEmail],
+    changes: _ChunkChanges,
+) -> tuple[int, _ChunkChanges]:
+    try:
+        with db.begin_nested():
+            created = _apply_changes(db, changes)
+    except Exception as exc:  # noqa: BLE001
+        # A rewritten job can collide with another email's job on job_url or dedupe_fingerprint;
+        # redo this chunk one email at a time through the regular extraction path instead.
+        logger.warning("reextraction_bulk_apply_failed", email_count=len(emails), error=str(exc))
+        results = [
+            service.extract_email(db, email, reset_existing=True, parsed=parsed)
+            for email, parsed in zip(emails, parsed_emails)
+        ]
+        created = sum(result.jobs_created for result in results)
+        changes = _ChunkChanges(
+            email_rows=changes.email_rows,
+            job_updates=[],
+            job_inserts=[],
+            job_deletes=[],
+            failures=sum(result.failures for result in results),
+            errors=[error for result in results for error in result.errors],
+        )
+    return created, changes
+
+
+def _chunk_changes(
+    db: Session,
+    service: ExtractionService,
+    emails: list[ProcessedEmail],
+    parsed_emails: list[ParsedEmail],
+) -> _ChunkChanges:
+    existing: dict[int, dict[str, int]] = {}
+    for job_id, email_id, job_url, source, external_id in db.execute(
+        select(Job.id, Job.processed_email_id, Job.job_url, Job.source, Job.external_id).where(
+            Job.processed_email_id.in_([email.id for email in emails])
+        )
+    ):
+        keys = existing.setdefault(email_id, {})
+        if job_url:
+            keys[job_url] = job_id
+        if external_id:
+            keys[f"{source}:{external_id}"] = job_id
+
+    now = datetime.now(UTC)
+    email_rows: list[dict[str, Any]] = []
+    job_updates: list[dict[str, Any]] = []
+    job_inserts: list[dict[str, Any]] = []
+    job_deletes: list[int] = []
+    failures = 0
+    errors: list[str] = []
+    for email, parsed in zip(emails, parsed_emails):
+        current = existing.get(email.id, {})
+        kept: set[int] = set()
+        email_failures = 0
+        error = parsed.error if parsed.parser is not None else ValueError("No parser available for email content.")
+        if error is None:
+            for opportunity in parsed.opportunities:
+                try:
+                    job = service.job_from_opportunity(email, opportunity)
+                except Exception as exc:  # noqa: BLE001
+                    email_failures += 1
+                    errors.append(f"email_id={email.id}: {type(exc).__name__}: {exc}")
+                    continue
+                row = row_values(job)
+                job_id = current.get(job.job_url or "") or current.get(f"{job.source}:{job.external_id}")
+                if job_id is None:
+                    job_inserts.append(row)
+                elif job_id not in kept:
+                    kept.add(job_id)
+                    job_updates.append({"id": job_id, **{field: row.get(field) for field in JOB_UPDATE_FIELDS}})
+        else:
+            errors.append(f"email_id={email.id}: {type(error).__name__}: {error}")
+        job_deletes.extend(job_id for job_id in set(current.values()) if job_id not in kept)
+
+        parsing_error = f"{email_failures} job(s) failed during extraction." if email_failures else None
+        if error is not None:
+            status = "failed"
+            parsing_error = str(error)
+            email_failures += 1
+        elif not parsed.opportunities:
+            status = "no_jobs_found"
+        else:
+            status = "partially_parsed" if email_failures else "parsed"
+        failures += email_failures
+        email_rows.append(
+            {
+                "id": email.id,
+                "extraction_status": status,
+                "parser_name": parsed.parser.source if parsed.parser else None,
+                "parser_version": parsed.parser.version if parsed.parser else None,
+                "jobs_extracted_count": len(kept),
+                "parsing_error": parsing_error,
+                "parsed_at": now,
+            }
+        )
+    return _ChunkChanges(email_rows, job_updates, job_inserts, job_deletes, failures, errors)
+
+
+def _apply_changes(db: Session, changes: _ChunkChanges) -> int:
+    # One statement per kind of change for the whole chunk: executemany UPDATEs keyed by primary key, a
+    # single DELETE ... IN, and a bulk ON CONFLICT DO NOTHING insert for jobs the old parser missed.
+    if changes.job_deletes:
+        db.execute(delete(Job).where(Job.id.in_(changes.job_deletes)))
+    if changes.job_updates:
+        db.execute(update(Job), changes.job_updates)
+    created = insert_on_conflict_do_nothing(
+        db,
+        Job,
+        changes.job_inserts,
+        returning=(Job.id, Job.processed_email_id),
+    )
+    email_rows = changes.email_rows
+    if created:
+        created_counts: dict[int, int] = {}
+        for _, email_id in created:
+            created_counts[email_id] = created_counts.get(email_id, 0) + 1
+        email_rows = [
+            {**row, "jobs_extracted_count": row["jobs_extracted_count"] + created_counts.get(row["id"], 0)}
+            for row in email_rows
+        ]
+    if email_rows:
+        db.execute(update(ProcessedEmail), email_rows)
+    db.flush()
+    return len(created)
+
+
+if __name__ == "__main__":
+    main()
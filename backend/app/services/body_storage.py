@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import zlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from email import message_from_string
+from email.message import EmailMessage
+from email.policy import default
+from pathlib import Path
+from typing import Protocol
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.db.bulk import insert_on_conflict_do_nothing
+from app.db.models import EmailBody, ProcessedEmail
+
+logger = get_logger(__name__)
+
+CODEC_HEADERS = {"zlib": b"\x01", "zstd": b"\x02"}
+BODY_FIELDS = (
+    ("raw_html_body", "html_body_key"),
+    ("plain_text_body", "text_body_key"),
+    ("raw_mime", "raw_mime_key"),
+)
+
+
+class BodyStorageError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class EmailBodies:
+    html_body: str | None
+    plain_text_body: str | None
+
+
+class BodyStore(Protocol):
+    name: str
+
+    def put_many(self, db: Session, blobs: dict[str, tuple[str, int, bytes]]) -> None:
+        """Store compressed blobs keyed by content hash; existing keys are left untouched."""
+
+    def get_many(self, db: Session, content_hashes: Iterable[str]) -> dict[str, bytes]:
+        """Return the compressed blobs found for the given content hashes."""
+
+
+class DatabaseBodyStore:
+    name = "database"
+
+    def put_many(self, db: Session, blobs: dict[str, tuple[str, int, bytes]]) -> None:
+        insert_on_conflict_do_nothing(
+            db,
+            EmailBody,
+            [
+                {"content_hash": content_hash, "codec": codec, "size_bytes": size_bytes, "data": blob}
+                for content_hash, (codec, size_bytes, blob) in blobs.items()
+            ],
+            index_elements=["content_hash"],
+        )
+
+    def get_many(self, db: Session, content_hashes: Iterable[str]) -> dict[str, bytes]:
+        return dict(
+            db.execute(
+                select(EmailBody.content_hash, EmailBody.data).where(EmailBody.content_hash.in_(set(content_hashes)))
+            ).all()
+        )
+
+
+class LocalBodyStore:
+    name = "local"
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def put_many(self, db: Session, blobs: dict[str, tuple[str, int, bytes]]) -> None:
+        for content_hash, (_, _, blob) in blobs.items():
+            path = self._path(content_hash)
+            if path.exists():
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{content_hash}.", delete=False) as temporary:
+                temporary.write(blob)
+            os.replace(temporary.name, path)
+
+    def get_many(self, db: Session, content_hashes: Iterable[str]) -> dict[str, bytes]:
+        blobs: dict[str, bytes] = {}
+        for content_hash in set(content_hashes):
+            path = self._path(content_hash)
+            if path.exists():
+                blobs[content_hash] = path.read_bytes()
+        return blobs
+
+    def _path(self, content_hash: str) -> Path:
+        return self.root / "email-bodies" / content_hash[:2] / content_hash
+
+
+class S3BodyStore:
+    name = "s3"
+
+    def __init__(self, endpoint_url: str, bucket: str, *, http_client: httpx.Client | None = None) -> None:
+        self.base_url = f"{endpoint_url.rstrip('/')}/{bucket}/email-bodies"
+        self.http_client = http_client or httpx.Client(timeout=get_settings().request_timeout_seconds)
+
+    def put_many(self, db: Session, blobs: dict[str, tuple[str, int, bytes]]) -> None:
+        for content_hash, (_, _, blob) in blobs.items():
+            response = self.http_client.put(f"{self.base_url}/{content_hash}", content=blob)
+            response.raise_for_status()
+
+    def get_many(self, db: Session, content_hashes: Iterable[str]) -> dict[str, bytes]:
+        blobs: dict[str, bytes] = {}
+        for content_hash in set(content_hashes):
+            response = self.http_client.get(f"{self.base_url}/{content_hash}")
+            if response.status_code == 404:
+                continue
+            response.raise_for_status()
+            blobs[content_hash] = response.content
+        return blobs
+
+
+class BodyStorage:
+    def __init__(self, store: BodyStore | None = None, *, codec: str = "zlib") -> None:
+        if codec not in CODEC_HEADERS:
+            raise BodyStorageError(f"Unsupported body compression codec: {codec}.")
+        if codec == "zstd":
+            _zstd()
+        self.store = store
+        self.codec = codec
+
+    def offload(self, db: Session, records: list[ProcessedEmail]) -> None:
+        if self.store is None:
+            return
+        blobs: dict[str, tuple[str, int, bytes]] = {}
+        for record in records:
+            if record.raw_mime is not None and record.raw_mime.isascii():
+                # The HTML and text bodies are decoded from the MIME on load rather than stored twice; 8bit
+                # MIME keeps them, since its text no longer carries the original bytes for each part's charset.
+                record.raw_html_body = None
+                record.plain_text_body = None
+            for body_field, key_field in BODY_FIELDS:
+                value = getattr(record, body_field)
+                if value is None:
+                    continue
+                data = value.encode("utf-8")
+                content_hash = hashlib.sha256(data).hexdigest()
+                if content_hash not in blobs:
+                    blobs[content_hash] = (self.codec, len(data), compress(data, self.codec))
+                setattr(record, key_field, content_hash)
+                setattr(record, body_field, None)
+        if blobs:
+            self.store.put_many(db, blobs)
+            logger.info(
+                "email_bodies_stored",
+                backend=self.store.name,
+                blob_count=len(blobs),
+                uncompressed_bytes=sum(size for _, size, _ in blobs.values()),
+                stored_bytes=sum(len(blob) for _, _, blob in blobs.values()),
+            )
+
+    def load(self, db: Session, email: ProcessedEmail) -> EmailBodies:
+        return self.load_many(db, [email])[0]
+
+    def load_many(self, db: Session, emails: list[ProcessedEmail]) -> list[EmailBodies]:
+        content_hashes = {
+            content_hash
+            for email in emails
+            for content_hash in (email.html_body_key, email.text_body_key, _mime_body_key(email))
+            if content_hash
+        }
+        if content_hashes and self.store is None:
+            raise BodyStorageError("Email bodies are stored externally but BODY_STORAGE_BACKEND is inline.")
+        blobs = self.store.get_many(db, content_hashes) if content_hashes else {}
+        bodies: list[EmailBodies] = []
+        for email in emails:
+            mime_key = _mime_body_key(email)
+            if mime_key:
+                bodies.append(message_bodies(message_from_string(self._stored_text(blobs, mime_key), policy=default)))
+            else:
+                bodies.append(
+                    EmailBodies(
+                        html_body=self._stored_text(blobs, email.html_body_key) or email.raw_html_body,
+                        plain_text_body=self._stored_text(blobs, email.text_body_key) or email.plain_text_body,
+                    )
+                )
+        return bodies
+
+    def _stored_text(self, blobs: dict[str, bytes], content_hash: str | None) -> str | None:
+        if not content_hash:
+            return None
+        blob = blobs.get(content_hash)
+        if blob is None:
+            raise BodyStorageError(f"Email body {content_hash} is missing from {self.store.name} storage.")
+        return decompress(blob).decode("utf-8")
+
+
+def message_bodies(message: EmailMessage) -> EmailBodies:
+    html_part = message.get_body(preferencelist=("html",))
+    text_part = message.get_body(preferencelist=("plain",))
+    return EmailBodies(
+        html_body=html_part.get_content() if html_part else None,
+        plain_text_body=text_part.get_content() if text_part else None,
+    )
+
+
+def _mime_body_key(email: ProcessedEmail) -> str | None:
+    if email.html_body_key or email.text_body_key:
+        return None
+    return email.raw_mime_key
+
+
+def get_body_storage() -> BodyStorage:
+    settings = get_settings()
+    backend = settings.body_storage_backend
+    store: BodyStore | None
+    if backend == "inline":
+        store = None
+    elif backend == "database":
+        store = DatabaseBodyStore()
+    elif backend == "local":
+        store = LocalBodyStore(settings.storage_path)
+    elif backend == "s3":
+        if not settings.body_storage_s3_endpoint_url:
+            raise BodyStorageError("BODY_STORAGE_S3_ENDPOINT_URL is required for the s3 body storage backend.")
+        store = S3BodyStore(settings.body_storage_s3_endpoint_url, settings.body_storage_s3_bucket)
+    else:
+        raise BodyStorageError(f"Unknown BODY_STORAGE_BACKEND: {backend}.")
+    return BodyStorage(store, codec=settings.body_storage_compression)
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return CODEC_HEADERS[codec] + _zstd().ZstdCompressor(level=10).compress(data)
+    return CODEC_HEADERS["zlib"] + zlib.compress(data, 9)
+
+
+def decompress(blob: bytes) -> bytes:
+    header, payload = blob[:1], blob[1:]
+    if header == CODEC_HEADERS["zlib"]:
+        return zlib.decompress(payload)
+    if header == CODEC_HEADERS["zstd"]:
+        return _zstd().ZstdDecompressor().decompress(payload)
+    raise BodyStorageError("Stored email body has an unknown codec header.")
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise BodyStorageError("BODY_STORAGE_COMPRESSION=zstd requires the zstandard package.") from exc
+    return zstandard
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Any
 
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.core.logging import get_logger
-from app.services.extraction_service import ExtractionService
+from app.services.extraction_service import ExtractionResult, ExtractionService, summarize_extraction
 from app.services.gmail_ingestion_service import GmailIngestionService
+from app.services.ingestion_pipeline import IngestionPipeline
 from app.services.source_ingestion_service import SourceIngestionResult, SourceIngestionService
 
 logger = get_logger(__name__)
@@ -25,6 +27,7 @@ class DailyIngestionResult:
     gmail: dict[str, int] | None = None
     airswift: dict[str, Any] | None = None
     sources: dict[str, dict[str, Any]] | None = None
+    pipeline: dict[str, dict[str, float]] | None = None
 
 
 class DailyIngestionService:
@@ -41,8 +44,17 @@ class DailyIngestionService:
 
     def run_once(self, db: Session) -> DailyIngestionResult:
         logger.info("daily_ingestion_started")
-        gmail_result = self.gmail_ingestion_service.run_once(db)
-        extraction_result = self.extraction_service.run_pending(db)
+        pipeline = None
+        if get_settings().ingestion_pipeline_enabled:
+            pipeline = IngestionPipeline(self.gmail_ingestion_service, self.extraction_service)
+            gmail_result = self.gmail_ingestion_service.run_once(db, pipeline=pipeline)
+            extraction_result = _combine_extraction(
+                summarize_extraction(pipeline.extraction_results),
+                self.extraction_service.run_pending(db),
+            )
+        else:
+            gmail_result = self.gmail_ingestion_service.run_once(db)
+            extraction_result = self.extraction_service.run_pending(db)
         source_results = self.source_ingestion_service.run_all(db)
         errors = [
             *gmail_result.errors,
@@ -68,6 +80,7 @@ class DailyIngestionService:
             },
             airswift=sources_summary.get("airswift"),
             sources=sources_summary,
+            pipeline=pipeline.summary() if pipeline is not None else None,
         )
         logger.info(
             "daily_ingestion_completed",
@@ -85,6 +98,21 @@ class DailyIngestionService:
         return result
 
 
+def _combine_extraction(inline: ExtractionResult, leftover: ExtractionResult) -> ExtractionResult:
+    return replace(
+        leftover,
+        emails_processed=inline.emails_processed + leftover.emails_processed,
+        emails_parsed=inline.emails_parsed + leftover.emails_parsed,
+        emails_partially_parsed=inline.emails_partially_parsed + leftover.emails_partially_parsed,
+        emails_failed=inline.emails_failed + leftover.emails_failed,
+        emails_with_no_jobs=inline.emails_with_no_jobs + leftover.emails_with_no_jobs,
+        jobs_found=inline.jobs_found + leftover.jobs_found,
+        jobs_created=inline.jobs_created + leftover.jobs_created,
+        duplicates_skipped=inline.duplicates_skipped + leftover.duplicates_skipped,
+        errors=[*inline.errors, *leftover.errors],
+    )
+
+
 def _source_summary(source_results: list[SourceIngestionResult]) -> dict[str, dict[str, Any]]:
     return {
         source_result.source: {
@@ -1,15 +1,33 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import UTC, datetime
+import multiprocessing
+import os
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime, timedelta
+from typing import Any
 
-from sqlalchemy import delete, or_, select
-from sqlalchemy.orm import Session
+from sqlalchemy import ColumnElement, Select, and_, delete, func, or_, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, load_only
 
+from app.core.config import get_settings
 from app.core.logging import get_logger
+from app.db.bulk import insert_on_conflict_do_nothing, row_values
 from app.db.models import Job, ProcessedEmail
-from app.services.parsers import EmailParseContext, ParsedOpportunity, ParserRegistry
-from app.services.parsers.utils import normalize_job_url
+from app.services.body_storage import BodyStorage, get_body_storage
+from app.services.parsers import (
+    EmailJobParser,
+    EmailParseContext,
+    ParseCache,
+    ParsedOpportunity,
+    ParserRegistry,
+    get_parse_cache,
+)
+from app.services.parsers.utils import analyze_job_url
 from app.utils.fingerprints import build_dedupe_fingerprint
 from app.utils.text import normalize_whitespace
 
@@ -27,6 +45,22 @@ class ExtractionResult:
     jobs_created: int
     duplicates_skipped: int
     errors: list[str]
+    remaining_pending: int = 0
+    stopped_due_to_budget: bool = False
+
+
+@dataclass(frozen=True)
+class _JobInsertOutcome:
+    created: int
+    duplicates: int
+    errors: list[str]
+
+
+@dataclass(frozen=True)
+class ParsedEmail:
+    parser: EmailJobParser | None
+    opportunities: list[ParsedOpportunity]
+    error: Exception | None = None
 
 
 @dataclass(frozen=True)
@@ -42,39 +76,244 @@ class EmailExtractionResult:
 
 
 class ExtractionService:
-    def __init__(self, parser_registry: ParserRegistry | None = None) -> None:
+    def __init__(
+        self,
+        parser_registry: ParserRegistry | None = None,
+        body_storage: BodyStorage | None = None,
+        parse_cache: ParseCache | None = None,
+    ) -> None:
         self.parser_registry = parser_registry or ParserRegistry()
+        self.body_storage = body_storage or get_body_storage()
+        self.parse_cache = parse_cache or get_parse_cache()
 
     def run_pending(self, db: Session) -> ExtractionResult:
-        emails = db.scalars(
-            select(ProcessedEmail)
+        time_budget_seconds = max(0.0, get_settings().extraction_time_budget_seconds)
+        if not time_budget_seconds:
+            return summarize_extraction(self.extract_pending(db))
+        return self.run_pending_within_budget(db, time_budget_seconds)
+
+    def run_pending_within_budget(self, db: Session, time_budget_seconds: float) -> ExtractionResult:
+        # Each chunk is leased, extracted and committed on its own, so work finished before the deadline
+        # survives a timeout and the next run starts with whatever is still pending.
+        deadline = time.monotonic() + time_budget_seconds
+        worker_id = default_worker_id()
+        settings = get_settings()
+        results: list[EmailExtractionResult] = []
+        stopped_due_to_budget = False
+        with self.parse_pool(settings.extraction_parse_workers, settings.extraction_chunk_size) as pool:
+            while True:
+                if time.monotonic() >= deadline:
+                    stopped_due_to_budget = True
+                    break
+                email_ids = self.claim_pending(db, worker_id)
+                db.commit()
+                if not email_ids:
+                    break
+                results.extend(self._extract_ids(db, email_ids, pool, claimed_by=worker_id))
+                db.commit()
+        remaining_pending = db.scalar(
+            select(func.count())
+            .select_from(ProcessedEmail)
             .where(ProcessedEmail.status == "ingested")
-            .where(ProcessedEmail.extraction_status == "pending")
-            .order_by(ProcessedEmail.received_date.asc().nullsfirst(), ProcessedEmail.id.asc())
-        ).all()
+            .where(_claimable(datetime.now(UTC)))
+        ) or 0
+        logger.info(
+            "extraction_budget_completed",
+            emails_processed=len(results),
+            remaining_pending=remaining_pending,
+            stopped_due_to_budget=stopped_due_to_budget,
+            parser_routing=self.parser_registry.routing_stats(),
+            anchor_filters=self.parser_registry.anchor_filter_stats(),
+        )
+        return replace(
+            summarize_extraction(results),
+            remaining_pending=remaining_pending,
+            stopped_due_to_budget=stopped_due_to_budget,
+        )
 
-        logger.info("extraction_started", pending_emails=len(emails))
-        results = [self.extract_email(db, email, reset_existing=False) for email in emails]
-        errors = [error for result in results for error in result.errors]
+    def extract_pending(self, db: Session) -> list[EmailExtractionResult]:
+        # Pending emails are paged by id so a backlog is never loaded in one query. The caller owns the
+        # transaction; SKIP LOCKED leaves pages an overlapping run already holds to that run.
+        settings = get_settings()
+        chunk_size = max(1, settings.extraction_chunk_size)
+        logger.info("extraction_started", chunk_size=chunk_size)
+        results: list[EmailExtractionResult] = []
+        last_id = 0
+        with self.parse_pool(settings.extraction_parse_workers, chunk_size) as pool:
+            while True:
+                emails = _load_email_page(db, after_id=last_id, limit=chunk_size)
+                if not emails:
+                    break
+                last_id = emails[-1].id
+                results.extend(self._extract_emails(db, emails, pool))
         logger.info(
             "extraction_completed",
             emails_processed=len(results),
             jobs_found=sum(result.jobs_found for result in results),
             jobs_created=sum(result.jobs_created for result in results),
             duplicates_skipped=sum(result.duplicates_skipped for result in results),
-            errors=len(errors),
+            errors=sum(len(result.errors) for result in results),
+            parser_routing=self.parser_registry.routing_stats(),
+            anchor_filters=self.parser_registry.anchor_filter_stats(),
         )
-        return ExtractionResult(
-            emails_processed=len(results),
-            emails_parsed=sum(1 for result in results if result.extraction_status == "parsed"),
-            emails_partially_parsed=sum(1 for result in results if result.extraction_status == "partially_parsed"),
-            emails_failed=sum(1 for result in results if result.extraction_status == "failed"),
-            emails_with_no_jobs=sum(1 for result in results if result.extraction_status == "no_jobs_found"),
-            jobs_found=sum(result.jobs_found for result in results),
-            jobs_created=sum(result.jobs_created for result in results),
-            duplicates_skipped=sum(result.duplicates_skipped for result in results),
-            errors=errors,
+        return results
+
+    def claim_pending(
+        self,
+        db: Session,
+        worker_id: str,
+        *,
+        limit: int | None = None,
+        lease_seconds: float | None = None,
+    ) -> list[int]:
+        settings = get_settings()
+        now = datetime.now(UTC)
+        email_ids = list(
+            db.scalars(
+                select(ProcessedEmail.id)
+                .where(ProcessedEmail.status == "ingested")
+                .where(_claimable(now))
+                .order_by(ProcessedEmail.received_date.asc().nullsfirst(), ProcessedEmail.id.asc())
+                .limit(max(1, limit or settings.extraction_chunk_size))
+                .with_for_update(skip_locked=True)
+            )
         )
+        if email_ids:
+            lease = lease_seconds if lease_seconds is not None else settings.extraction_lease_seconds
+            db.execute(
+                update(ProcessedEmail)
+                .where(ProcessedEmail.id.in_(email_ids))
+                .values(
+                    extraction_status="claimed",
+                    extraction_claimed_by=worker_id,
+                    extraction_lease_expires_at=now + timedelta(seconds=lease),
+                )
+            )
+        logger.info("extraction_claimed", worker_id=worker_id, emails=len(email_ids))
+        return email_ids
+
+    def extract_claimed(self, db: Session, worker_id: str, email_ids: list[int]) -> list[EmailExtractionResult]:
+        with self.parse_pool(get_settings().extraction_parse_workers, len(email_ids)) as pool:
+            return self._extract_ids(db, email_ids, pool, claimed_by=worker_id)
+
+    def _extract_ids(
+        self,
+        db: Session,
+        email_ids: list[int],
+        pool: ProcessPoolExecutor | None,
+        *,
+        claimed_by: str | None = None,
+    ) -> list[EmailExtractionResult]:
+        chunk_size = max(1, get_settings().extraction_chunk_size)
+        results: list[EmailExtractionResult] = []
+        for start in range(0, len(email_ids), chunk_size):
+            emails = _load_pending_emails(db, email_ids[start : start + chunk_size], claimed_by=claimed_by)
+            results.extend(self._extract_emails(db, emails, pool))
+        return results
+
+    def _extract_emails(
+        self,
+        db: Session,
+        emails: list[ProcessedEmail],
+        pool: ProcessPoolExecutor | None,
+    ) -> list[EmailExtractionResult]:
+        parsed_emails = self.parse_emails(db, emails, pool)
+        for email in emails:
+            if email.extraction_claimed_by is not None:
+                email.extraction_claimed_by = None
+                email.extraction_lease_expires_at = None
+        results = [
+            self.extract_email(db, email, reset_existing=False, parsed=parsed)
+            for email, parsed in zip(emails, parsed_emails)
+        ]
+        # Flushed emails are clean, so the session's weak identity map lets each chunk be collected.
+        db.flush()
+        return results
+
+    def parse_context(self, context: EmailParseContext, db: Session | None = None) -> ParsedEmail:
+        parser = self.parser_registry.select_parser(context)
+        parsed = self._cached_parse(parser, context, db)
+        if parsed is not None:
+            return parsed
+        return self._remember_parse(context, _parse_with_parser(parser, context), db)
+
+    def _cached_parse(
+        self,
+        parser: EmailJobParser | None,
+        context: EmailParseContext,
+        db: Session | None,
+    ) -> ParsedEmail | None:
+        if parser is None:
+            return ParsedEmail(parser=None, opportunities=[])
+        opportunities = self.parse_cache.get(parser, context, db)
+        if opportunities is None:
+            return None
+        return ParsedEmail(parser=parser, opportunities=opportunities)
+
+    def _remember_parse(self, context: EmailParseContext, parsed: ParsedEmail, db: Session | None) -> ParsedEmail:
+        if parsed.parser is not None and parsed.error is None:
+            self.parse_cache.put(parsed.parser, context, parsed.opportunities, db)
+        return parsed
+
+    def parse_pool(self, workers: int, email_count: int) -> AbstractContextManager[ProcessPoolExecutor | None]:
+        if workers <= 1 or email_count <= 1:
+            return nullcontext()
+        logger.info("extraction_parse_pool_started", workers=workers)
+        # spawn rather than fork: ingestion may already be running pipeline or Gmail fetch threads.
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_parse_worker,
+            initargs=(self.parser_registry,),
+        )
+
+    def load_emails(self, db: Session, email_ids: list[int]) -> list[ProcessedEmail]:
+        return _load_emails(db, email_ids)
+
+    def parse_emails(
+        self,
+        db: Session,
+        emails: list[ProcessedEmail],
+        pool: ProcessPoolExecutor | None = None,
+    ) -> list[ParsedEmail]:
+        return self.parse_contexts(self._email_contexts(db, emails), pool, db)
+
+    def parse_contexts(
+        self,
+        contexts: list[EmailParseContext],
+        pool: ProcessPoolExecutor | None = None,
+        db: Session | None = None,
+    ) -> list[ParsedEmail]:
+        if pool is None:
+            return [self.parse_context(context, db) for context in contexts]
+        selected = [self.parser_registry.select_parser(context) for context in contexts]
+        parsed_emails = [self._cached_parse(parser, context, db) for parser, context in zip(selected, contexts)]
+        misses = [index for index, parsed in enumerate(parsed_emails) if parsed is None]
+        # Workers get the parser already chosen here, by its position in the registry, so routing runs
+        # once per email and the routing counters stay in this process.
+        parsers = self.parser_registry.parsers
+        tasks = [(parsers.index(selected[index]), contexts[index]) for index in misses]
+        chunksize = max(1, len(misses) // (get_settings().extraction_parse_workers * 4))
+        for index, (parsed, filter_counts) in zip(misses, pool.map(_parse_in_worker, tasks, chunksize=chunksize)):
+            parser = selected[index]
+            if filter_counts:
+                parser.add_anchor_filter_counts(filter_counts)
+            parsed_emails[index] = self._remember_parse(contexts[index], replace(parsed, parser=parser), db)
+        return parsed_emails
+
+    def _email_context(self, db: Session, email: ProcessedEmail) -> EmailParseContext:
+        return self._email_contexts(db, [email])[0]
+
+    def _email_contexts(self, db: Session, emails: list[ProcessedEmail]) -> list[EmailParseContext]:
+        return [
+            EmailParseContext(
+                sender=email.sender,
+                subject=email.subject,
+                html_body=bodies.html_body,
+                plain_text_body=bodies.plain_text_body,
+            )
+            for email, bodies in zip(emails, self.body_storage.load_many(db, emails))
+        ]
 
     def extract_email_by_id(self, db: Session, email_id: int) -> EmailExtractionResult | None:
         email = db.get(ProcessedEmail, email_id)
@@ -88,18 +327,15 @@ class ExtractionService:
         email: ProcessedEmail,
         *,
         reset_existing: bool,
+        parsed: ParsedEmail | None = None,
     ) -> EmailExtractionResult:
         if reset_existing:
             db.execute(delete(Job).where(Job.processed_email_id == email.id))
             db.flush()
 
-        context = EmailParseContext(
-            sender=email.sender,
-            subject=email.subject,
-            html_body=email.raw_html_body,
-            plain_text_body=email.plain_text_body,
-        )
-        parser = self.parser_registry.select_parser(context)
+        if parsed is None:
+            parsed = self.parse_context(self._email_context(db, email), db)
+        parser = parsed.parser
         parser_name = parser.source if parser else None
         jobs_found = 0
         jobs_created = 0
@@ -108,6 +344,8 @@ class ExtractionService:
         errors: list[str] = []
 
         try:
+            email.parser_name = parser_name
+            email.parser_version = parser.version if parser else None
             if parser is None:
                 email.extraction_status = "failed"
                 email.parsing_error = "No parser available for email content."
@@ -115,7 +353,9 @@ class ExtractionService:
                 logger.warning("email_extraction_failed", email_id=email.id, error=email.parsing_error)
                 return EmailExtractionResult(email.id, None, "failed", 0, 0, 0, 1, errors)
 
-            opportunities = parser.parse(context)
+            if parsed.error is not None:
+                raise parsed.error
+            opportunities = parsed.opportunities
             jobs_found = len(opportunities)
             if not opportunities:
                 email.extraction_status = "no_jobs_found"
@@ -124,22 +364,22 @@ class ExtractionService:
                 email.parsed_at = datetime.now(UTC)
                 return EmailExtractionResult(email.id, parser_name, "no_jobs_found", 0, 0, 0, 0, errors)
 
+            jobs: list[Job] = []
             for opportunity in opportunities:
                 try:
-                    job = self._job_from_opportunity(email, opportunity)
-                    if self._is_duplicate(db, job):
-                        duplicates_skipped += 1
-                        continue
-                    with db.begin_nested():
-                        db.add(job)
-                        db.flush()
-                    jobs_created += 1
+                    jobs.append(self.job_from_opportunity(email, opportunity))
                 except Exception as exc:  # noqa: BLE001
                     failures += 1
                     error = f"email_id={email.id}: {type(exc).__name__}: {exc}"
                     errors.append(error)
                     logger.warning("job_extraction_failed", email_id=email.id, error=str(exc))
 
+            outcome = self._insert_jobs(db, email, jobs)
+            jobs_created = outcome.created
+            duplicates_skipped = outcome.duplicates
+            failures += len(outcome.errors)
+            errors.extend(outcome.errors)
+
             email.jobs_extracted_count = jobs_created
             email.parsed_at = datetime.now(UTC)
             email.parsing_error = f"{failures} job(s) failed during extraction." if failures else None
@@ -165,6 +405,8 @@ class ExtractionService:
                 email = db.get(ProcessedEmail, email_id) or email
             email.extraction_status = "failed"
             email.parsing_error = str(exc)
+            email.parser_name = parser_name
+            email.parser_version = parser.version if parser else None
             email.parsed_at = datetime.now(UTC)
             email.jobs_extracted_count = jobs_created
             db.add(email)
@@ -180,14 +422,14 @@ class ExtractionService:
                 errors=errors,
             )
 
-    def _job_from_opportunity(self, email: ProcessedEmail, opportunity: ParsedOpportunity) -> Job:
+    def job_from_opportunity(self, email: ProcessedEmail, opportunity: ParsedOpportunity) -> Job:
         if email.received_date is None:
             raise ValueError("Email has no received_date; cannot create job received_date.")
 
         job_title = normalize_whitespace(opportunity.job_title)
         company = normalize_whitespace(opportunity.company)
         location = normalize_whitespace(opportunity.location)
-        job_url = normalize_job_url(opportunity.job_url)
+        job_url = analyze_job_url(opportunity.job_url).url
         fingerprint = _conservative_fingerprint(job_title, company, location)
 
         return Job(
@@ -205,17 +447,156 @@ class ExtractionService:
             source_payload={"parser": opportunity.source},
         )
 
-    def _is_duplicate(self, db: Session, job: Job) -> bool:
-        checks = []
-        if job.job_url:
-            checks.append(Job.job_url == job.job_url)
-        if job.external_id:
-            checks.append((Job.source == job.source) & (Job.external_id == job.external_id))
-        if job.dedupe_fingerprint:
-            checks.append(Job.dedupe_fingerprint == job.dedupe_fingerprint)
-        if not checks:
-            return False
-        return db.scalar(select(Job.id).where(or_(*checks)).limit(1)) is not None
+    def _insert_jobs(self, db: Session, email: ProcessedEmail, jobs: list[Job]) -> _JobInsertOutcome:
+        # Repeats within the email are dropped by key set first; duplicates of stored jobs are left to the
+        # unique constraints on job_url, (source, external_id) and dedupe_fingerprint.
+        rows = _unique_job_rows(jobs)
+        repeats = len(jobs) - len(rows)
+        try:
+            with db.begin_nested():
+                created = len(_insert_job_rows(db, rows))
+            return _JobInsertOutcome(created=created, duplicates=len(jobs) - created, errors=[])
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("job_bulk_insert_failed", email_id=email.id, row_count=len(rows), error=str(exc))
+
+        created = 0
+        errors: list[str] = []
+        for row in rows:
+            try:
+                with db.begin_nested():
+                    created += len(_insert_job_rows(db, [row]))
+            except Exception as exc:  # noqa: BLE001
+                errors.append(f"email_id={email.id}: {type(exc).__name__}: {exc}")
+                logger.warning("job_extraction_failed", email_id=email.id, error=str(exc))
+        duplicates = repeats + len(rows) - created - len(errors)
+        return _JobInsertOutcome(created=created, duplicates=duplicates, errors=errors)
+
+
+def _unique_job_rows(jobs: list[Job]) -> list[dict[str, Any]]:
+    seen: set[tuple[str | None, ...]] = set()
+    rows: list[dict[str, Any]] = []
+    for job in jobs:
+        keys = {
+            key
+            for key in (
+                ("job_url", job.job_url),
+                ("external_id", job.source, job.external_id),
+                ("dedupe_fingerprint", job.dedupe_fingerprint),
+            )
+            if key[-1]
+        }
+        if keys & seen:
+            continue
+        seen |= keys
+        rows.append(row_values(job))
+    return rows
+
+
+def _insert_job_rows(db: Session, rows: list[dict[str, Any]]) -> list[Row[Any]]:
+    return insert_on_conflict_do_nothing(db, Job, rows, returning=(Job.id,))
+
+
+_worker_parser_registry: ParserRegistry | None = None
+
+
+def _init_parse_worker(parser_registry: ParserRegistry) -> None:
+    global _worker_parser_registry
+    _worker_parser_registry = parser_registry
+
+
+def _parse_in_worker(task: tuple[int, EmailParseContext]) -> tuple[ParsedEmail, dict[str, int]]:
+    parser_index, context = task
+    parser = (_worker_parser_registry or ParserRegistry()).parsers[parser_index]
+    parsed = _parse_with_parser(parser, context)
+    # The parent swaps its own parser back in; anchor-filter counts travel back with the result.
+    drain_counts = getattr(parser, "drain_anchor_filter_counts", None)
+    return replace(parsed, parser=None), drain_counts() if drain_counts else {}
+
+
+def _parse_with_parser(parser: EmailJobParser | None, context: EmailParseContext) -> ParsedEmail:
+    if parser is None:
+        return ParsedEmail(parser=None, opportunities=[])
+    try:
+        return ParsedEmail(parser=parser, opportunities=parser.parse(context))
+    except Exception as exc:  # noqa: BLE001
+        return ParsedEmail(parser=parser, opportunities=[], error=exc)
+
+
+def _load_pending_emails(db: Session, email_ids: list[int], *, claimed_by: str | None = None) -> list[ProcessedEmail]:
+    if claimed_by is None:
+        claim_filter = _claimable(datetime.now(UTC))
+    else:
+        claim_filter = and_(
+            ProcessedEmail.extraction_status == "claimed",
+            ProcessedEmail.extraction_claimed_by == claimed_by,
+        )
+    return _load_emails(db, email_ids, claim_filter)
+
+
+def _load_emails(db: Session, email_ids: list[int], *criteria: ColumnElement[bool]) -> list[ProcessedEmail]:
+    return list(
+        db.scalars(
+            _select_emails()
+            .where(ProcessedEmail.id.in_(email_ids), *criteria)
+            .order_by(ProcessedEmail.received_date.asc().nullsfirst(), ProcessedEmail.id.asc())
+        )
+    )
+
+
+def _load_email_page(db: Session, *, after_id: int, limit: int) -> list[ProcessedEmail]:
+    return list(
+        db.scalars(
+            _select_emails()
+            .where(ProcessedEmail.id > after_id)
+            .where(ProcessedEmail.status == "ingested")
+            .where(_claimable(datetime.now(UTC)))
+            .order_by(ProcessedEmail.id.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+    )
+
+
+def _select_emails() -> Select[tuple[ProcessedEmail]]:
+    return select(ProcessedEmail).options(
+        load_only(
+            ProcessedEmail.sender,
+            ProcessedEmail.subject,
+            ProcessedEmail.received_date,
+            ProcessedEmail.raw_html_body,
+            ProcessedEmail.plain_text_body,
+            ProcessedEmail.html_body_key,
+            ProcessedEmail.text_body_key,
+            ProcessedEmail.raw_mime_key,
+            ProcessedEmail.extraction_status,
+            ProcessedEmail.extraction_claimed_by,
+        )
+    )
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"[-64:]
+
+
+def _claimable(now: datetime) -> ColumnElement[bool]:
+    return or_(
+        ProcessedEmail.extraction_status == "pending",
+        and_(ProcessedEmail.extraction_status == "claimed", ProcessedEmail.extraction_lease_expires_at < now),
+    )
+
+
+def summarize_extraction(results: list[EmailExtractionResult]) -> ExtractionResult:
+    return ExtractionResult(
+        emails_processed=len(results),
+        emails_parsed=sum(1 for result in results if result.extraction_status == "parsed"),
+        emails_partially_parsed=sum(1 for result in results if result.extraction_status == "partially_parsed"),
+        emails_failed=sum(1 for result in results if result.extraction_status == "failed"),
+        emails_with_no_jobs=sum(1 for result in results if result.extraction_status == "no_jobs_found"),
+        jobs_found=sum(result.jobs_found for result in results),
+        jobs_created=sum(result.jobs_created for result in results),
+        duplicates_skipped=sum(result.duplicates_skipped for result in results),
+        errors=[error for result in results for error in result.errors],
+    )
 
 
 def _conservative_fingerprint(title: str | None, company: str | None, location: str | None) -> str | None:
@@ -2,13 +2,23 @@ from __future__ import annotations
 
 import base64
 import json
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from app.core.config import get_settings
 from app.core.logging import get_logger
+from app.utils.rate_limit import TokenBucket
 
 GMAIL_SCOPES = ["https://www.googleapis.com/auth/gmail.readonly"]
+GMAIL_BATCH_MAX_REQUESTS = 100
+# Gmail API per-method quota unit costs.
+QUOTA_UNITS_MESSAGES_GET = 5
+QUOTA_UNITS_MESSAGES_LIST = 5
+QUOTA_UNITS_HISTORY_LIST = 2
+QUOTA_UNITS_GET_PROFILE = 1
 logger = get_logger(__name__)
 
 
@@ -16,6 +26,17 @@ class GmailCredentialsError(RuntimeError):
     pass
 
 
+class GmailHistoryExpiredError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class GmailHistoryPage:
+    message_ids: list[str]
+    history_id: str
+    truncated: bool = False
+
+
 class GmailClient:
     def __init__(
         self,
@@ -25,6 +46,9 @@ class GmailClient:
         token_json: str | None = None,
         google_client_id: str | None = None,
         google_client_secret: str | None = None,
+        rate_limiter: TokenBucket | None = None,
+        account_email: str | None = None,
+        discovery_document_path: Path | None = None,
     ) -> None:
         settings = get_settings()
         self.oauth_client_path = oauth_client_path or settings.gmail_oauth_client_path
@@ -34,26 +58,69 @@ class GmailClient:
         self.google_client_secret = (
             google_client_secret if google_client_secret is not None else settings.google_client_secret
         )
-        self._service: Any | None = None
+        if rate_limiter is None and settings.gmail_quota_units_per_second > 0:
+            rate_limiter = TokenBucket(settings.gmail_quota_units_per_second)
+        self.rate_limiter = rate_limiter
+        self.discovery_document_path = discovery_document_path or settings.gmail_discovery_document_path
+        self._account_email = account_email or settings.gmail_account_email
+        self._credentials: Any | None = None
+        self._credentials_lock = threading.Lock()
+        self._thread_state = threading.local()
 
     def build_service(self) -> Any:
-        if self._service is not None:
-            return self._service
-        credentials = self._load_credentials()
-        from googleapiclient.discovery import build
-
-        self._service = build("gmail", "v1", credentials=credentials)
-        return self._service
+        # googleapiclient services wrap a non-thread-safe httplib2 connection, so each thread gets its own.
+        service = getattr(self._thread_state, "service", None)
+        if service is None:
+            service = self._new_service()
+            self._thread_state.service = service
+        return service
+
+    def _new_service(self) -> Any:
+        with self._credentials_lock:
+            if self._credentials is None:
+                self._credentials = self._load_credentials()
+        from googleapiclient.discovery import build_from_document
+
+        return build_from_document(gmail_discovery_document(self.discovery_document_path), credentials=self._credentials)
+
+    def _consume_quota(self, units: int) -> None:
+        if self.rate_limiter is None:
+            return
+        waited_seconds = self.rate_limiter.acquire(units)
+        if waited_seconds:
+            logger.debug("gmail_quota_throttled", units=units, waited_seconds=round(waited_seconds, 3))
 
     def list_message_ids(self, *, query: str, max_results: int) -> list[str]:
         service = self.build_service()
-        account_email = self._safe_account_email(service)
         logger.info(
             "gmail_list_messages_started",
             query=query,
             max_results=max_results,
-            authenticated_email=account_email,
+            authenticated_email=self._account_email,
+        )
+        try:
+            message_ids = self._list_message_ids(service, query=query, max_results=max_results)
+        except Exception as exc:
+            # Only a failed listing pays for the getProfile round trip that says which account was used.
+            logger.error(
+                "gmail_list_messages_failed",
+                query=query,
+                authenticated_email=self._diagnostic_account_email(service),
+                error_type=type(exc).__name__,
+                error=str(exc),
+            )
+            raise
+
+        logger.info(
+            "gmail_list_messages_completed",
+            query=query,
+            max_results=max_results,
+            authenticated_email=self._account_email,
+            returned_message_count=len(message_ids),
         )
+        return message_ids
+
+    def _list_message_ids(self, service: Any, *, query: str, max_results: int) -> list[str]:
         message_ids: list[str] = []
         request = (
             service.users()
@@ -62,6 +129,7 @@ class GmailClient:
         )
 
         while request is not None and len(message_ids) < max_results:
+            self._consume_quota(QUOTA_UNITS_MESSAGES_LIST)
             response = request.execute()
             message_ids.extend(message["id"] for message in response.get("messages", []))
             logger.info(
@@ -73,18 +141,90 @@ class GmailClient:
             if len(message_ids) >= max_results:
                 break
             request = service.users().messages().list_next(request, response)
+        return message_ids[:max_results]
+
+    def get_profile(self) -> dict[str, Any]:
+        service = self.build_service()
+        self._consume_quota(QUOTA_UNITS_GET_PROFILE)
+        profile = service.users().getProfile(userId="me").execute()
+        if isinstance(profile.get("emailAddress"), str):
+            self._account_email = profile["emailAddress"]
+        return profile
+
+    @property
+    def known_account_email(self) -> str | None:
+        return self._account_email
+
+    def account_email(self) -> str:
+        if self._account_email is None:
+            return self.get_profile().get("emailAddress") or "me"
+        return self._account_email
+
+    def list_history_message_ids(
+        self,
+        *,
+        start_history_id: str,
+        label_id: str | None,
+        max_results: int,
+        required_label_ids: frozenset[str] = frozenset(),
+    ) -> GmailHistoryPage:
+        from googleapiclient.errors import HttpError
+
+        service = self.build_service()
+        params: dict[str, Any] = {
+            "userId": "me",
+            "startHistoryId": start_history_id,
+            "historyTypes": ["messageAdded"],
+            "maxResults": 500,
+        }
+        if label_id:
+            params["labelId"] = label_id
+        request = service.users().history().list(**params)
+        message_ids: list[str] = []
+        seen_ids: set[str] = set()
+        history_id = start_history_id
+
+        while request is not None:
+            self._consume_quota(QUOTA_UNITS_HISTORY_LIST)
+            try:
+                response = request.execute()
+            except HttpError as exc:
+                if getattr(exc.resp, "status", None) == 404:
+                    raise GmailHistoryExpiredError(
+                        f"Gmail history checkpoint {start_history_id} is no longer available."
+                    ) from exc
+                raise
+            for record in response.get("history", []):
+                for added in record.get("messagesAdded", []):
+                    message = added.get("message", {})
+                    if not required_label_ids <= set(message.get("labelIds", [])):
+                        continue
+                    message_id = message.get("id")
+                    if message_id and message_id not in seen_ids:
+                        seen_ids.add(message_id)
+                        message_ids.append(message_id)
+                if len(message_ids) >= max_results:
+                    logger.info(
+                        "gmail_history_truncated",
+                        start_history_id=start_history_id,
+                        checkpoint_history_id=record["id"],
+                        returned_message_count=len(message_ids),
+                    )
+                    return GmailHistoryPage(message_ids=message_ids, history_id=str(record["id"]), truncated=True)
+            history_id = str(response.get("historyId") or history_id)
+            request = service.users().history().list_next(request, response)
 
         logger.info(
-            "gmail_list_messages_completed",
-            query=query,
-            max_results=max_results,
-            authenticated_email=account_email,
-            returned_message_count=len(message_ids[:max_results]),
+            "gmail_history_listed",
+            start_history_id=start_history_id,
+            history_id=history_id,
+            returned_message_count=len(message_ids),
         )
-        return message_ids[:max_results]
+        return GmailHistoryPage(message_ids=message_ids, history_id=history_id)
 
     def get_message_full(self, message_id: str) -> dict[str, Any]:
         service = self.build_service()
+        self._consume_quota(QUOTA_UNITS_MESSAGES_GET)
         return (
             service.users()
             .messages()
@@ -94,16 +234,47 @@ class GmailClient:
 
     def get_message_raw_mime(self, message_id: str) -> str | None:
         service = self.build_service()
+        self._consume_quota(QUOTA_UNITS_MESSAGES_GET)
         response = (
             service.users()
             .messages()
             .get(userId="me", id=message_id, format="raw")
             .execute()
         )
-        raw = response.get("raw")
-        if not raw:
-            return None
-        return _decode_base64url(raw).decode("utf-8", errors="replace")
+        return raw_mime_from_message(response)
+
+    def get_messages_batch(
+        self,
+        message_ids: list[str],
+        *,
+        format: str,
+        metadata_headers: list[str] | None = None,
+    ) -> dict[str, dict[str, Any] | Exception]:
+        service = self.build_service()
+        results: dict[str, dict[str, Any] | Exception] = {}
+
+        def collect(request_id: str, response: dict[str, Any] | None, exception: Exception | None) -> None:
+            results[request_id] = exception if exception is not None else (response or {})
+
+        for start in range(0, len(message_ids), GMAIL_BATCH_MAX_REQUESTS):
+            chunk = message_ids[start : start + GMAIL_BATCH_MAX_REQUESTS]
+            self._consume_quota(QUOTA_UNITS_MESSAGES_GET * len(chunk))
+            batch = service.new_batch_http_request(callback=collect)
+            for message_id in chunk:
+                params: dict[str, Any] = {"userId": "me", "id": message_id, "format": format}
+                if metadata_headers:
+                    params["metadataHeaders"] = metadata_headers
+                batch.add(service.users().messages().get(**params), request_id=message_id)
+            batch.execute()
+            logger.info(
+                "gmail_batch_get_completed",
+                format=format,
+                requested_message_count=len(chunk),
+                failed_message_count=sum(
+                    1 for message_id in chunk if isinstance(results.get(message_id), Exception)
+                ),
+            )
+        return results
 
     def _load_credentials(self) -> Any:
         from google.auth.transport.requests import Request
@@ -168,14 +339,20 @@ class GmailClient:
 
         return credentials
 
-    def _safe_account_email(self, service: Any) -> str | None:
+    def _diagnostic_account_email(self, service: Any) -> str | None:
+        if self._account_email is not None:
+            return self._account_email
         try:
+            self._consume_quota(QUOTA_UNITS_GET_PROFILE)
             profile = service.users().getProfile(userId="me").execute()
         except Exception as exc:  # noqa: BLE001
             logger.warning("gmail_profile_lookup_failed", error_type=type(exc).__name__, error=str(exc))
             return None
         email = profile.get("emailAddress")
-        return email if isinstance(email, str) else None
+        if not isinstance(email, str):
+            return None
+        self._account_email = email
+        return email
 
 
 def credentials_from_token_json(
@@ -207,6 +384,26 @@ def credentials_from_token_json(
     return Credentials.from_authorized_user_info(token_info, GMAIL_SCOPES)
 
 
+@lru_cache(maxsize=4)
+def gmail_discovery_document(path: Path | None = None) -> dict[str, Any]:
+    # Parsed once per process and shared by every per-thread service instead of re-reading it on each build().
+    if path is not None:
+        return json.loads(_resolve_backend_path(path).read_text(encoding="utf-8"))
+    from googleapiclient.discovery_cache import get_static_doc
+
+    document = get_static_doc("gmail", "v1")
+    if document is None:
+        raise RuntimeError("The installed google-api-python-client does not bundle the Gmail v1 discovery document.")
+    return json.loads(document)
+
+
+def raw_mime_from_message(message: dict[str, Any]) -> str | None:
+    raw = message.get("raw")
+    if not raw:
+        return None
+    return _decode_base64url(raw).decode("utf-8", errors="replace")
+
+
 def _resolve_backend_path(path: Path) -> Path:
     if path.is_absolute():
         return path
@@ -1,21 +1,47 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from email import message_from_string
+from email import message_from_bytes, message_from_string
+from email.message import EmailMessage
 from email.policy import default
 from email.utils import getaddresses, parsedate_to_datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from sqlalchemy import select
+from sqlalchemy import delete, or_, select, update
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.core.logging import get_logger
-from app.db.models import IngestionRun, ProcessedEmail
-from app.services.gmail_client import GmailClient
+from app.db.bulk import insert_on_conflict_do_nothing, row_values
+from app.db.models import GmailSyncCheckpoint, IngestionRun, ProcessedEmail
+from app.services.body_storage import BodyStorage, get_body_storage, message_bodies
+from app.services.gmail_client import GmailClient, GmailHistoryExpiredError, raw_mime_from_message
+from app.services.parsers import ParserRegistry
+
+if TYPE_CHECKING:
+    from app.services.ingestion_pipeline import IngestionPipeline
 
 logger = get_logger(__name__)
+_T = TypeVar("_T")
+METADATA_HEADERS = ["From", "To", "Subject", "Date"]
+QUERY_LABEL_IDS = {
+    "is:unread": "UNREAD",
+    "is:starred": "STARRED",
+    "is:important": "IMPORTANT",
+    "in:inbox": "INBOX",
+    "in:sent": "SENT",
+    "in:spam": "SPAM",
+    "in:trash": "TRASH",
+    "category:primary": "CATEGORY_PERSONAL",
+    "category:social": "CATEGORY_SOCIAL",
+    "category:promotions": "CATEGORY_PROMOTIONS",
+    "category:updates": "CATEGORY_UPDATES",
+    "category:forums": "CATEGORY_FORUMS",
+}
 
 
 @dataclass(frozen=True)
@@ -25,13 +51,49 @@ class GmailIngestionResult:
     duplicates_skipped: int
     failures: int
     errors: list[str]
+    sync_mode: str = "full"
+    non_job_alerts_skipped: int = 0
+
+
+@dataclass(frozen=True)
+class _StoreOutcome:
+    stored: int
+    non_job_alerts: int
+    conflicts: int
+    failures: int
+    errors: list[str]
+    ingested_ids: set[str] = field(default_factory=set)
+
+
+@dataclass(frozen=True)
+class FetchedMessages:
+    message_ids: list[str]
+    records: dict[str, ProcessedEmail | Exception]
+    candidate_ids: list[str] = field(default_factory=list)
+    raw_messages: dict[str, dict[str, Any] | Exception] = field(default_factory=dict)
+    full_messages: dict[str, dict[str, Any] | Exception] | None = None
+
+
+@dataclass(frozen=True)
+class _MessageDiscovery:
+    message_ids: list[str]
+    sync_mode: str
+    account_email: str | None = None
+    history_id: str | None = None
 
 
 class GmailIngestionService:
-    def __init__(self, gmail_client: GmailClient | None = None) -> None:
+    def __init__(
+        self,
+        gmail_client: GmailClient | None = None,
+        parser_registry: ParserRegistry | None = None,
+        body_storage: BodyStorage | None = None,
+    ) -> None:
         self.gmail_client = gmail_client or GmailClient()
+        self.parser_registry = parser_registry or ParserRegistry()
+        self.body_storage = body_storage or get_body_storage()
 
-    def run_once(self, db: Session) -> GmailIngestionResult:
+    def run_once(self, db: Session, *, pipeline: IngestionPipeline | None = None) -> GmailIngestionResult:
         settings = get_settings()
         run = IngestionRun(source="gmail", status="started")
         db.add(run)
@@ -40,16 +102,22 @@ class GmailIngestionService:
         discovered = 0
         stored = 0
         skipped = 0
+        non_job_alerts = 0
         failures = 0
         errors: list[str] = []
+        sync_mode = "full"
         run_recorded_after_rollback = False
 
         try:
             logger.info("gmail_ingestion_started", query=settings.gmail_query, max_results=settings.gmail_max_results)
-            message_ids = self.gmail_client.list_message_ids(
-                query=settings.gmail_query,
-                max_results=settings.gmail_max_results,
-            )
+            discovery = self._discover_message_ids(db)
+            message_ids = discovery.message_ids
+            sync_mode = discovery.sync_mode
+            listed = set(message_ids)
+            message_ids = [
+                *(message_id for message_id in self._reevaluate_skipped(db) if message_id not in listed),
+                *message_ids,
+            ]
             discovered = len(message_ids)
             logger.info("gmail_messages_found", count=discovered)
 
@@ -61,45 +129,40 @@ class GmailIngestionService:
                 ).all()
             )
 
-            for message_id in message_ids:
-                if message_id in existing_ids:
-                    skipped += 1
-                    continue
-
-                try:
-                    email_record = self._fetch_and_build_record(message_id)
-                    with db.begin_nested():
-                        db.add(email_record)
-                        db.flush()
-                    stored += 1
-                except Exception as exc:  # noqa: BLE001
-                    error = f"message_id={message_id}: {type(exc).__name__}: {exc}"
-                    errors.append(error)
-                    logger.warning("gmail_message_ingestion_failed", message_id=message_id, error=str(exc))
-                    with db.begin_nested():
-                        db.add(
-                            ProcessedEmail(
-                                gmail_message_id=message_id,
-                                status="failed",
-                                recipients=[],
-                                error_summary=str(exc),
-                            )
-                        )
-                        db.flush()
-                    failures += 1
-
+            new_message_ids = [message_id for message_id in message_ids if message_id not in existing_ids]
+            skipped = discovered - len(new_message_ids)
+            batch_size = max(1, settings.gmail_batch_size)
+            chunks = [
+                new_message_ids[start : start + batch_size] for start in range(0, len(new_message_ids), batch_size)
+            ]
+
+            chunk_stream = self._fetch_chunks(chunks) if pipeline is None else pipeline.stream(chunks)
+            for chunk, records in chunk_stream:
+                outcome = self.store_records(db, chunk, records)
+                if pipeline is not None:
+                    pipeline.persist(db, outcome.ingested_ids)
+                stored += outcome.stored
+                non_job_alerts += outcome.non_job_alerts
+                skipped += outcome.conflicts
+                failures += outcome.failures
+                errors.extend(outcome.errors)
+
+            if discovery.account_email and discovery.history_id:
+                _save_checkpoint(db, discovery.account_email, discovery.history_id, run)
             run.status = "completed" if failures == 0 else "completed_with_errors"
         except Exception as exc:  # noqa: BLE001
             failures += 1
             errors.append(f"{type(exc).__name__}: {exc}")
             db.rollback()
+            if pipeline is not None:
+                pipeline.discard()
             stored = 0
             run = IngestionRun(
                 source="gmail",
                 status="failed",
                 emails_seen=discovered,
                 emails_processed=stored,
-                emails_skipped=skipped,
+                emails_skipped=skipped + non_job_alerts,
                 jobs_created=0,
                 jobs_skipped_duplicate=0,
                 jobs_failed=0,
@@ -114,7 +177,7 @@ class GmailIngestionService:
             if not run_recorded_after_rollback:
                 run.emails_seen = discovered
                 run.emails_processed = stored
-                run.emails_skipped = skipped
+                run.emails_skipped = skipped + non_job_alerts
                 run.jobs_created = 0
                 run.jobs_skipped_duplicate = 0
                 run.jobs_failed = 0
@@ -124,7 +187,9 @@ class GmailIngestionService:
                 emails_discovered=discovered,
                 new_emails_stored=stored,
                 duplicates_skipped=skipped,
+                non_job_alerts_skipped=non_job_alerts,
                 failures=failures,
+                sync_mode=sync_mode,
             )
 
         return GmailIngestionResult(
@@ -133,31 +198,374 @@ class GmailIngestionService:
             duplicates_skipped=skipped,
             failures=failures,
             errors=errors,
+            sync_mode=sync_mode,
+            non_job_alerts_skipped=non_job_alerts,
+        )
+
+    def _reevaluate_skipped(self, db: Session) -> list[str]:
+        # Prefiltered messages keep their headers, so a message the current rules now accept is fetched
+        # again even when incremental sync will never list it a second time.
+        settings = get_settings()
+        if not settings.gmail_metadata_prefilter:
+            return []
+        fingerprint = self.parser_registry.rules_fingerprint
+        stale = db.execute(
+            select(ProcessedEmail.id, ProcessedEmail.gmail_message_id, ProcessedEmail.sender, ProcessedEmail.subject)
+            .where(
+                ProcessedEmail.status == "skipped",
+                or_(ProcessedEmail.prefilter_rules.is_(None), ProcessedEmail.prefilter_rules != fingerprint),
+            )
+            .order_by(ProcessedEmail.id)
+            .limit(settings.gmail_max_results)
+        ).all()
+        if not stale:
+            return []
+        candidates = [row for row in stale if self.parser_registry.is_job_alert_candidate(row.sender, row.subject)]
+        candidate_ids = {row.id for row in candidates}
+        unchanged_ids = [row.id for row in stale if row.id not in candidate_ids]
+        if candidate_ids:
+            db.execute(delete(ProcessedEmail).where(ProcessedEmail.id.in_(candidate_ids)))
+        if unchanged_ids:
+            db.execute(
+                update(ProcessedEmail).where(ProcessedEmail.id.in_(unchanged_ids)).values(prefilter_rules=fingerprint)
+            )
+        logger.info("gmail_skipped_messages_reevaluated", skipped=len(stale), candidates=len(candidates))
+        return [row.gmail_message_id for row in candidates]
+
+    def _discover_message_ids(self, db: Session) -> _MessageDiscovery:
+        settings = get_settings()
+        required_label_ids = query_label_ids(settings.gmail_query)
+        if settings.gmail_incremental_sync and required_label_ids is None:
+            # History records only carry label ids, so a query with any other term can't be applied to the
+            # delta; listing with the query every run is the only way to honour it.
+            logger.warning("gmail_incremental_sync_unsupported_query", query=settings.gmail_query)
+        if not settings.gmail_incremental_sync or required_label_ids is None:
+            return _MessageDiscovery(
+                message_ids=self.gmail_client.list_message_ids(
+                    query=settings.gmail_query,
+                    max_results=settings.gmail_max_results,
+                ),
+                sync_mode="full",
+            )
+
+        profile: dict[str, Any] | None = None
+        account_email = self.gmail_client.known_account_email
+        if account_email is None:
+            profile = self.gmail_client.get_profile()
+            account_email = profile.get("emailAddress") or "me"
+        checkpoint = db.scalar(
+            select(GmailSyncCheckpoint).where(GmailSyncCheckpoint.account_email == account_email)
+        )
+        if checkpoint is not None:
+            try:
+                page = self.gmail_client.list_history_message_ids(
+                    start_history_id=checkpoint.history_id,
+                    label_id=settings.gmail_history_label_id,
+                    max_results=settings.gmail_max_results,
+                    required_label_ids=required_label_ids,
+                )
+                return _MessageDiscovery(
+                    message_ids=page.message_ids,
+                    sync_mode="incremental",
+                    account_email=account_email,
+                    history_id=page.history_id,
+                )
+            except GmailHistoryExpiredError as exc:
+                logger.warning(
+                    "gmail_history_checkpoint_expired",
+                    account_email=account_email,
+                    history_id=checkpoint.history_id,
+                    error=str(exc),
+                )
+
+        # The starting historyId has to be read before listing so nothing delivered mid-run is skipped.
+        if profile is None:
+            profile = self.gmail_client.get_profile()
+        message_ids = self.gmail_client.list_message_ids(
+            query=settings.gmail_query,
+            max_results=settings.gmail_max_results,
+        )
+        history_id = str(profile["historyId"]) if profile.get("historyId") else None
+        if len(message_ids) >= settings.gmail_max_results:
+            # Mail past GMAIL_MAX_RESULTS was not listed, and history from this point on would never
+            # include it, so keep doing full listings until one fits under the cap.
+            logger.warning(
+                "gmail_full_sync_truncated",
+                account_email=account_email,
+                max_results=settings.gmail_max_results,
+            )
+            history_id = None
+        return _MessageDiscovery(
+            message_ids=message_ids,
+            sync_mode="full",
+            account_email=account_email,
+            history_id=history_id,
         )
 
-    def _fetch_and_build_record(self, message_id: str) -> ProcessedEmail:
-        full_message = self.gmail_client.get_message_full(message_id)
-        raw_mime = self.gmail_client.get_message_raw_mime(message_id)
-
-        headers = _headers_from_payload(full_message.get("payload", {}))
-        text_body, html_body = _extract_bodies(raw_mime, full_message.get("payload", {}))
-        received_date = _received_datetime(full_message, headers)
-
-        return ProcessedEmail(
-            gmail_message_id=full_message["id"],
-            gmail_thread_id=full_message.get("threadId"),
-            source="gmail",
-            sender=_header_value(headers, "From"),
-            recipients=_recipient_values(headers),
-            subject=_header_value(headers, "Subject"),
-            received_date=received_date,
-            raw_html_body=html_body,
-            plain_text_body=text_body,
-            raw_mime=raw_mime,
-            headers=headers,
-            status="ingested",
+    def build_record(self, message: dict[str, Any], raw_mime: str | bytes | None) -> ProcessedEmail:
+        return _build_record(message, raw_mime)
+
+    @staticmethod
+    def headers_from_message(parsed_message: EmailMessage) -> dict[str, str]:
+        return _headers_from_message(parsed_message)
+
+    @staticmethod
+    def header_value(headers: dict[str, str], name: str) -> str | None:
+        return _header_value(headers, name)
+
+    def store_records(
+        self,
+        db: Session,
+        message_ids: list[str],
+        records: dict[str, ProcessedEmail | Exception],
+    ) -> _StoreOutcome:
+        errors: list[str] = []
+        emails: list[ProcessedEmail] = []
+        for message_id in message_ids:
+            record = records[message_id]
+            if isinstance(record, Exception):
+                errors.append(f"message_id={message_id}: {type(record).__name__}: {record}")
+                logger.warning("gmail_message_ingestion_failed", message_id=message_id, error=str(record))
+                record = _failed_record(message_id, record)
+            emails.append(record)
+        self.body_storage.offload(db, emails)
+        rows = [row_values(email) for email in emails]
+
+        try:
+            with db.begin_nested():
+                inserted_ids = _insert_email_rows(db, rows)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("gmail_bulk_insert_failed", row_count=len(rows), error=str(exc))
+            inserted_ids = set()
+            for index, row in enumerate(rows):
+                try:
+                    with db.begin_nested():
+                        inserted_ids |= _insert_email_rows(db, [row])
+                except Exception as row_exc:  # noqa: BLE001
+                    message_id = row["gmail_message_id"]
+                    errors.append(f"message_id={message_id}: {type(row_exc).__name__}: {row_exc}")
+                    logger.warning("gmail_message_ingestion_failed", message_id=message_id, error=str(row_exc))
+                    rows[index] = row_values(_failed_record(message_id, row_exc))
+                    with db.begin_nested():
+                        inserted_ids |= _insert_email_rows(db, [rows[index]])
+
+        statuses = [row["status"] for row in rows if row["gmail_message_id"] in inserted_ids]
+        return _StoreOutcome(
+            ingested_ids={
+                row["gmail_message_id"]
+                for row in rows
+                if row["gmail_message_id"] in inserted_ids and row["status"] == "ingested"
+            },
+            stored=statuses.count("ingested"),
+            non_job_alerts=statuses.count("skipped"),
+            conflicts=len(rows) - len(statuses),
+            failures=len(errors),
+            errors=errors,
         )
 
+    def _fetch_chunks(
+        self,
+        chunks: list[list[str]],
+    ) -> Iterator[tuple[list[str], dict[str, ProcessedEmail | Exception]]]:
+        return self.map_chunks(self._fetch_records, chunks)
+
+    def map_chunks(self, fetch: Callable[[list[str]], _T], chunks: list[list[str]]) -> Iterator[tuple[list[str], _T]]:
+        workers = get_settings().gmail_fetch_workers
+        if workers <= 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                yield chunk, fetch(chunk)
+            return
+
+        # Fetching and MIME decoding run on worker threads; results are yielded back in order so
+        # every database write stays on the calling thread's session.
+        logger.info("gmail_parallel_fetch_started", workers=workers, chunk_count=len(chunks))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gmail-fetch") as executor:
+            pending: deque[tuple[list[str], Future[_T]]] = deque()
+            for chunk in chunks:
+                pending.append((chunk, executor.submit(fetch, chunk)))
+                if len(pending) >= workers * 2:
+                    ready_chunk, future = pending.popleft()
+                    yield ready_chunk, future.result()
+            while pending:
+                ready_chunk, future = pending.popleft()
+                yield ready_chunk, future.result()
+
+    def _fetch_records(self, message_ids: list[str]) -> dict[str, ProcessedEmail | Exception]:
+        return self.decode_messages(self.fetch_messages(message_ids))
+
+    def fetch_messages(self, message_ids: list[str]) -> FetchedMessages:
+        settings = get_settings()
+        records: dict[str, ProcessedEmail | Exception] = {}
+        candidate_ids = message_ids
+        if settings.gmail_metadata_prefilter:
+            try:
+                metadata_messages = self.gmail_client.get_messages_batch(
+                    message_ids,
+                    format="metadata",
+                    metadata_headers=METADATA_HEADERS,
+                )
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("gmail_metadata_fetch_failed", message_count=len(message_ids), error=str(exc))
+                return FetchedMessages(message_ids, {message_id: exc for message_id in message_ids})
+
+            candidate_ids = []
+            for message_id in message_ids:
+                try:
+                    metadata_message = _batch_response(metadata_messages, message_id)
+                    headers = _headers_from_payload(metadata_message.get("payload", {}))
+                    if self.parser_registry.is_job_alert_candidate(
+                        _header_value(headers, "From"),
+                        _header_value(headers, "Subject"),
+                    ):
+                        candidate_ids.append(message_id)
+                    else:
+                        records[message_id] = _build_skipped_record(
+                            metadata_message, headers, self.parser_registry.rules_fingerprint
+                        )
+                except Exception as exc:  # noqa: BLE001
+                    records[message_id] = exc
+
+            logger.info(
+                "gmail_metadata_prefilter_completed",
+                message_count=len(message_ids),
+                candidate_count=len(candidate_ids),
+            )
+            if not candidate_ids:
+                return FetchedMessages(message_ids, records)
+
+        try:
+            full_messages = (
+                None if settings.gmail_raw_only else self.gmail_client.get_messages_batch(candidate_ids, format="full")
+            )
+            raw_messages = self.gmail_client.get_messages_batch(candidate_ids, format="raw")
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("gmail_batch_fetch_failed", message_count=len(candidate_ids), error=str(exc))
+            records.update({message_id: exc for message_id in candidate_ids})
+            return FetchedMessages(message_ids, records)
+        return FetchedMessages(message_ids, records, candidate_ids, raw_messages, full_messages)
+
+    def decode_messages(self, fetched: FetchedMessages) -> dict[str, ProcessedEmail | Exception]:
+        records = dict(fetched.records)
+        for message_id in fetched.candidate_ids:
+            try:
+                raw_message = _batch_response(fetched.raw_messages, message_id)
+                message = (
+                    raw_message if fetched.full_messages is None else _batch_response(fetched.full_messages, message_id)
+                )
+                records[message_id] = _build_record(message, raw_mime_from_message(raw_message))
+            except Exception as exc:  # noqa: BLE001
+                records[message_id] = exc
+        return records
+
+
+def _insert_email_rows(db: Session, rows: list[dict[str, Any]]) -> set[str]:
+    inserted = insert_on_conflict_do_nothing(
+        db,
+        ProcessedEmail,
+        rows,
+        index_elements=["gmail_message_id"],
+        returning=(ProcessedEmail.gmail_message_id,),
+    )
+    return {row.gmail_message_id for row in inserted}
+
+
+def _failed_record(message_id: str, exc: Exception) -> ProcessedEmail:
+    return ProcessedEmail(
+        gmail_message_id=message_id,
+        status="failed",
+        recipients=[],
+        error_summary=str(exc),
+    )
+
+
+def _save_checkpoint(db: Session, account_email: str, history_id: str, run: IngestionRun) -> None:
+    checkpoint = db.scalar(
+        select(GmailSyncCheckpoint).where(GmailSyncCheckpoint.account_email == account_email)
+    )
+    if checkpoint is None:
+        checkpoint = GmailSyncCheckpoint(account_email=account_email, history_id=history_id)
+        db.add(checkpoint)
+    checkpoint.history_id = history_id
+    checkpoint.ingestion_run_id = run.id
+    db.flush()
+    logger.info("gmail_history_checkpoint_saved", account_email=account_email, history_id=history_id)
+
+
+def _batch_response(responses: dict[str, dict[str, Any] | Exception], message_id: str) -> dict[str, Any]:
+    response = responses.get(message_id)
+    if isinstance(response, Exception):
+        raise response
+    if response is None:
+        raise RuntimeError("Gmail batch response did not include this message.")
+    return response
+
+
+def _build_record(message: dict[str, Any], raw_mime: str | bytes | None) -> ProcessedEmail:
+    if isinstance(raw_mime, bytes):
+        # Parsing the bytes lets each part decode with its own declared charset.
+        parsed_message = message_from_bytes(raw_mime, policy=default)
+        raw_mime = _mime_text(raw_mime, parsed_message)
+    else:
+        parsed_message = message_from_string(raw_mime, policy=default) if raw_mime else None
+    payload = message.get("payload")
+    if payload is None and parsed_message is not None:
+        headers = _headers_from_message(parsed_message)
+    else:
+        headers = _headers_from_payload(payload or {})
+    text_body, html_body = _extract_bodies(parsed_message, payload or {})
+    received_date = _received_datetime(message, headers)
+
+    return ProcessedEmail(
+        gmail_message_id=message["id"],
+        gmail_thread_id=message.get("threadId"),
+        source="gmail",
+        sender=_header_value(headers, "From"),
+        recipients=_recipient_values(headers),
+        subject=_header_value(headers, "Subject"),
+        received_date=received_date,
+        raw_html_body=html_body,
+        plain_text_body=text_body,
+        raw_mime=raw_mime,
+        headers=headers,
+        rfc822_message_id=_rfc822_message_id(headers),
+        status="ingested",
+    )
+
+
+def _mime_text(raw_mime: bytes, parsed_message: EmailMessage) -> str:
+    try:
+        return raw_mime.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+    charsets = [part.get_content_charset() for part in parsed_message.walk() if part.get_content_charset()]
+    try:
+        return raw_mime.decode(charsets[0] if charsets else "latin-1", errors="replace")
+    except LookupError:
+        return raw_mime.decode("latin-1")
+
+
+def query_label_ids(query: str) -> frozenset[str] | None:
+    label_ids = [QUERY_LABEL_IDS.get(term) for term in query.lower().split()]
+    if None in label_ids:
+        return None
+    return frozenset(label_ids)
+
+
+def _build_skipped_record(message: dict[str, Any], headers: dict[str, str], prefilter_rules: str) -> ProcessedEmail:
+    return ProcessedEmail(
+        gmail_message_id=message["id"],
+        gmail_thread_id=message.get("threadId"),
+        source="gmail",
+        sender=_header_value(headers, "From"),
+        recipients=_recipient_values(headers),
+        subject=_header_value(headers, "Subject"),
+        received_date=_received_datetime(message, headers),
+        headers=headers,
+        prefilter_rules=prefilter_rules,
+        status="skipped",
+        extraction_status="skipped",
+    )
+
 
 def _headers_from_payload(payload: dict[str, Any]) -> dict[str, str]:
     headers: dict[str, str] = {}
@@ -169,6 +577,18 @@ def _headers_from_payload(payload: dict[str, Any]) -> dict[str, str]:
     return headers
 
 
+def _headers_from_message(parsed_message: EmailMessage) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    for name, value in parsed_message.items():
+        if name and value is not None:
+            headers[name] = str(value)
+    return headers
+
+
+def _rfc822_message_id(headers: dict[str, str]) -> str | None:
+    return (_header_value(headers, "Message-ID") or "").strip() or None
+
+
 def _header_value(headers: dict[str, str], name: str) -> str | None:
     for header_name, value in headers.items():
         if header_name.lower() == name.lower():
@@ -186,7 +606,7 @@ def _recipient_values(headers: dict[str, str]) -> list[str]:
     return addresses
 
 
-def _received_datetime(full_message: dict[str, Any], headers: dict[str, str]) -> datetime | None:
+def _received_datetime(message: dict[str, Any], headers: dict[str, str]) -> datetime | None:
     date_header = _header_value(headers, "Date")
     if date_header:
         try:
@@ -197,7 +617,7 @@ def _received_datetime(full_message: dict[str, Any], headers: dict[str, str]) ->
         except (TypeError, ValueError):
             pass
 
-    internal_date = full_message.get("internalDate")
+    internal_date = message.get("internalDate")
     if internal_date:
         try:
             return datetime.fromtimestamp(int(internal_date) / 1000, tz=UTC)
@@ -206,14 +626,10 @@ def _received_datetime(full_message: dict[str, Any], headers: dict[str, str]) ->
     return None
 
 
-def _extract_bodies(raw_mime: str | None, payload: dict[str, Any]) -> tuple[str | None, str | None]:
-    if raw_mime:
-        parsed_message = message_from_string(raw_mime, policy=default)
-        text_part = parsed_message.get_body(preferencelist=("plain",))
-        html_part = parsed_message.get_body(preferencelist=("html",))
-        text_body = text_part.get_content() if text_part else None
-        html_body = html_part.get_content() if html_part else None
-        return text_body, html_body
+def _extract_bodies(parsed_message: EmailMessage | None, payload: dict[str, Any]) -> tuple[str | None, str | None]:
+    if parsed_message is not None:
+        bodies = message_bodies(parsed_message)
+        return bodies.plain_text_body, bodies.html_body
 
     return _extract_body_from_payload(payload, "text/plain"), _extract_body_from_payload(payload, "text/html")
 
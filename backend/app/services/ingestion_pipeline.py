@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.db.models import ProcessedEmail
+from app.services.extraction_service import EmailExtractionResult, ExtractionService, ParsedEmail
+from app.services.gmail_ingestion_service import GmailIngestionService
+from app.services.parsers import EmailParseContext
+
+logger = get_logger(__name__)
+PIPELINE_STAGES = ("fetch", "decode", "parse", "persist")
+_DONE = object()
+
+
+@dataclass
+class _StageStats:
+    messages: int = 0
+    busy_seconds: float = 0.0
+    max_queue_depth: int = 0
+
+    def record(self, messages: int, started: float) -> None:
+        self.messages += messages
+        self.busy_seconds += time.perf_counter() - started
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "messages": self.messages,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "messages_per_second": round(self.messages / self.busy_seconds, 1) if self.busy_seconds else 0.0,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+@dataclass(frozen=True)
+class _StageFailure:
+    error: BaseException
+
+
+class IngestionPipeline:
+    def __init__(
+        self,
+        gmail_ingestion_service: GmailIngestionService,
+        extraction_service: ExtractionService,
+        *,
+        queue_size: int | None = None,
+    ) -> None:
+        self.gmail_ingestion_service = gmail_ingestion_service
+        self.extraction_service = extraction_service
+        self.queue_size = max(1, queue_size or get_settings().ingestion_pipeline_queue_size)
+        self.stats = {stage: _StageStats() for stage in PIPELINE_STAGES}
+        self.extraction_results: list[EmailExtractionResult] = []
+        self._parsed: dict[str, ParsedEmail] = {}
+
+    def stream(self, chunks: list[list[str]]) -> Iterator[tuple[list[str], dict[str, ProcessedEmail | Exception]]]:
+        # Network fetches, MIME decoding and HTML parsing run on their own threads connected by bounded
+        # queues; only the persist stage touches the session, on the caller's thread.
+        stop = threading.Event()
+        fetched: queue.Queue[Any] = queue.Queue(maxsize=self.queue_size)
+        decoded: queue.Queue[Any] = queue.Queue(maxsize=self.queue_size)
+        parsed: queue.Queue[Any] = queue.Queue(maxsize=self.queue_size)
+        threads = [
+            threading.Thread(target=self._pump, args=(self._fetch_stage(chunks), fetched, stop), name="pipeline-fetch"),
+            threading.Thread(
+                target=self._pump,
+                args=(self._decode_stage(self._drain(fetched, "decode", stop)), decoded, stop),
+                name="pipeline-decode",
+            ),
+            threading.Thread(
+                target=self._pump,
+                args=(self._parse_stage(self._drain(decoded, "parse", stop)), parsed, stop),
+                name="pipeline-parse",
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+        logger.info("ingestion_pipeline_started", chunk_count=len(chunks), queue_size=self.queue_size)
+        try:
+            for chunk, records in self._drain(parsed, "persist", stop):
+                started = time.perf_counter()
+                yield chunk, records
+                self.stats["persist"].record(len(chunk), started)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            logger.info("ingestion_pipeline_completed", **self.summary())
+
+    def persist(self, db: Session, ingested_ids: set[str]) -> None:
+        if not ingested_ids:
+            return
+        emails = db.scalars(
+            select(ProcessedEmail)
+            .where(ProcessedEmail.gmail_message_id.in_(ingested_ids))
+            .order_by(ProcessedEmail.received_date.asc().nullsfirst(), ProcessedEmail.id.asc())
+        ).all()
+        for email in emails:
+            self.extraction_results.append(
+                self.extraction_service.extract_email(
+                    db,
+                    email,
+                    reset_existing=False,
+                    parsed=self._parsed.pop(email.gmail_message_id, None),
+                )
+            )
+
+    def discard(self) -> None:
+        # The Gmail stage rolled back, taking the inline extraction writes with it.
+        self.extraction_results.clear()
+        self._parsed.clear()
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return {stage: stats.summary() for stage, stats in self.stats.items()}
+
+    def _fetch_stage(self, chunks: list[list[str]]) -> Iterator[Any]:
+        gmail = self.gmail_ingestion_service
+        fetched_chunks = gmail.map_chunks(gmail.fetch_messages, chunks)
+        while True:
+            started = time.perf_counter()
+            item = next(fetched_chunks, None)
+            if item is None:
+                return
+            self.stats["fetch"].record(len(item[0]), started)
+            yield item[1]
+
+    def _decode_stage(self, fetched_chunks: Iterator[Any]) -> Iterator[Any]:
+        for fetched in fetched_chunks:
+            started = time.perf_counter()
+            records = self.gmail_ingestion_service.decode_messages(fetched)
+            self.stats["decode"].record(len(fetched.message_ids), started)
+            yield fetched.message_ids, records
+
+    def _parse_stage(self, decoded_chunks: Iterator[Any]) -> Iterator[Any]:
+        for chunk, records in decoded_chunks:
+            started = time.perf_counter()
+            for record in records.values():
+                if isinstance(record, ProcessedEmail) and record.status == "ingested":
+                    self._parsed[record.gmail_message_id] = self.extraction_service.parse_context(
+                        EmailParseContext(
+                            sender=record.sender,
+                            subject=record.subject,
+                            html_body=record.raw_html_body,
+                            plain_text_body=record.plain_text_body,
+                        )
+                    )
+            self.stats["parse"].record(len(chunk), started)
+            yield chunk, records
+
+    def _pump(self, items: Iterator[Any], output: queue.Queue[Any], stop: threading.Event) -> None:
+        try:
+            for item in items:
+                if not self._put(output, item, stop):
+                    return
+        except BaseException as exc:  # noqa: BLE001
+            self._put(output, _StageFailure(exc), stop)
+            return
+        self._put(output, _DONE, stop)
+
+    def _drain(self, source: queue.Queue[Any], stage: str, stop: threading.Event) -> Iterator[Any]:
+        stats = self.stats[stage]
+        while not stop.is_set():
+            stats.max_queue_depth = max(stats.max_queue_depth, source.qsize())
+            try:
+                item = source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                return
+            if isinstance(item, _StageFailure):
+                raise item.error
+            yield item
+
+    @staticmethod
+    def _put(output: queue.Queue[Any], item: Any, stop: threading.Event) -> bool:
+        while not stop.is_set():
+            try:
+                output.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
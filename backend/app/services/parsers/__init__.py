@@ -1,4 +1,5 @@
 from app.services.parsers.base import EmailJobParser, EmailParseContext, ParsedOpportunity
+from app.services.parsers.cache import ParseCache, get_parse_cache
 from app.services.parsers.generic import GenericEmailParser
 from app.services.parsers.linkedin import LinkedInEmailParser
 from app.services.parsers.registry import ParserRegistry
@@ -8,6 +9,8 @@ __all__ = [
     "EmailParseContext",
     "GenericEmailParser",
     "LinkedInEmailParser",
+    "ParseCache",
     "ParsedOpportunity",
     "ParserRegistry",
+    "get_parse_cache",
 ]
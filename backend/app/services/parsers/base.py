@@ -27,6 +27,10 @@ class ParsedOpportunity:
 
 class EmailJobParser(Protocol):
     source: str
+    version: int
+    sender_domains: tuple[str, ...]
+    subject_keywords: tuple[str, ...]
+    subject_patterns: tuple[str, ...]
 
     def can_parse(self, context: EmailParseContext) -> bool:
         """Return true when this parser should handle the email."""
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from datetime import date
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.db.bulk import insert_on_conflict_do_nothing
+from app.db.models import ParseCacheEntry
+from app.services.parsers.base import EmailJobParser, EmailParseContext, ParsedOpportunity
+
+logger = get_logger(__name__)
+
+ParseCacheKey = tuple[str, int, str]
+
+
+class ParseCache:
+    def __init__(self, max_entries: int = 1024, *, persistent: bool = False) -> None:
+        self.max_entries = max(0, max_entries)
+        self.persistent = persistent
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[ParseCacheKey, tuple[ParsedOpportunity, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        parser: EmailJobParser,
+        context: EmailParseContext,
+        db: Session | None = None,
+    ) -> list[ParsedOpportunity] | None:
+        key = parse_cache_key(parser, context)
+        with self._lock:
+            opportunities = self._entries.get(key)
+            if opportunities is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(opportunities)
+
+        if self.persistent and db is not None:
+            entry = db.get(ParseCacheEntry, key)
+            if entry is not None:
+                cached = [_opportunity_from_json(item) for item in entry.opportunities]
+                self._remember(key, cached)
+                with self._lock:
+                    self.hits += 1
+                return cached
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(
+        self,
+        parser: EmailJobParser,
+        context: EmailParseContext,
+        opportunities: list[ParsedOpportunity],
+        db: Session | None = None,
+    ) -> None:
+        key = parse_cache_key(parser, context)
+        self._remember(key, opportunities)
+        if not self.persistent or db is None:
+            return
+        try:
+            with db.begin_nested():
+                insert_on_conflict_do_nothing(
+                    db,
+                    ParseCacheEntry,
+                    [
+                        {
+                            "parser_source": key[0],
+                            "parser_version": key[1],
+                            "content_hash": key[2],
+                            "opportunities": [_opportunity_to_json(opportunity) for opportunity in opportunities],
+                        }
+                    ],
+                )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("parse_cache_store_failed", parser=parser.source, error=str(exc))
+
+    def _remember(self, key: ParseCacheKey, opportunities: list[ParsedOpportunity]) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = tuple(opportunities)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def get_parse_cache() -> ParseCache:
+    settings = get_settings()
+    return ParseCache(settings.parse_cache_max_entries, persistent=settings.parse_cache_persistent)
+
+
+def parse_cache_key(parser: EmailJobParser, context: EmailParseContext) -> ParseCacheKey:
+    # Parsers fall back to the plain-text body when the HTML yields nothing, so both bodies are hashed.
+    digest = hashlib.sha256()
+    digest.update((context.html_body or "").encode("utf-8"))
+    digest.update(b"\0")
+    digest.update((context.plain_text_body or "").encode("utf-8"))
+    return parser.source, parser.version, digest.hexdigest()
+
+
+def _opportunity_to_json(opportunity: ParsedOpportunity) -> dict[str, Any]:
+    data = asdict(opportunity)
+    data["posted_date"] = opportunity.posted_date.isoformat() if opportunity.posted_date else None
+    return data
+
+
+def _opportunity_from_json(data: dict[str, Any]) -> ParsedOpportunity:
+    posted_date = data.get("posted_date")
+    return ParsedOpportunity(**{**data, "posted_date": date.fromisoformat(posted_date) if posted_date else None})
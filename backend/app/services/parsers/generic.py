@@ -1,23 +1,82 @@
 from __future__ import annotations
 
 import re
+import threading
+from urllib.parse import parse_qsl, urlsplit
 
 from app.services.parsers.base import EmailParseContext, ParsedOpportunity
 from app.services.parsers.utils import (
+    BlockIndex,
+    analyze_job_url,
     clean_line,
     closest_repeating_block,
     html_to_soup,
     is_boilerplate_text,
     is_ignored_link,
+    line_urls,
     lines_without_boilerplate,
-    normalize_job_url,
     visible_text,
 )
 from app.utils.text import normalize_whitespace
 
+ANCHOR_FILTER_STAGES = ("anchors", "rejected_url", "rejected_text", "duplicate", "rejected_block", "accepted")
+CAMPAIGN_QUERY_NAMES = {"src", "cta"}
+NON_JOB_HOSTS = (
+    "facebook.com",
+    "twitter.com",
+    "x.com",
+    "instagram.com",
+    "youtube.com",
+    "tiktok.com",
+    "apps.apple.com",
+    "play.google.com",
+)
+
+TITLE_KEYWORD_PATTERN = re.compile(
+    r"\b(engineer|manager|specialist|analyst|operator|technician|supervisor|coordinator|consultant|advisor|director|lead)\b",
+    re.IGNORECASE,
+)
+COMPANY_PREFIX_PATTERN = re.compile(r"^(?:at|company:)\s+(.+)$", re.IGNORECASE)
+ACTION_PATTERN = re.compile(r"\b(apply|view job|view role|see details|learn more|save job|posted)\b", re.IGNORECASE)
+LOCATION_PATTERN = re.compile(
+    r"\b(remote|hybrid|onsite|on-site|houston|london|dubai|doha|singapore|aberdeen|riyadh)\b",
+    re.IGNORECASE,
+)
+
 
 class GenericEmailParser:
     source = "generic"
+    version = 2
+    sender_domains: tuple[str, ...] = ()
+    subject_keywords = (
+        "job",
+        "jobs",
+        "job opening",
+        "job openings",
+        "open position",
+        "open positions",
+        "new role",
+        "new roles",
+        "open role",
+        "open roles",
+        "vacancy",
+        "vacancies",
+        "now hiring",
+        "career opportunity",
+        "career opportunities",
+    )
+    subject_patterns: tuple[str, ...] = ()
+
+    def __init__(self) -> None:
+        self._filter_counts = dict.fromkeys(ANCHOR_FILTER_STAGES, 0)
+        self._filter_lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, object]:
+        # Parse-pool workers start from zero and hand their counts back with each result.
+        return {}
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__init__()
 
     def can_parse(self, context: EmailParseContext) -> bool:
         return bool(context.html_body or context.plain_text_body)
@@ -29,22 +88,54 @@ class GenericEmailParser:
                 return opportunities
         return self._parse_text(context.plain_text_body)
 
+    def anchor_filter_stats(self) -> dict[str, float]:
+        with self._filter_lock:
+            counts: dict[str, float] = dict(self._filter_counts)
+        counts["selectivity"] = round(counts["accepted"] / counts["anchors"], 4) if counts["anchors"] else 0.0
+        return counts
+
+    def add_anchor_filter_counts(self, counts: dict[str, int]) -> None:
+        with self._filter_lock:
+            for stage, count in counts.items():
+                self._filter_counts[stage] += count
+
+    def drain_anchor_filter_counts(self) -> dict[str, int]:
+        with self._filter_lock:
+            counts = self._filter_counts
+            self._filter_counts = dict.fromkeys(ANCHOR_FILTER_STAGES, 0)
+        return counts
+
     def _parse_html(self, html: str) -> list[ParsedOpportunity]:
         soup = html_to_soup(html)
+        block_index: BlockIndex | None = None
         opportunities: list[ParsedOpportunity] = []
-        seen_urls: set[str] = set()
+        seen_links: set[tuple[str | None, str, tuple[tuple[str, str], ...]]] = set()
+        counts = dict.fromkeys(ANCHOR_FILTER_STAGES, 0)
 
+        # Cheapest checks first: URL and host rules, then the anchor text, then duplicates, so that only
+        # the surviving anchors pay for block detection and rendering.
         for anchor in soup.find_all("a", href=True):
+            counts["anchors"] += 1
+            job_url = analyze_job_url(anchor.get("href"))
+            url = job_url.url
+            if url is None or _is_non_job_host(job_url.host) or is_ignored_link(url):
+                counts["rejected_url"] += 1
+                continue
             raw_text = anchor.get_text(" ", strip=True)
-            url = normalize_job_url(anchor.get("href"))
-            if not _looks_like_job_link(url, raw_text) or is_ignored_link(url, raw_text):
+            if not _looks_like_job_link(url, raw_text) or is_boilerplate_text(raw_text):
+                counts["rejected_text"] += 1
                 continue
-            if url in seen_urls:
+            link_key = _link_key(url)
+            if link_key in seen_links:
+                counts["duplicate"] += 1
                 continue
 
-            block = closest_repeating_block(anchor)
+            if block_index is None:
+                block_index = BlockIndex(soup)
+            block = closest_repeating_block(anchor, block_index)
             block_text = visible_text(block)
             if not block_text or is_boilerplate_text(block_text):
+                counts["rejected_block"] += 1
                 continue
 
             title, company, location = _infer_fields(raw_text, block_text)
@@ -57,11 +148,13 @@ class GenericEmailParser:
                     job_url=url,
                     posted_date=None,
                     raw_text=block_text,
-                    external_id=_external_id_from_url(url),
+                    external_id=job_url.job_id,
                 )
             )
-            seen_urls.add(url)
+            seen_links.add(link_key)
+            counts["accepted"] += 1
 
+        self.add_anchor_filter_counts(counts)
         return opportunities
 
     def _parse_text(self, text: str | None) -> list[ParsedOpportunity]:
@@ -70,26 +163,27 @@ class GenericEmailParser:
         opportunities: list[ParsedOpportunity] = []
         seen_urls: set[str] = set()
         lines = lines_without_boilerplate(text)
-        for index, line in enumerate(lines):
-            for raw_url in re.findall(r"https?://\S+", line):
-                url = normalize_job_url(raw_url.rstrip(").,]"))
-                if not _looks_like_job_link(url, line) or url in seen_urls:
-                    continue
-                context_lines = lines[max(0, index - 4) : min(len(lines), index + 5)]
-                title, company, location = _infer_fields(line, "\n".join(context_lines))
-                opportunities.append(
-                    ParsedOpportunity(
-                        source=self.source,
-                        job_title=title,
-                        company=company,
-                        location=location,
-                        job_url=url,
-                        posted_date=None,
-                        raw_text="\n".join(context_lines),
-                        external_id=_external_id_from_url(url),
-                    )
+        for index, raw_url in line_urls(lines):
+            line = lines[index]
+            job_url = analyze_job_url(raw_url.rstrip(").,]"))
+            url = job_url.url
+            if not _looks_like_job_link(url, line) or url in seen_urls:
+                continue
+            context_lines = lines[max(0, index - 4) : min(len(lines), index + 5)]
+            title, company, location = _infer_fields(line, "\n".join(context_lines))
+            opportunities.append(
+                ParsedOpportunity(
+                    source=self.source,
+                    job_title=title,
+                    company=company,
+                    location=location,
+                    job_url=url,
+                    posted_date=None,
+                    raw_text="\n".join(context_lines),
+                    external_id=job_url.job_id,
                 )
-                seen_urls.add(url)
+            )
+            seen_urls.add(url)
         return opportunities
 
 
@@ -127,6 +221,25 @@ def _infer_fields(anchor_text: str | None, block_text: str) -> tuple[str | None,
     return title, company, location
 
 
+def _is_non_job_host(host: str | None) -> bool:
+    return bool(host) and any(host == domain or host.endswith(f".{domain}") for domain in NON_JOB_HOSTS)
+
+
+def _link_key(url: str) -> tuple[str | None, str, tuple[tuple[str, str], ...]]:
+    # Per-host dedupe: normalize_job_url already drops utm_*/trk, and links to the same page that differ
+    # only in email campaign labels (src=footer, cta=button) are one posting. Every other query value is
+    # kept, since it may be what tells two postings apart.
+    parsed = urlsplit(url)
+    query = tuple(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+            if key.lower() not in CAMPAIGN_QUERY_NAMES
+        )
+    )
+    return parsed.hostname, parsed.path.rstrip("/"), query
+
+
 def _title_from_anchor(anchor_text: str | None) -> str | None:
     value = clean_line(anchor_text)
     if not value or _looks_like_action(value):
@@ -138,20 +251,20 @@ def _title_from_lines(lines: list[str]) -> str | None:
     for line in lines:
         if _looks_like_action(line):
             continue
-        if re.search(r"\b(engineer|manager|specialist|analyst|operator|technician|supervisor|coordinator|consultant|advisor|director|lead)\b", line, re.I):
+        if TITLE_KEYWORD_PATTERN.search(line):
             return normalize_whitespace(line)
     return None
 
 
 def _company_from_line(line: str) -> str | None:
-    match = re.search(r"^(?:at|company:)\s+(.+)$", line, flags=re.I)
+    match = COMPANY_PREFIX_PATTERN.search(line)
     if match:
         return normalize_whitespace(match.group(1))
     return normalize_whitespace(line)
 
 
 def _looks_like_action(line: str | None) -> bool:
-    return bool(line and re.search(r"\b(apply|view job|view role|see details|learn more|save job|posted)\b", line, re.I))
+    return bool(line and ACTION_PATTERN.search(line))
 
 
 def _looks_like_location(line: str | None) -> bool:
@@ -159,15 +272,7 @@ def _looks_like_location(line: str | None) -> bool:
         line
         and (
             "," in line
-            or re.search(r"\b(remote|hybrid|onsite|on-site|houston|london|dubai|doha|singapore|aberdeen|riyadh)\b", line, re.I)
+            or LOCATION_PATTERN.search(line)
         )
     )
 
-
-def _external_id_from_url(url: str | None) -> str | None:
-    if not url:
-        return None
-    match = re.search(r"(?:job|jobs|position|requisition|req)[-/=](\d{4,})", url, re.I)
-    if match:
-        return match.group(1)
-    return None
@@ -1,25 +1,58 @@
 from __future__ import annotations
 
 import re
-from urllib.parse import parse_qs, urlparse
+from dataclasses import dataclass
 
 from bs4 import Tag
 
 from app.services.parsers.base import EmailParseContext, ParsedOpportunity
+from app.services.parsers.templates import CardLayout, TemplateCache, card_layout
 from app.services.parsers.utils import (
+    BlockIndex,
+    analyze_job_url,
     clean_line,
     closest_repeating_block,
     html_to_soup,
+    is_boilerplate_text,
     is_ignored_link,
+    line_urls,
     lines_without_boilerplate,
-    normalize_job_url,
-    visible_text,
 )
 from app.utils.text import normalize_whitespace
 
+Fields = tuple[str | None, str | None, str | None]
+
+TITLE_KEYWORD_PATTERN = re.compile(
+    r"\b(engineer|manager|specialist|analyst|operator|technician|supervisor|developer|consultant|advisor|director)\b",
+    re.IGNORECASE,
+)
+METADATA_LINE_PATTERN = re.compile(r"actively recruiting|easy apply|\d+\s+connections?|\d+\s+(?:company|school) (?:alumni?|alums?)")
+METADATA_WORD_PATTERN = re.compile(r"\b(view job|apply|see more|save|job alert|unsubscribe)\b")
+TITLE_SUFFIX_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"\s+(?:posted\s+)?(?:today|yesterday|\d+\s+(?:hour|hours|day|days|week|weeks|month|months)\s+ago)$",
+        r"\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\.?\s+\d{1,2}(?:,\s+\d{4})?$",
+        r"(?<=[A-Za-z0-9])(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\.?\s+\d{1,2}(?:,\s+\d{4})?$",
+    )
+)
+
+
+@dataclass(frozen=True)
+class _CardTemplate:
+    title_nodes: frozenset[int]
+    company_location_node: int
+
 
 class LinkedInEmailParser:
     source = "linkedin"
+    version = 2
+    sender_domains = ("linkedin.com",)
+    subject_keywords = ("job alert", "jobs you may be interested in", "new jobs", "is hiring")
+    subject_patterns = (r"\blinkedin job alert\b", r"\bjobs? on linkedin\b")
+
+    def __init__(self, template_cache: TemplateCache | None = None) -> None:
+        self.templates = template_cache if template_cache is not None else TemplateCache()
 
     def can_parse(self, context: EmailParseContext) -> bool:
         content = " ".join(
@@ -42,21 +75,22 @@ class LinkedInEmailParser:
 
     def _parse_html(self, html: str) -> list[ParsedOpportunity]:
         soup = html_to_soup(html)
+        block_index = BlockIndex(soup)
         opportunities: list[ParsedOpportunity] = []
         seen_urls: set[str] = set()
 
         for anchor in soup.find_all("a", href=True):
-            href = normalize_job_url(anchor.get("href"))
+            job_url = analyze_job_url(anchor.get("href"))
+            href = job_url.url
             anchor_text = clean_line(anchor.get_text(" ", strip=True))
-            if not _is_linkedin_job_url(href) or is_ignored_link(href, anchor_text):
+            if not job_url.is_linkedin_job or is_ignored_link(href, anchor_text):
                 continue
             if href in seen_urls:
                 continue
 
-            block = closest_repeating_block(anchor)
-            block_text = visible_text(block)
-            lines = lines_without_boilerplate(block_text)
-            title, company, location = _infer_fields(anchor, lines)
+            layout = card_layout(closest_repeating_block(anchor, block_index))
+            block_text = layout.text
+            title, company, location = self._card_fields(anchor, layout, block_text)
             opportunities.append(
                 ParsedOpportunity(
                     source=self.source,
@@ -66,66 +100,105 @@ class LinkedInEmailParser:
                     job_url=href,
                     posted_date=None,
                     raw_text=block_text or anchor_text or href,
-                    external_id=_external_id_from_linkedin_url(href),
+                    external_id=job_url.linkedin_job_id,
                 )
             )
             seen_urls.add(href)
 
         return opportunities
 
+    def _card_fields(self, anchor: Tag, layout: CardLayout, block_text: str) -> Fields:
+        template = self.templates.get(layout.signature)
+        if template is not None:
+            fields = _apply_template(template, layout)
+            if fields is not None:
+                return fields
+
+        fields = _infer_fields(anchor, lines_without_boilerplate(block_text))
+        template = _learn_template(layout, fields)
+        if template is not None:
+            self.templates.put(layout.signature, template)
+        return fields
+
     def _parse_text(self, text: str | None) -> list[ParsedOpportunity]:
         if not text:
             return []
         opportunities: list[ParsedOpportunity] = []
         seen_urls: set[str] = set()
         lines = lines_without_boilerplate(text)
-        for index, line in enumerate(lines):
-            urls = re.findall(r"https?://\S+", line)
-            for raw_url in urls:
-                url = normalize_job_url(raw_url.rstrip(").,]"))
-                if not _is_linkedin_job_url(url) or url in seen_urls:
-                    continue
-                context_lines = lines[max(0, index - 3) : min(len(lines), index + 4)]
-                title = _best_title_from_lines(context_lines)
-                opportunities.append(
-                    ParsedOpportunity(
-                        source=self.source,
-                        job_title=title,
-                        company=None,
-                        location=None,
-                        job_url=url,
-                        posted_date=None,
-                        raw_text="\n".join(context_lines),
-                        external_id=_external_id_from_linkedin_url(url),
-                    )
+        for index, raw_url in line_urls(lines):
+            job_url = analyze_job_url(raw_url.rstrip(").,]"))
+            url = job_url.url
+            if not job_url.is_linkedin_job or url in seen_urls:
+                continue
+            context_lines = lines[max(0, index - 3) : min(len(lines), index + 4)]
+            title = _best_title_from_lines(context_lines)
+            opportunities.append(
+                ParsedOpportunity(
+                    source=self.source,
+                    job_title=title,
+                    company=None,
+                    location=None,
+                    job_url=url,
+                    posted_date=None,
+                    raw_text="\n".join(context_lines),
+                    external_id=job_url.linkedin_job_id,
                 )
-                seen_urls.add(url)
+            )
+            seen_urls.add(url)
         return opportunities
 
 
-def _is_linkedin_job_url(url: str | None) -> bool:
-    if not url:
-        return False
-    parsed = urlparse(url)
-    return "linkedin.com" in parsed.netloc and (
-        "/jobs/view" in parsed.path or "currentJobId" in parse_qs(parsed.query)
-    )
+def _learn_template(layout: CardLayout, fields: Fields) -> _CardTemplate | None:
+    if fields[1] is None:
+        return None
+    title_nodes: set[int] = set()
+    for index, text in enumerate(layout.texts):
+        if len(text.splitlines()) != 1:
+            return None
+        line = _card_line(text)
+        if line is not None and " · " in line:
+            template = _CardTemplate(frozenset(title_nodes), index)
+            return template if _apply_template(template, layout) == fields else None
+        if line is not None:
+            title_nodes.add(index)
+    return None
 
 
-def _external_id_from_linkedin_url(url: str | None) -> str | None:
-    if not url:
+def _apply_template(template: _CardTemplate, layout: CardLayout) -> Fields | None:
+    # A cached template only says where the fields sit in cards of this shape; the content is still
+    # checked so that any card the heuristics would read differently falls back to them.
+    if template.company_location_node >= len(layout.texts):
         return None
-    parsed = urlparse(url)
-    query_id = parse_qs(parsed.query).get("currentJobId")
-    if query_id and query_id[0].isdigit():
-        return query_id[0]
-    match = re.search(r"/jobs/view/(\d+)", parsed.path)
-    if match:
-        return match.group(1)
-    return None
+    texts = layout.texts[: template.company_location_node + 1]
+    if any(len(text.splitlines()) != 1 for text in texts):
+        return None
+    title_lines: list[str] = []
+    for index in range(template.company_location_node):
+        line = _card_line(texts[index])
+        if (line is not None) != (index in template.title_nodes) or (line is not None and " · " in line):
+            return None
+        if line is not None:
+            title_lines.append(line)
+    line = _card_line(texts[-1])
+    if line is None or " · " not in line:
+        return None
+    company, location = [normalize_whitespace(part) for part in line.split(" · ", 1)]
+    return _clean_title(" ".join(title_lines)), company, location
+
+
+def _card_line(text: str) -> str | None:
+    # The meaningful line a single-line text node contributes to the heuristics, if any.
+    line = clean_line(text)
+    if not line or is_boilerplate_text(line):
+        return None
+    line = clean_line(line)
+    if not line or _is_metadata_line(line):
+        return None
+    return line
 
 
-def _infer_fields(anchor: Tag, lines: list[str]) -> tuple[str | None, str | None, str | None]:
+def _infer_fields(anchor: Tag, lines: list[str]) -> Fields:
     title, company, location = infer_linkedin_fields_from_text("\n".join(lines))
     if title or company or location:
         return title, company, location
@@ -135,7 +208,7 @@ def _infer_fields(anchor: Tag, lines: list[str]) -> tuple[str | None, str | None
     return title, None, None
 
 
-def infer_linkedin_fields_from_text(raw_text: str | None) -> tuple[str | None, str | None, str | None]:
+def infer_linkedin_fields_from_text(raw_text: str | None) -> Fields:
     lines = lines_without_boilerplate(raw_text)
     meaningful_lines = _meaningful_linkedin_lines(lines)
     company_location_index = next(
@@ -158,7 +231,7 @@ def _best_title_from_lines(lines: list[str]) -> str | None:
     for line in lines:
         if _is_metadata_line(line):
             continue
-        if re.search(r"\b(engineer|manager|specialist|analyst|operator|technician|supervisor|developer|consultant|advisor|director)\b", line, re.I):
+        if TITLE_KEYWORD_PATTERN.search(line):
             return _clean_title(line)
     for line in lines:
         if not _is_metadata_line(line):
@@ -175,17 +248,7 @@ def _is_metadata_line(line: str | None) -> bool:
         return True
     normalized = normalize_whitespace(line).lower()
     return bool(
-        normalized
-        and (
-            re.fullmatch(r"actively recruiting", normalized)
-            or re.fullmatch(r"easy apply", normalized)
-            or re.fullmatch(r"\d+\s+connections?", normalized)
-            or re.fullmatch(r"\d+\s+company alumni?", normalized)
-            or re.fullmatch(r"\d+\s+company alums?", normalized)
-            or re.fullmatch(r"\d+\s+school alumni?", normalized)
-            or re.fullmatch(r"\d+\s+school alums?", normalized)
-            or re.search(r"\b(view job|apply|see more|save|job alert|unsubscribe)\b", normalized)
-        )
+        normalized and (METADATA_LINE_PATTERN.fullmatch(normalized) or METADATA_WORD_PATTERN.search(normalized))
     )
 
 
@@ -193,22 +256,6 @@ def _clean_title(value: str | None) -> str | None:
     value = normalize_whitespace(value)
     if not value:
         return None
-    value = re.sub(
-        r"\s+(?:posted\s+)?(?:today|yesterday|\d+\s+(?:hour|hours|day|days|week|weeks|month|months)\s+ago)$",
-        "",
-        value,
-        flags=re.IGNORECASE,
-    )
-    value = re.sub(
-        r"\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\.?\s+\d{1,2}(?:,\s+\d{4})?$",
-        "",
-        value,
-        flags=re.IGNORECASE,
-    )
-    value = re.sub(
-        r"(?<=[A-Za-z0-9])(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\.?\s+\d{1,2}(?:,\s+\d{4})?$",
-        "",
-        value,
-        flags=re.IGNORECASE,
-    )
+    for pattern in TITLE_SUFFIX_PATTERNS:
+        value = pattern.sub("", value)
     return normalize_whitespace(value)
@@ -1,22 +1,120 @@
 from __future__ import annotations
 
+import hashlib
+import re
+import threading
+from email.utils import parseaddr
+
 from app.services.parsers.base import EmailJobParser, EmailParseContext
 from app.services.parsers.generic import GenericEmailParser
 from app.services.parsers.linkedin import LinkedInEmailParser
 
 
+ROUTES = ("domain", "subject", "fallback", "unmatched")
+
+
 class ParserRegistry:
     def __init__(self, parsers: list[EmailJobParser] | None = None) -> None:
         self._parsers = parsers or [
             LinkedInEmailParser(),
             GenericEmailParser(),
         ]
+        self._route_counts = dict.fromkeys(ROUTES, 0)
+        self._route_lock = threading.Lock()
+        self._build_routes()
+
+    @property
+    def parsers(self) -> tuple[EmailJobParser, ...]:
+        return tuple(self._parsers)
 
     def select_parser(self, context: EmailParseContext) -> EmailJobParser | None:
-        for parser in self._parsers:
-            if parser.can_parse(context):
-                return parser
-        return None
+        # Known senders and subjects are routed by dictionary lookup; only unknown ones pay for each
+        # parser's full-body can_parse sniffing.
+        parser = self._parser_for_domain(sender_domain(context.sender))
+        route = "domain"
+        if parser is None and self._subject_route is not None:
+            match = self._subject_route.search(context.subject or "")
+            if match is not None:
+                parser = self._subject_parsers[match.lastgroup]
+                route = "subject"
+        if parser is None:
+            parser = next((candidate for candidate in self._parsers if candidate.can_parse(context)), None)
+            route = "fallback" if parser is not None else "unmatched"
+        with self._route_lock:
+            self._route_counts[route] += 1
+        return parser
+
+    def routing_stats(self) -> dict[str, int]:
+        with self._route_lock:
+            counts = dict(self._route_counts)
+        counts["hits"] = counts["domain"] + counts["subject"]
+        counts["misses"] = counts["fallback"] + counts["unmatched"]
+        return counts
+
+    def anchor_filter_stats(self) -> dict[str, dict[str, float]]:
+        return {
+            parser.source: parser.anchor_filter_stats()
+            for parser in self._parsers
+            if hasattr(parser, "anchor_filter_stats")
+        }
+
+    def is_job_alert_candidate(self, sender: str | None, subject: str | None) -> bool:
+        if self._parser_for_domain(sender_domain(sender)) is not None:
+            return True
+        subject = subject or ""
+        if self._subject_route is not None and self._subject_route.search(subject):
+            return True
+        return self._candidate_subject is not None and self._candidate_subject.search(subject) is not None
+
+    def __getstate__(self) -> dict[str, object]:
+        # Parse-pool workers get a copy of the registry; their routing counters start from zero.
+        return {"_parsers": self._parsers}
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__init__(state["_parsers"])
 
     def register(self, parser: EmailJobParser) -> None:
         self._parsers.insert(0, parser)
+        self._build_routes()
+
+    def _build_routes(self) -> None:
+        self._domain_parsers: dict[str, EmailJobParser] = {}
+        self._subject_parsers: dict[str, EmailJobParser] = {}
+        subject_patterns: list[str] = []
+        for index, parser in enumerate(self._parsers):
+            for domain in parser.sender_domains:
+                self._domain_parsers.setdefault(domain.lower(), parser)
+            for pattern in parser.subject_patterns:
+                group = f"parser{index}_{len(subject_patterns)}"
+                self._subject_parsers[group] = parser
+                subject_patterns.append(f"(?P<{group}>{pattern})")
+        self._subject_route = re.compile("|".join(subject_patterns), re.IGNORECASE) if subject_patterns else None
+        keywords = sorted(
+            {keyword for parser in self._parsers for keyword in parser.subject_keywords}, key=len, reverse=True
+        )
+        self._candidate_subject = (
+            re.compile(rf"\b(?:{'|'.join(re.escape(keyword) for keyword in keywords)})\b", re.IGNORECASE)
+            if keywords
+            else None
+        )
+        rules = [
+            *sorted(self._domain_parsers),
+            self._subject_route.pattern if self._subject_route else "",
+            self._candidate_subject.pattern if self._candidate_subject else "",
+        ]
+        self.rules_fingerprint = hashlib.sha256("\n".join(rules).encode()).hexdigest()
+
+    def _parser_for_domain(self, domain: str | None) -> EmailJobParser | None:
+        while domain:
+            parser = self._domain_parsers.get(domain)
+            if parser is not None:
+                return parser
+            domain = domain.partition(".")[2]
+        return None
+
+
+def sender_domain(sender: str | None) -> str | None:
+    _, address = parseaddr(sender or "")
+    if "@" not in address:
+        return None
+    return address.rsplit("@", 1)[1].strip().lower() or None
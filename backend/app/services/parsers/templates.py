@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from bs4 import NavigableString, Tag
+
+from app.utils.text import normalize_whitespace
+
+TemplateSignature = tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class CardLayout:
+    signature: TemplateSignature
+    texts: tuple[str, ...]
+
+    @property
+    def text(self) -> str:
+        # Same lines as visible_text(block), without rendering the card a second time.
+        return "\n".join(
+            line for text in self.texts for line in (normalize_whitespace(part) for part in text.splitlines()) if line
+        )
+
+
+def card_layout(block: Tag) -> CardLayout:
+    signature: list[str] = []
+    texts: list[str] = []
+    _walk_card(block, block.interesting_string_types, signature, texts)
+    return CardLayout(tuple(signature), tuple(texts))
+
+
+def _walk_card(node: Tag, string_types: Any, signature: list[str], texts: list[str]) -> None:
+    for child in node.children:
+        if isinstance(child, Tag):
+            signature.append(child.name)
+            _walk_card(child, string_types, signature, texts)
+            signature.append("/")
+        elif isinstance(child, NavigableString) and type(child) in string_types:
+            text = child.strip()
+            if text:
+                signature.append("#")
+                texts.append(text)
+
+
+class TemplateCache:
+    def __init__(self, max_entries: int = 64) -> None:
+        self.max_entries = max(0, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.learned = 0
+        self._templates: OrderedDict[TemplateSignature, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __reduce__(self) -> tuple[type[TemplateCache], tuple[int]]:
+        # Parsers are shipped to parse-pool workers; each process learns its own templates.
+        return TemplateCache, (self.max_entries,)
+
+    def get(self, signature: TemplateSignature) -> Any | None:
+        with self._lock:
+            template = self._templates.get(signature)
+            if template is None:
+                self.misses += 1
+                return None
+            self._templates.move_to_end(signature)
+            self.hits += 1
+            return template
+
+    def put(self, signature: TemplateSignature, template: Any) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            if signature not in self._templates:
+                self.learned += 1
+            self._templates[signature] = template
+            self._templates.move_to_end(signature)
+            while len(self._templates) > self.max_entries:
+                self._templates.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "learned": self.learned, "templates": len(self._templates)}
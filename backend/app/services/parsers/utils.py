@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 import re
+from bisect import bisect_right
+from collections.abc import Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
 from bs4 import BeautifulSoup, Tag
 
+from app.core.config import get_settings
 from app.utils.text import normalize_whitespace
 
 BOILERPLATE_PATTERNS = (
@@ -16,6 +22,15 @@ BOILERPLATE_PATTERNS = (
     "terms of service",
 )
 
+HTML_PARSER_ENGINES = ("html.parser", "lxml")
+
+BOILERPLATE_PATTERN = re.compile("|".join(re.escape(pattern) for pattern in BOILERPLATE_PATTERNS))
+URL_PATTERN = re.compile(r"https?://\S+")
+JOB_ID_PATTERN = re.compile(r"(?:job|jobs|position|requisition|req)[-/=](\d{4,})", re.IGNORECASE)
+LINKEDIN_JOB_VIEW_PATTERN = re.compile(r"/jobs/view/(\d+)")
+JOB_URL_CACHE_SIZE = 4096
+LEADING_BADGE_PATTERN = re.compile(r"^(new|promoted|actively recruiting)\s+", re.IGNORECASE)
+
 TRACKING_QUERY_PREFIXES = ("utm_",)
 TRACKING_QUERY_NAMES = {
     "trk",
@@ -30,7 +45,23 @@ TRACKING_QUERY_NAMES = {
 
 
 def html_to_soup(html: str | None) -> BeautifulSoup:
-    return BeautifulSoup(html or "", "html.parser")
+    return BeautifulSoup(html or "", html_parser_features())
+
+
+def html_parser_features() -> str:
+    return _tree_builder(get_settings().html_parser_engine)
+
+
+@lru_cache(maxsize=None)
+def _tree_builder(engine: str) -> str:
+    if engine not in HTML_PARSER_ENGINES:
+        raise ValueError(f"Unknown HTML_PARSER_ENGINE: {engine}.")
+    if engine == "lxml":
+        try:
+            import lxml  # noqa: F401
+        except ImportError as exc:
+            raise RuntimeError("HTML_PARSER_ENGINE=lxml requires the lxml package.") from exc
+    return engine
 
 
 def visible_text(node: Tag | BeautifulSoup | None) -> str | None:
@@ -45,16 +76,56 @@ def clean_line(value: str | None) -> str | None:
     value = normalize_whitespace(value)
     if not value:
         return None
-    value = re.sub(r"^(new|promoted|actively recruiting)\s+", "", value, flags=re.IGNORECASE)
+    value = LEADING_BADGE_PATTERN.sub("", value)
     return normalize_whitespace(value)
 
 
 def is_boilerplate_text(value: str | None) -> bool:
-    lowered = (value or "").lower()
-    return any(pattern in lowered for pattern in BOILERPLATE_PATTERNS)
+    return bool(value and BOILERPLATE_PATTERN.search(value.lower()))
+
+
+@dataclass(frozen=True)
+class JobUrl:
+    url: str | None
+    host: str | None = None
+    is_linkedin_job: bool = False
+    linkedin_job_id: str | None = None
+    job_id: str | None = None
+
+
+@lru_cache(maxsize=JOB_URL_CACHE_SIZE)
+def analyze_job_url(url: str | None) -> JobUrl:
+    # Digests repeat the same tracking links many times, so normalization and the id lookups that
+    # parsers and extraction need are done once per distinct URL.
+    normalized = _normalize_url(url)
+    if normalized is None:
+        return JobUrl(None)
+    parsed = urlparse(normalized)
+    query = parse_qs(parsed.query)
+    is_linkedin_job = "linkedin.com" in parsed.netloc and ("/jobs/view" in parsed.path or "currentJobId" in query)
+    linkedin_job_id = None
+    if is_linkedin_job:
+        query_id = query.get("currentJobId")
+        match = LINKEDIN_JOB_VIEW_PATTERN.search(parsed.path)
+        if query_id and query_id[0].isdigit():
+            linkedin_job_id = query_id[0]
+        elif match:
+            linkedin_job_id = match.group(1)
+    match = JOB_ID_PATTERN.search(normalized)
+    return JobUrl(
+        url=normalized,
+        host=parsed.hostname,
+        is_linkedin_job=is_linkedin_job,
+        linkedin_job_id=linkedin_job_id,
+        job_id=match.group(1) if match else None,
+    )
 
 
 def normalize_job_url(url: str | None) -> str | None:
+    return analyze_job_url(url).url
+
+
+def _normalize_url(url: str | None) -> str | None:
     if not url:
         return None
     parsed = urlparse(url.strip())
@@ -105,17 +176,52 @@ def is_ignored_link(url: str | None, text: str | None = None) -> bool:
     return False
 
 
-def closest_repeating_block(anchor: Tag) -> Tag:
-    for parent in anchor.parents:
-        if not isinstance(parent, Tag):
-            continue
-        text = visible_text(parent) or ""
-        links = parent.find_all("a", href=True)
-        if 20 <= len(text) <= 1200 and len(links) <= 8:
+class BlockIndex:
+    # Visible-text length and link count for every element, computed in one bottom-up pass so that
+    # block detection does not re-render the same subtrees for each anchor in a digest.
+    def __init__(self, root: Tag) -> None:
+        self._stats: dict[int, list[int]] = {id(root): [0, 0, 0]}
+        string_types = root.interesting_string_types
+        for node in reversed(list(root.descendants)):
+            parent_stats = self._stats.setdefault(id(node.parent), [0, 0, 0])
+            if isinstance(node, Tag):
+                chars, lines, links = self._stats.setdefault(id(node), [0, 0, 0])
+                parent_stats[0] += chars
+                parent_stats[1] += lines
+                parent_stats[2] += links + (node.name == "a" and node.get("href") is not None)
+            elif type(node) in string_types:
+                for line in node.strip().splitlines():
+                    line = normalize_whitespace(line)
+                    if line:
+                        parent_stats[0] += len(line)
+                        parent_stats[1] += 1
+
+    def text_length(self, node: Tag) -> int:
+        chars, lines, _ = self._stats[id(node)]
+        return chars + max(lines - 1, 0)
+
+    def link_count(self, node: Tag) -> int:
+        return self._stats[id(node)][2]
+
+
+def closest_repeating_block(anchor: Tag, index: BlockIndex | None = None) -> Tag:
+    parents = [parent for parent in anchor.parents if isinstance(parent, Tag)]
+    if index is None and parents:
+        index = BlockIndex(parents[-1])
+    for parent in parents:
+        if 20 <= index.text_length(parent) <= 1200 and index.link_count(parent) <= 8:
             return parent
     return anchor
 
 
+def line_urls(lines: list[str]) -> Iterator[tuple[int, str]]:
+    # One scan over the whole body rather than a findall per line. URLs never cross a line break
+    # because \S excludes "\n", so each match maps back to its line through the offset table.
+    line_starts = list(accumulate((len(line) + 1 for line in lines[:-1]), initial=0))
+    for match in URL_PATTERN.finditer("\n".join(lines)):
+        yield bisect_right(line_starts, match.start()) - 1, match.group()
+
+
 def lines_without_boilerplate(text: str | None) -> list[str]:
     lines = [clean_line(line) for line in (text or "").splitlines()]
     return [line for line in lines if line and not is_boilerplate_text(line)]
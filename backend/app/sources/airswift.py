@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import json
 import re
 from datetime import date, datetime
@@ -11,6 +12,7 @@ import httpx
 from bs4 import BeautifulSoup
 
 from app.core.config import get_settings
+from app.services.parsers.utils import html_to_soup
 from app.sources.base import SourceAdapter, SourceJob
 from app.utils.text import normalize_whitespace
 
@@ -96,7 +98,7 @@ class AirswiftSource(SourceAdapter):
 
 
 def parse_total_pages(html: str) -> int:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = html_to_soup(html)
     summary = normalize_whitespace(soup.select_one(".c-card-job-header__summary").get_text(" ")) if soup.select_one(".c-card-job-header__summary") else None
     if summary:
         match = PAGE_COUNT_RE.search(summary)
@@ -113,7 +115,7 @@ def parse_total_pages(html: str) -> int:
 
 
 def parse_listing_page(html: str) -> list[SourceJob]:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = html_to_soup(html)
     jobs: list[SourceJob] = []
     for article in soup.select("article.c-card-job-item"):
         link = article.select_one(".c-card-job-item__title a[href]")
@@ -146,7 +148,7 @@ def parse_listing_page(html: str) -> list[SourceJob]:
 
 
 def parse_detail_page(html: str, url: str) -> SourceJob | None:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = html_to_soup(html)
     job_posting = _job_posting_json(soup)
     stats = _detail_stats(soup)
 
@@ -211,7 +213,7 @@ def _listing_top_fields(article: Any) -> tuple[str | None, date | None]:
 def _text_without_icon(node: Any) -> str | None:
     if node is None:
         return None
-    clone = BeautifulSoup(str(node), "html.parser")
+    clone = copy.copy(node)
     for tag in clone.select("img, svg"):
         tag.decompose()
     return normalize_whitespace(clone.get_text(" "))
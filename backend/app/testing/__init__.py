@@ -0,0 +1 @@
+"""In-process fakes and fixtures shared by tests and benchmarks."""
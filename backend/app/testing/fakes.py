@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import base64
+import quopri
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+
+class FakeGmailApi:
+    def __init__(self, messages_by_id: dict[str, dict[str, Any]], *, latency_seconds: float = 0.0) -> None:
+        self.messages_by_id = messages_by_id
+        self.latency_seconds = latency_seconds
+        self.round_trips = 0
+
+    def users(self) -> FakeGmailApi:
+        return self
+
+    def messages(self) -> FakeGmailApi:
+        return self
+
+    def getProfile(self, *, userId: str) -> _FakeRequest:
+        return _FakeRequest(self, lambda: {"emailAddress": "petromatch@example.com", "historyId": "1"})
+
+    def list(self, *, userId: str, q: str, maxResults: int) -> _FakeRequest:
+        message_ids = list(self.messages_by_id)[:maxResults]
+        return _FakeRequest(
+            self,
+            lambda: {"messages": [{"id": message_id} for message_id in message_ids], "resultSizeEstimate": len(message_ids)},
+        )
+
+    def list_next(self, request: _FakeRequest, response: dict[str, Any]) -> None:
+        return None
+
+    def get(self, *, userId: str, id: str, format: str, **params: Any) -> _FakeRequest:
+        return _FakeRequest(self, lambda: self._message_response(id, format))
+
+    def new_batch_http_request(self, *, callback: Callable[..., None]) -> _FakeBatch:
+        return _FakeBatch(self, callback)
+
+    def round_trip(self) -> None:
+        self.round_trips += 1
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+
+    def _message_response(self, message_id: str, format: str) -> dict[str, Any]:
+        message = self.messages_by_id[message_id]
+        if format == "raw":
+            return {key: value for key, value in message.items() if key != "payload"}
+        if format == "metadata":
+            return {
+                **{key: value for key, value in message.items() if key not in {"raw", "payload"}},
+                "payload": {"headers": message["payload"]["headers"]},
+            }
+        return {key: value for key, value in message.items() if key != "raw"}
+
+
+class _FakeRequest:
+    def __init__(self, api: FakeGmailApi, respond: Callable[[], dict[str, Any]]) -> None:
+        self.api = api
+        self.respond = respond
+
+    def execute(self) -> dict[str, Any]:
+        self.api.round_trip()
+        return self.respond()
+
+
+class _FakeBatch:
+    def __init__(self, api: FakeGmailApi, callback: Callable[..., None]) -> None:
+        self.api = api
+        self.callback = callback
+        self.requests: list[tuple[str, _FakeRequest]] = []
+
+    def add(self, request: _FakeRequest, request_id: str) -> None:
+        self.requests.append((request_id, request))
+
+    def execute(self) -> None:
+        self.api.round_trip()
+        for request_id, request in self.requests:
+            try:
+                response = request.respond()
+            except Exception as exc:  # noqa: BLE001
+                self.callback(request_id, None, exc)
+            else:
+                self.callback(request_id, response, None)
+
+
+def linkedin_digest_html(job_ids: Iterable[int]) -> str:
+    return "".join(
+        f'<div><a href="https://www.linkedin.com/jobs/view/{job_id}/">Drilling Engineer {job_id}</a>'
+        "<span>PetroCo · Houston, TX</span></div>"
+        for job_id in job_ids
+    )
+
+
+def linkedin_table_digest_html(job_ids: Iterable[int], *, description_sentences: int = 0) -> str:
+    description = "Offshore drilling role. " * description_sentences
+    cards = "".join(
+        f'<tr><td><table><tr><td><a href="https://www.linkedin.com/jobs/view/{job_id}/"><img src="logo.png"></a></td>'
+        f'<td><table><tr><td><a href="https://www.linkedin.com/jobs/view/{job_id}/">Drilling Engineer {job_id}</a></td></tr>'
+        f"<tr><td>PetroCo · Houston, TX</td></tr><tr><td>{description}</td></tr></table></td></tr></table></td></tr>"
+        for job_id in job_ids
+    )
+    return f"<html><body><table><tr><td><table>{cards}</table></td></tr></table></body></html>"
+
+
+def linkedin_text_digest(jobs: int) -> str:
+    return "\n".join(
+        f"Promoted\nSenior Drilling Engineer {index} 2 days ago\nPetroCo · Houston, TX\n3 connections\nEasy Apply\n"
+        f"View job: https://www.linkedin.com/jobs/view/{1000 + index}/?trk=eml (https://jobs.example.com/job/{5000 + index}).\n"
+        "Offshore role with rotation, competitive package and relocation support."
+        for index in range(jobs)
+    )
+
+
+def fake_gmail_messages(count: int, *, jobs_per_message: int = 1) -> dict[str, dict[str, Any]]:
+    messages: dict[str, dict[str, Any]] = {}
+    for index in range(count):
+        message_id = f"bench-{index:05d}"
+        first_job_id = 1_000_000_000 + index * jobs_per_message
+        html = linkedin_digest_html(range(first_job_id, first_job_id + jobs_per_message))
+        raw = "\r\n".join(
+            [
+                "From: LinkedIn Jobs <jobs-listings@linkedin.com>",
+                "To: candidate@example.com",
+                "Subject: LinkedIn job alert",
+                "Date: Tue, 28 Jul 2026 10:00:00 +0000",
+                "MIME-Version: 1.0",
+                "Content-Type: text/html; charset=utf-8",
+                "Content-Transfer-Encoding: quoted-printable",
+                "",
+                quopri.encodestring(html.encode("utf-8")).decode("ascii"),
+            ]
+        )
+        messages[message_id] = {
+            "id": message_id,
+            "threadId": f"thread-{message_id}",
+            "internalDate": "1785232800000",
+            "payload": {
+                "mimeType": "text/html",
+                "headers": [
+                    {"name": "From", "value": "LinkedIn Jobs <jobs-listings@linkedin.com>"},
+                    {"name": "To", "value": "candidate@example.com"},
+                    {"name": "Subject", "value": "LinkedIn job alert"},
+                    {"name": "Date", "value": "Tue, 28 Jul 2026 10:00:00 +0000"},
+                ],
+            },
+            "raw": base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii"),
+        }
+    return messages
+
+
+LISTING_PAGE_1 = """
+<p class="c-card-job-header__summary">Found 2 jobs on 2 pages</p>
+<article class="c-card-job-item">
+  <div class="c-card-job-item__top">
+    <p class="c-card-job-item__top-cell"><img alt="Employment Type">Permanent</p>
+    <p class="c-card-job-item__top-cell"><img alt="Date Published">5 Aug 2026</p>
+  </div>
+  <p class="c-card-job-item__location"><img alt="Location">Kuala Lumpur, Malaysia</p>
+  <p class="c-card-job-item__title"><a href="/jobs/detail-1278092">Senior Subsea Structural Engineer</a></p>
+  <p class="c-card-job-item__summary">About The Job Responsibilities of Role...</p>
+</article>
+"""
+
+LISTING_PAGE_2 = """
+<p class="c-card-job-header__summary">Found 2 jobs on 2 pages</p>
+<article class="c-card-job-item">
+  <div class="c-card-job-item__top">
+    <p class="c-card-job-item__top-cell"><img alt="Employment Type">Contract</p>
+    <p class="c-card-job-item__top-cell"><img alt="Date Published">4 Aug 2026</p>
+  </div>
+  <p class="c-card-job-item__location"><img alt="Location">Doha, Qatar</p>
+  <p class="c-card-job-item__title"><a href="/jobs/detail-1278093">Project Safety Officer</a></p>
+  <p class="c-card-job-item__summary">Airswift are hiring...</p>
+</article>
+"""
+
+DETAIL_PAGE = """
+<link rel="canonical" href="https://www.airswift.com/jobs/detail-1278092">
+<h1 class="c-jobs-article-header__title">Senior Subsea Structural Engineer</h1>
+<p class="c-jobs-article-header__location">Kuala Lumpur, Malaysia</p>
+<div class="c-jobs-article-stats__content"><strong>Job reference</strong>1278092</div>
+<div class="c-jobs-article-stats__content"><strong>Location</strong>Kuala Lumpur, Malaysia</div>
+<div class="c-jobs-article-stats__content"><strong>Sector</strong>Energy - Oil &amp; Gas</div>
+<div class="c-jobs-article-stats__content"><strong>Employment type</strong>Permanent</div>
+<div class="c-jobs-article-stats__content"><strong>Date published</strong>August 4, 2026</div>
+<script type="application/ld+json">
+{
+  "@context": "https://schema.org/",
+  "@type": "JobPosting",
+  "title": "Senior Subsea Structural Engineer",
+  "description": "About The Job Responsibilities of Role.",
+  "datePosted": "2026-08-04",
+  "employmentType": "Permanent",
+  "jobLocation": {"@type": "Place", "address": {"addressLocality": "Kuala Lumpur", "addressCountry": "Malaysia"}}
+}
+</script>
+"""
+
+DETAIL_PAGE_2 = DETAIL_PAGE.replace("1278092", "1278093").replace(
+    "Senior Subsea Structural Engineer", "Project Safety Officer"
+)
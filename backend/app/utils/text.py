@@ -4,11 +4,14 @@ import re
 from datetime import date, datetime
 from email.utils import parsedate_to_datetime
 
+WHITESPACE_PATTERN = re.compile(r"\s+")
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
 
 def normalize_whitespace(value: str | None) -> str | None:
     if value is None:
         return None
-    normalized = re.sub(r"\s+", " ", value).strip()
+    normalized = WHITESPACE_PATTERN.sub(" ", value).strip()
     return normalized or None
 
 
@@ -17,7 +20,7 @@ def normalize_text(value: str | None) -> str:
 
 
 def tokenize(value: str | None) -> list[str]:
-    return re.findall(r"[a-z0-9]+", (value or "").lower())
+    return TOKEN_PATTERN.findall((value or "").lower())
 
 
 def parse_date_safe(value: str | None) -> date | None:
@@ -0,0 +1,23 @@
+from app.testing.fakes import (
+    DETAIL_PAGE,
+    DETAIL_PAGE_2,
+    LISTING_PAGE_1,
+    LISTING_PAGE_2,
+    FakeGmailApi,
+    fake_gmail_messages,
+    linkedin_digest_html,
+    linkedin_table_digest_html,
+    linkedin_text_digest,
+)
+
+__all__ = [
+    "DETAIL_PAGE",
+    "DETAIL_PAGE_2",
+    "LISTING_PAGE_1",
+    "LISTING_PAGE_2",
+    "FakeGmailApi",
+    "fake_gmail_messages",
+    "linkedin_digest_html",
+    "linkedin_table_digest_html",
+    "linkedin_text_digest",
+]
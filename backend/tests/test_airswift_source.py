@@ -15,6 +15,7 @@ from app.services.gmail_ingestion_service import GmailIngestionResult
 from app.services.source_ingestion_service import SourceIngestionService
 from app.sources.airswift import AirswiftSource, parse_detail_page, parse_listing_page
 from app.sources.base import SourceAdapter, SourceJob
+from tests.helpers import DETAIL_PAGE, DETAIL_PAGE_2, LISTING_PAGE_1, LISTING_PAGE_2
 
 
 def _session() -> Session:
@@ -381,56 +382,3 @@ def _configure_airswift_budget(monkeypatch: pytest.MonkeyPatch, *, max_new_jobs:
     monkeypatch.setenv("AIRSWIFT_MAX_NEW_JOBS_PER_RUN", str(max_new_jobs))
     monkeypatch.setenv("AIRSWIFT_TIME_BUDGET_SECONDS", "170")
     get_settings.cache_clear()
-
-
-LISTING_PAGE_1 = """
-<p class="c-card-job-header__summary">Found 2 jobs on 2 pages</p>
-<article class="c-card-job-item">
-  <div class="c-card-job-item__top">
-    <p class="c-card-job-item__top-cell"><img alt="Employment Type">Permanent</p>
-    <p class="c-card-job-item__top-cell"><img alt="Date Published">5 Aug 2026</p>
-  </div>
-  <p class="c-card-job-item__location"><img alt="Location">Kuala Lumpur, Malaysia</p>
-  <p class="c-card-job-item__title"><a href="/jobs/detail-1278092">Senior Subsea Structural Engineer</a></p>
-  <p class="c-card-job-item__summary">About The Job Responsibilities of Role...</p>
-</article>
-"""
-
-LISTING_PAGE_2 = """
-<p class="c-card-job-header__summary">Found 2 jobs on 2 pages</p>
-<article class="c-card-job-item">
-  <div class="c-card-job-item__top">
-    <p class="c-card-job-item__top-cell"><img alt="Employment Type">Contract</p>
-    <p class="c-card-job-item__top-cell"><img alt="Date Published">4 Aug 2026</p>
-  </div>
-  <p class="c-card-job-item__location"><img alt="Location">Doha, Qatar</p>
-  <p class="c-card-job-item__title"><a href="/jobs/detail-1278093">Project Safety Officer</a></p>
-  <p class="c-card-job-item__summary">Airswift are hiring...</p>
-</article>
-"""
-
-DETAIL_PAGE = """
-<link rel="canonical" href="https://www.airswift.com/jobs/detail-1278092">
-<h1 class="c-jobs-article-header__title">Senior Subsea Structural Engineer</h1>
-<p class="c-jobs-article-header__location">Kuala Lumpur, Malaysia</p>
-<div class="c-jobs-article-stats__content"><strong>Job reference</strong>1278092</div>
-<div class="c-jobs-article-stats__content"><strong>Location</strong>Kuala Lumpur, Malaysia</div>
-<div class="c-jobs-article-stats__content"><strong>Sector</strong>Energy - Oil &amp; Gas</div>
-<div class="c-jobs-article-stats__content"><strong>Employment type</strong>Permanent</div>
-<div class="c-jobs-article-stats__content"><strong>Date published</strong>August 4, 2026</div>
-<script type="application/ld+json">
-{
-  "@context": "https://schema.org/",
-  "@type": "JobPosting",
-  "title": "Senior Subsea Structural Engineer",
-  "description": "About The Job Responsibilities of Role.",
-  "datePosted": "2026-08-04",
-  "employmentType": "Permanent",
-  "jobLocation": {"@type": "Place", "address": {"addressLocality": "Kuala Lumpur", "addressCountry": "Malaysia"}}
-}
-</script>
-"""
-
-DETAIL_PAGE_2 = DETAIL_PAGE.replace("1278092", "1278093").replace(
-    "Senior Subsea Structural Engineer", "Project Safety Officer"
-)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import pytest
+
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api.routes import emails as email_routes
+from app.db.base import Base
+from app.db.models import EmailBody, Job, ProcessedEmail
+from app.services.body_storage import BodyStorage, DatabaseBodyStore, LocalBodyStore, compress
+from app.services.extraction_service import ExtractionService
+from app.services.gmail_client import GmailClient
+from app.services.gmail_ingestion_service import GmailIngestionService
+from tests.helpers import FakeGmailApi, fake_gmail_messages
+
+
+def _session() -> Session:
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+    return session_factory()
+
+
+def test_local_body_store_dedupes_and_round_trips_compressed_bodies(tmp_path: Path) -> None:
+    storage = BodyStorage(LocalBodyStore(tmp_path))
+    html = "<div>" + "<p>Drilling Engineer - PetroCo - Houston, TX</p>" * 200 + "</div>"
+    emails = [
+        ProcessedEmail(gmail_message_id=f"msg-{index}", raw_html_body=html, plain_text_body=None, raw_mime=None)
+        for index in range(3)
+    ]
+
+    storage.offload(None, emails)
+
+    stored_files = list((tmp_path / "email-bodies").rglob("*"))
+    blobs = [path for path in stored_files if path.is_file()]
+    assert len(blobs) == 1
+    assert blobs[0].stat().st_size < len(html) / 10
+    assert {email.html_body_key for email in emails} == {blobs[0].name}
+    assert all(email.raw_html_body is None for email in emails)
+    assert storage.load(None, emails[0]).html_body == html
+
+
+def test_database_body_storage_round_trips_through_ingestion_and_extraction(monkeypatch: pytest.MonkeyPatch) -> None:
+    db = _session()
+    messages = fake_gmail_messages(3)
+    client = GmailClient()
+    client.rate_limiter = None
+    client._new_service = lambda: FakeGmailApi(messages)
+    client.list_message_ids = lambda **_: list(messages)
+    storage = BodyStorage(DatabaseBodyStore())
+    monkeypatch.setattr(email_routes, "body_storage", storage)
+
+    result = GmailIngestionService(gmail_client=client, body_storage=storage).run_once(db)
+    extraction = ExtractionService(body_storage=storage).run_pending(db)
+    statements: list[str] = []
+    event.listen(
+        db.get_bind(), "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement)
+    )
+    listed = email_routes.list_processed_emails(limit=50, db=db)
+
+    emails = db.scalars(select(ProcessedEmail)).all()
+    assert result.new_emails_stored == 3
+    assert all(email.raw_html_body is None and email.html_body_key is None and email.raw_mime_key for email in emails)
+    assert db.scalar(select(func.count()).select_from(EmailBody)) == 3
+    assert extraction.jobs_created == 3
+    assert db.scalar(select(func.count()).select_from(Job)) == 3
+    assert [item.has_raw_mime for item in listed.items] == [True] * 3
+    assert all("linkedin.com/jobs/view" in item.raw_html_body for item in listed.items)
+    assert sum(statement.startswith("SELECT email_bodies.") for statement in statements) == 1
+    assert not any(re.search(r"\bprocessed_emails\.raw_mime\b(?! IS NOT NULL)", statement) for statement in statements)
+
+
+def test_local_body_store_writes_through_unique_temporary_files(tmp_path: Path) -> None:
+    store = LocalBodyStore(tmp_path)
+    blob = compress(b"<p>Drilling Engineer</p>", "zlib")
+    first, second, missing = "ab" + "0" * 62, "ab" + "1" * 62, "cd" + "0" * 62
+
+    store.put_many(None, {first: ("zlib", 24, blob)})
+    (tmp_path / "email-bodies" / "ab" / first).unlink()
+    store.put_many(None, {first: ("zlib", 24, blob), second: ("zlib", 24, blob)})
+
+    assert sorted(path.name for path in (tmp_path / "email-bodies" / "ab").iterdir()) == [first, second]
+    assert store.get_many(None, [first, missing]) == {first: blob}
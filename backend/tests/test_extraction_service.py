@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import re
+from dataclasses import replace
 from datetime import UTC, datetime
 
-from sqlalchemy import create_engine, select
+import pytest
+from sqlalchemy import create_engine, event, select
 from sqlalchemy.orm import Session, sessionmaker
 
+from app.core.config import get_settings
 from app.db.base import Base
-from app.db.models import Job, ProcessedEmail
+from app.db.models import Job, ParseCacheEntry, ProcessedEmail
 from app.services.extraction_service import ExtractionService
+from app.services.parsers import EmailParseContext, LinkedInEmailParser, ParseCache
+from tests.helpers import linkedin_digest_html
 
 
 def _session() -> Session:
@@ -56,3 +62,267 @@ def test_extraction_creates_jobs_and_skips_duplicates_on_second_run() -> None:
     assert second.jobs_created == 0
     assert second.duplicates_skipped == 1
     assert len(db.scalars(select(Job)).all()) == 1
+
+
+def test_extraction_dedupes_a_digest_against_existing_jobs_with_one_bulk_insert() -> None:
+    db = _session()
+    job_ids = range(1_000_000_000, 1_000_000_024)
+    email = ProcessedEmail(
+        gmail_message_id="gmail-digest",
+        source="gmail",
+        sender="jobs-listings@linkedin.com",
+        recipients=[],
+        subject="LinkedIn job alert",
+        received_date=datetime(2026, 7, 28, 10, 0, tzinfo=UTC),
+        raw_html_body=linkedin_digest_html(job_ids),
+        status="ingested",
+        extraction_status="pending",
+    )
+    db.add(email)
+    db.add(
+        Job(
+            source="linkedin",
+            external_id="1000000010",
+            job_url="https://www.linkedin.com/jobs/view/1000000010/",
+            received_date=datetime(2026, 7, 27, 10, 0, tzinfo=UTC),
+            raw_text="Existing job",
+        )
+    )
+    db.commit()
+    job_selects: list[str] = []
+    job_inserts: list[str] = []
+
+    @event.listens_for(db.get_bind(), "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.startswith("SELECT") and "FROM jobs" in statement:
+            job_selects.append(statement)
+        if statement.startswith("INSERT INTO jobs"):
+            job_inserts.append(statement)
+
+    service = ExtractionService()
+    parsed = service.parse_context(
+        EmailParseContext(sender=email.sender, subject=email.subject, html_body=email.raw_html_body, plain_text_body=None)
+    )
+    repeated = replace(parsed.opportunities[3], job_url=f"{parsed.opportunities[3].job_url}?trk=digest")
+    result = service.extract_email(
+        db,
+        email,
+        reset_existing=False,
+        parsed=replace(parsed, opportunities=[*parsed.opportunities, repeated]),
+    )
+
+    assert result.jobs_found == 25
+    assert result.jobs_created == 23
+    assert result.duplicates_skipped == 2
+    assert len(job_selects) <= 3
+    assert len(job_inserts) == 1
+    assert len(db.scalars(select(Job)).all()) == 24
+
+
+def test_bulk_job_insert_falls_back_per_row_only_for_failing_rows() -> None:
+    db = _session()
+    email = ProcessedEmail(
+        gmail_message_id="gmail-digest",
+        source="gmail",
+        sender="jobs-listings@linkedin.com",
+        recipients=[],
+        subject="LinkedIn job alert",
+        received_date=datetime(2026, 7, 28, 10, 0, tzinfo=UTC),
+        raw_html_body=linkedin_digest_html(range(1_000_000_000, 1_000_000_003)),
+        status="ingested",
+        extraction_status="pending",
+    )
+    db.add(email)
+    db.commit()
+    service = ExtractionService()
+    parsed = service.parse_context(
+        EmailParseContext(sender=email.sender, subject=email.subject, html_body=email.raw_html_body, plain_text_body=None)
+    )
+    broken = replace(
+        parsed.opportunities[1],
+        job_url="https://example.com/broken",
+        external_id=None,
+        job_title="Broken role",
+        raw_text=None,
+    )
+    job_inserts: list[str] = []
+
+    @event.listens_for(db.get_bind(), "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.startswith("INSERT INTO jobs"):
+            job_inserts.append(statement)
+
+    result = service.extract_email(
+        db,
+        email,
+        reset_existing=False,
+        parsed=replace(parsed, opportunities=[*parsed.opportunities, parsed.opportunities[0], broken]),
+    )
+
+    assert result.jobs_created == 3
+    assert result.duplicates_skipped == 1
+    assert result.failures == 1
+    assert result.extraction_status == "partially_parsed"
+    assert "IntegrityError" in result.errors[0]
+    assert len(job_inserts) == 1 + 4
+    assert len(db.scalars(select(Job)).all()) == 3
+
+
+def test_run_pending_pages_emails_by_id_inside_the_callers_transaction(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("EXTRACTION_CHUNK_SIZE", "2")
+    get_settings.cache_clear()
+    db = _session()
+    for index in range(5):
+        db.add(
+            ProcessedEmail(
+                gmail_message_id=f"gmail-{index}",
+                sender="jobs-listings@linkedin.com",
+                recipients=["candidate@example.com"],
+                subject="LinkedIn job alert",
+                received_date=datetime(2026, 7, 28, 10, index, tzinfo=UTC),
+                raw_html_body=linkedin_digest_html([1_000_000_000 + index]),
+                raw_mime="x" * 10_000,
+                headers={"Subject": "LinkedIn job alert"},
+                status="ingested",
+                extraction_status="pending",
+            )
+        )
+    db.commit()
+    email_ids = db.scalars(select(ProcessedEmail.id).order_by(ProcessedEmail.id)).all()
+    email_selects: list[tuple[str, tuple]] = []
+    commits: list[int] = []
+
+    @event.listens_for(db, "after_transaction_end")
+    def record_commit(session, transaction) -> None:
+        if transaction.parent is None:
+            commits.append(len(email_selects))
+
+    @event.listens_for(db.get_bind(), "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.startswith("SELECT") and "FROM processed_emails" in statement:
+            email_selects.append((statement, parameters))
+
+    try:
+        result = ExtractionService().run_pending(db)
+    finally:
+        get_settings.cache_clear()
+
+    assert result.jobs_created == 5
+    assert len(email_selects) == 4
+    assert all("processed_emails.id > ?" in statement and " IN " not in statement for statement, _ in email_selects)
+    assert [parameters[0] for _, parameters in email_selects] == [0, email_ids[1], email_ids[3], email_ids[4]]
+    assert commits == []
+    assert not any(re.search(r"\b(raw_mime|headers)\b", statement) for statement, _ in email_selects)
+
+
+def test_run_pending_with_parse_worker_processes_matches_inline_parsing(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("EXTRACTION_PARSE_WORKERS", "2")
+    get_settings.cache_clear()
+    db = _session()
+    for index in range(4):
+        db.add(
+            ProcessedEmail(
+                gmail_message_id=f"gmail-{index}",
+                sender="jobs-listings@linkedin.com",
+                recipients=[],
+                subject="LinkedIn job alert",
+                received_date=datetime(2026, 7, 28, 10, index, tzinfo=UTC),
+                raw_html_body=linkedin_digest_html(range(index * 3, index * 3 + 3)) if index else None,
+                status="ingested",
+                extraction_status="pending",
+            )
+        )
+    db.commit()
+
+    try:
+        result = ExtractionService().run_pending(db)
+    finally:
+        get_settings.cache_clear()
+
+    assert (result.emails_processed, result.emails_parsed, result.emails_with_no_jobs) == (4, 3, 1)
+    assert result.jobs_created == 9
+    assert {job.source for job in db.scalars(select(Job))} == {"linkedin"}
+
+
+@pytest.mark.parametrize("parse_workers", ["1", "2"])
+def test_run_pending_routes_each_email_once_and_keeps_worker_filter_counts(
+    monkeypatch: pytest.MonkeyPatch,
+    parse_workers: str,
+) -> None:
+    monkeypatch.setenv("EXTRACTION_PARSE_WORKERS", parse_workers)
+    get_settings.cache_clear()
+    db = _session()
+    for index in range(3):
+        db.add(
+            ProcessedEmail(
+                gmail_message_id=f"gmail-{index}",
+                sender="jobs-listings@linkedin.com",
+                recipients=[],
+                subject="LinkedIn job alert",
+                received_date=datetime(2026, 7, 28, 10, index, tzinfo=UTC),
+                raw_html_body=linkedin_digest_html([1_000_000_000 + index]),
+                status="ingested",
+                extraction_status="pending",
+            )
+        )
+    db.add(
+        ProcessedEmail(
+            gmail_message_id="gmail-generic",
+            sender="talent@petroco.com",
+            recipients=[],
+            subject="Drilling roles this week",
+            received_date=datetime(2026, 7, 28, 11, 0, tzinfo=UTC),
+            raw_html_body=(
+                "<div><p>Drilling Supervisor</p><p>PetroCo</p><p>Aberdeen, UK</p>"
+                '<a href="https://careers.petroco.com/job/10452">View job</a>'
+                '<a href="https://www.facebook.com/petroco">Jobs on Facebook</a></div>'
+            ),
+            status="ingested",
+            extraction_status="pending",
+        )
+    )
+    db.commit()
+    service = ExtractionService(parse_cache=ParseCache(0))
+
+    try:
+        result = service.run_pending(db)
+    finally:
+        get_settings.cache_clear()
+
+    assert result.jobs_created == 4
+    assert service.parser_registry.routing_stats() == {
+        "domain": 3,
+        "subject": 0,
+        "fallback": 1,
+        "unmatched": 0,
+        "hits": 3,
+        "misses": 1,
+    }
+    generic_counts = service.parser_registry.anchor_filter_stats()["generic"]
+    assert (generic_counts["anchors"], generic_counts["rejected_url"], generic_counts["accepted"]) == (2, 1, 1)
+
+
+def test_parse_cache_skips_reparsing_repeated_content_until_the_parser_version_changes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    db = _session()
+    service = ExtractionService(parse_cache=ParseCache(8, persistent=True))
+    context = EmailParseContext(
+        sender="jobs-listings@linkedin.com",
+        subject="LinkedIn job alert",
+        html_body=linkedin_digest_html([1_000_000_001, 1_000_000_002]),
+        plain_text_body=None,
+    )
+    first = service.parse_context(context, db)
+    monkeypatch.setattr(LinkedInEmailParser, "parse", lambda self, context: pytest.fail("parsed a cached digest"))
+
+    assert service.parse_context(context, db).opportunities == first.opportunities
+    restarted = ExtractionService(parse_cache=ParseCache(8, persistent=True))
+    assert restarted.parse_context(context, db).opportunities == first.opportunities
+    assert len(db.scalars(select(ParseCacheEntry)).all()) == 1
+
+    monkeypatch.setattr(LinkedInEmailParser, "version", LinkedInEmailParser.version + 1)
+    monkeypatch.setattr(LinkedInEmailParser, "parse", lambda self, context: [])
+
+    assert service.parse_context(context, db).opportunities == []
+    assert restarted.parse_context(context, db).opportunities == []
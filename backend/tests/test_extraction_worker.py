@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import itertools
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import get_settings
+from app.db.base import Base
+from app.db.models import Job, ProcessedEmail
+from app.scripts.extraction_worker import run_extraction_worker
+from app.services import extraction_service
+from app.services.extraction_service import ExtractionService
+from tests.helpers import linkedin_digest_html
+
+
+def _session_factory(tmp_path: Path) -> sessionmaker[Session]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'queue.db'}")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+
+
+def _add_pending_emails(db: Session, count: int) -> None:
+    for index in range(count):
+        db.add(
+            ProcessedEmail(
+                gmail_message_id=f"gmail-{index}",
+                sender="jobs-listings@linkedin.com",
+                recipients=[],
+                subject="LinkedIn job alert",
+                received_date=datetime(2026, 7, 28, 10, index, tzinfo=UTC),
+                raw_html_body=linkedin_digest_html([1_000_000_000 + index]),
+                status="ingested",
+                extraction_status="pending",
+            )
+        )
+    db.commit()
+
+
+def test_workers_claim_disjoint_leases_and_reclaim_expired_ones(tmp_path: Path) -> None:
+    session_factory = _session_factory(tmp_path)
+    service = ExtractionService()
+    with session_factory() as db:
+        _add_pending_emails(db, 5)
+
+    with session_factory() as first, session_factory() as second, session_factory() as third:
+        first_ids = service.claim_pending(first, "worker-a", limit=2)
+        first.commit()
+        second_ids = service.claim_pending(second, "worker-b", limit=2, lease_seconds=-1)
+        second.commit()
+        third_ids = service.claim_pending(third, "worker-c", limit=10)
+        third.commit()
+
+        assert len(first_ids) == len(second_ids) == 2
+        assert set(first_ids).isdisjoint(second_ids)
+        assert set(third_ids) == set(second_ids) | {5}
+
+        # worker-b lost its expired lease to worker-c, so it must not touch those emails any more.
+        assert service.extract_claimed(second, "worker-b", second_ids) == []
+        results = service.extract_claimed(third, "worker-c", third_ids)
+        third.commit()
+
+    assert [result.extraction_status for result in results] == ["parsed"] * 3
+    with session_factory() as db:
+        emails = db.scalars(select(ProcessedEmail).order_by(ProcessedEmail.id)).all()
+        assert [email.extraction_status for email in emails] == ["claimed", "claimed", "parsed", "parsed", "parsed"]
+        assert emails[0].extraction_claimed_by == "worker-a"
+        assert all(email.extraction_claimed_by is None for email in emails[2:])
+        assert all(email.extraction_lease_expires_at is None for email in emails[2:])
+
+
+def test_run_pending_skips_emails_leased_by_a_worker(tmp_path: Path) -> None:
+    session_factory = _session_factory(tmp_path)
+    service = ExtractionService()
+    with session_factory() as db:
+        _add_pending_emails(db, 3)
+        service.claim_pending(db, "worker-a", limit=1)
+        db.commit()
+
+        result = service.run_pending(db)
+        db.commit()
+
+        assert result.emails_processed == 2
+        assert db.get(ProcessedEmail, 1).extraction_status == "claimed"
+
+
+def test_extraction_worker_drains_the_queue_in_leased_batches(tmp_path: Path) -> None:
+    session_factory = _session_factory(tmp_path)
+    with session_factory() as db:
+        _add_pending_emails(db, 5)
+
+    result = run_extraction_worker("worker-a", batch_size=2, session_factory=session_factory)
+
+    assert (result.emails_processed, result.emails_parsed, result.jobs_created) == (5, 5, 5)
+    with session_factory() as db:
+        assert len(db.scalars(select(Job)).all()) == 5
+        assert {email.extraction_status for email in db.scalars(select(ProcessedEmail))} == {"parsed"}
+
+
+def test_budgeted_run_commits_each_chunk_and_reports_remaining_pending(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("EXTRACTION_CHUNK_SIZE", "2")
+    monkeypatch.setenv("EXTRACTION_TIME_BUDGET_SECONDS", "60")
+    get_settings.cache_clear()
+    session_factory = _session_factory(tmp_path)
+    clock = itertools.chain([0.0, 1.0, 2.0, 61.0], itertools.repeat(0.0))
+    monkeypatch.setattr(extraction_service.time, "monotonic", lambda: next(clock))
+    with session_factory() as db:
+        _add_pending_emails(db, 5)
+
+    try:
+        with session_factory() as db:
+            first = ExtractionService().run_pending(db)
+            db.rollback()
+    finally:
+        get_settings.cache_clear()
+
+    assert (first.emails_processed, first.remaining_pending, first.stopped_due_to_budget) == (4, 1, True)
+    with session_factory() as db:
+        statuses = [email.extraction_status for email in db.scalars(select(ProcessedEmail).order_by(ProcessedEmail.id))]
+        assert statuses == ["parsed"] * 4 + ["pending"]
+
+        second = ExtractionService().run_pending_within_budget(db, 60)
+
+    assert (second.emails_processed, second.remaining_pending, second.stopped_due_to_budget) == (1, 0, False)
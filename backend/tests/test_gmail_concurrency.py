@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import get_settings
+from app.db.base import Base
+from app.db.models import Job, ProcessedEmail
+from app.services.daily_ingestion_service import DailyIngestionService
+from app.services.extraction_service import ExtractionService
+from app.services.gmail_client import GmailClient
+from app.services.gmail_ingestion_service import GmailIngestionService
+from app.services.source_ingestion_service import SourceIngestionService
+from app.utils.rate_limit import TokenBucket
+from tests.helpers import FakeGmailApi, fake_gmail_messages
+
+
+def _session() -> Session:
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+    return session_factory()
+
+
+def test_token_bucket_allows_burst_then_waits_for_refill() -> None:
+    now = 0.0
+    sleeps: list[float] = []
+    bucket = TokenBucket(250, clock=lambda: now, sleep=sleeps.append)
+
+    assert bucket.acquire(250) == 0.0
+    assert bucket.acquire(125) == pytest.approx(0.5)
+    now = 1.0
+    assert bucket.acquire(100) == pytest.approx(0.0)
+    assert sleeps == [pytest.approx(0.5)]
+
+
+def test_parallel_gmail_fetch_uses_one_service_per_worker_thread(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GMAIL_FETCH_WORKERS", "3")
+    monkeypatch.setenv("GMAIL_BATCH_SIZE", "2")
+    get_settings.cache_clear()
+    messages = fake_gmail_messages(12)
+    service_threads: list[str] = []
+
+    def new_service() -> FakeGmailApi:
+        service_threads.append(threading.current_thread().name)
+        return FakeGmailApi(messages)
+
+    try:
+        client = GmailClient(rate_limiter=TokenBucket(10_000))
+        client._new_service = new_service
+        monkeypatch.setattr(client, "list_message_ids", lambda *, query, max_results: list(messages))
+        db = _session()
+        result = GmailIngestionService(gmail_client=client).run_once(db)
+    finally:
+        get_settings.cache_clear()
+
+    assert result.new_emails_stored == 12
+    assert result.failures == 0
+    assert len(db.scalars(select(ProcessedEmail)).all()) == 12
+    assert len(service_threads) == len(set(service_threads))
+    assert all(name.startswith("gmail-fetch") for name in service_threads)
+
+
+@pytest.mark.parametrize("pipeline_enabled", [False, True])
+def test_pipelined_daily_ingestion_matches_phased_results(
+    monkeypatch: pytest.MonkeyPatch,
+    pipeline_enabled: bool,
+) -> None:
+    monkeypatch.setenv("INGESTION_PIPELINE_ENABLED", str(pipeline_enabled).lower())
+    monkeypatch.setenv("INGESTION_PIPELINE_QUEUE_SIZE", "1")
+    monkeypatch.setenv("GMAIL_BATCH_SIZE", "4")
+    get_settings.cache_clear()
+    messages = fake_gmail_messages(10)
+
+    try:
+        client = GmailClient(rate_limiter=TokenBucket(10_000))
+        client._new_service = lambda: FakeGmailApi(messages)
+        monkeypatch.setattr(client, "list_message_ids", lambda *, query, max_results: list(messages))
+        db = _session()
+        service = DailyIngestionService(
+            gmail_ingestion_service=GmailIngestionService(gmail_client=client),
+            extraction_service=ExtractionService(),
+            source_ingestion_service=SourceIngestionService(sources=[]),
+        )
+        result = service.run_once(db)
+    finally:
+        get_settings.cache_clear()
+
+    assert (result.emails_processed, result.jobs_found, result.jobs_created) == (10, 10, 10)
+    assert result.errors == []
+    assert len(db.scalars(select(Job)).all()) == 10
+    if pipeline_enabled:
+        assert {stage: stats["messages"] for stage, stats in result.pipeline.items()} == {
+            "fetch": 10,
+            "decode": 10,
+            "parse": 10,
+            "persist": 10,
+        }
+        assert all(stats["max_queue_depth"] <= 1 for stats in result.pipeline.values())
+    else:
+        assert result.pipeline is None
+
+
+def test_pipelined_daily_ingestion_drops_inline_extraction_when_gmail_stage_rolls_back(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("INGESTION_PIPELINE_ENABLED", "true")
+    monkeypatch.setenv("GMAIL_BATCH_SIZE", "4")
+    monkeypatch.setenv("EXTRACTION_TIME_BUDGET_SECONDS", "30")
+    get_settings.cache_clear()
+    messages = fake_gmail_messages(10)
+    run_pending_calls: list[int] = []
+
+    try:
+        client = GmailClient(rate_limiter=TokenBucket(10_000))
+        client._new_service = lambda: FakeGmailApi(messages)
+        monkeypatch.setattr(client, "list_message_ids", lambda *, query, max_results: list(messages))
+        gmail_service = GmailIngestionService(gmail_client=client)
+        store_records = gmail_service.store_records
+        stored_chunks: list[list[str]] = []
+
+        def failing_store(db: Session, chunk: list[str], records: dict) -> object:
+            if stored_chunks:
+                raise RuntimeError("database went away")
+            stored_chunks.append(chunk)
+            return store_records(db, chunk, records)
+
+        monkeypatch.setattr(gmail_service, "store_records", failing_store)
+        extraction_service = ExtractionService()
+        run_pending = extraction_service.run_pending
+
+        def counting_run_pending(db: Session) -> object:
+            run_pending_calls.append(1)
+            return run_pending(db)
+
+        monkeypatch.setattr(extraction_service, "run_pending", counting_run_pending)
+        db = _session()
+        result = DailyIngestionService(
+            gmail_ingestion_service=gmail_service,
+            extraction_service=extraction_service,
+            source_ingestion_service=SourceIngestionService(sources=[]),
+        ).run_once(db)
+    finally:
+        get_settings.cache_clear()
+
+    assert len(stored_chunks) == 1
+    assert run_pending_calls == [1]
+    assert (result.emails_processed, result.jobs_found, result.jobs_created) == (0, 0, 0)
+    assert result.errors == ["RuntimeError: database went away"]
+    assert db.scalars(select(Job)).all() == []
+    assert db.scalars(select(ProcessedEmail)).all() == []
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from app.core.config import get_settings
+from app.services.parsers import EmailParseContext
+from app.services.parsers.generic import GenericEmailParser
+from app.services.parsers.linkedin import LinkedInEmailParser
+from app.sources.airswift import parse_detail_page, parse_listing_page, parse_total_pages
+from tests.helpers import DETAIL_PAGE, LISTING_PAGE_1, linkedin_digest_html
+
+EMAIL_CORPUS = {
+    "linkedin_digest": linkedin_digest_html(range(1_000_000_000, 1_000_000_012)),
+    "linkedin_inline": """
+    <div><a href="https://www.linkedin.com/jobs/view/1234567890/?trk=email">Senior Drilling Engineer</a>
+    <span>PetroCo · Houston, TX</span></div>
+    <div><a href="https://www.linkedin.com/comm/jobs/view/9876543210/?currentJobId=9876543210">Subsea Lead</a>
+    <span>Offshore Energy Ltd · London, UK</span></div>
+    <a href="https://www.linkedin.com/email-preferences">Unsubscribe</a>
+    """,
+    "generic_sections": """
+    <html><body>
+      <section><h2>Pipeline Integrity Engineer</h2><p>Company: Gulf Operators</p><p>Doha, Qatar</p>
+        <a href="https://jobs.example.com/job/445566?utm_campaign=alert">Apply now</a></section>
+      <section><h2>Maintenance Supervisor</h2><p>North Sea Services</p><p>Aberdeen, UK</p>
+        <a href="https://careers.example.org/position/778899">View job</a></section>
+      <a href="https://jobs.example.com/unsubscribe">unsubscribe</a>
+    </body></html>
+    """,
+    "entities_and_whitespace": """
+    <p>New&nbsp;role &amp; more</p>
+    <div>  <a href="https://careers.example.org/vacancy/42?utm_source=x"> Well&nbsp;Site   Supervisor </a>
+    <span>Drill &amp; Co</span> <span>Abu Dhabi, UAE</span></div>
+    """,
+}
+
+
+UNCLOSED_TABLE_CELLS = """
+<table><tr><td><a href="https://jobs.example.com/job/1">Reservoir Engineer</a><br>Energy Co<br>Perth, Australia
+<tr><td><a href="https://jobs.example.com/job/2">Process Engineer</a><br>Refining Ltd<br>Rotterdam
+</table>
+"""
+
+
+def _with_engine(monkeypatch: pytest.MonkeyPatch, engine: str, parse: Callable[[], Any]) -> Any:
+    monkeypatch.setenv("HTML_PARSER_ENGINE", engine)
+    get_settings.cache_clear()
+    try:
+        return parse()
+    finally:
+        get_settings.cache_clear()
+
+
+@pytest.mark.parametrize("name", sorted(EMAIL_CORPUS))
+@pytest.mark.parametrize("parser_class", [LinkedInEmailParser, GenericEmailParser], ids=["linkedin", "generic"])
+def test_lxml_engine_matches_html_parser_for_email_corpus(
+    monkeypatch: pytest.MonkeyPatch,
+    parser_class: type[LinkedInEmailParser] | type[GenericEmailParser],
+    name: str,
+) -> None:
+    pytest.importorskip("lxml")
+    context = EmailParseContext(sender=None, subject=None, html_body=EMAIL_CORPUS[name], plain_text_body=None)
+
+    expected = _with_engine(monkeypatch, "html.parser", lambda: parser_class().parse(context))
+    actual = _with_engine(monkeypatch, "lxml", lambda: parser_class().parse(context))
+
+    assert actual == expected
+
+
+def test_lxml_engine_matches_html_parser_for_airswift_pages(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("lxml")
+
+    def parse() -> tuple[Any, ...]:
+        return (
+            parse_total_pages(LISTING_PAGE_1),
+            parse_listing_page(LISTING_PAGE_1),
+            parse_detail_page(DETAIL_PAGE, "https://www.airswift.com/jobs/example-1278092"),
+        )
+
+    assert _with_engine(monkeypatch, "lxml", parse) == _with_engine(monkeypatch, "html.parser", parse)
+
+
+def test_lxml_engine_closes_unclosed_table_cells_that_html_parser_nests(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("lxml")
+    context = EmailParseContext(sender=None, subject=None, html_body=UNCLOSED_TABLE_CELLS, plain_text_body=None)
+
+    nested = _with_engine(monkeypatch, "html.parser", lambda: GenericEmailParser().parse(context))
+    closed = _with_engine(monkeypatch, "lxml", lambda: GenericEmailParser().parse(context))
+
+    assert [job.job_url for job in closed] == [job.job_url for job in nested]
+    assert "Rotterdam" in nested[0].raw_text
+    assert closed[0].raw_text == "Reservoir Engineer\nEnergy Co\nPerth, Australia"
+
+
+def test_unknown_html_engine_is_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
+    context = EmailParseContext(sender=None, subject=None, html_body="<a href='https://x.test/job/1'>x</a>", plain_text_body=None)
+
+    with pytest.raises(ValueError, match="HTML_PARSER_ENGINE"):
+        _with_engine(monkeypatch, "regex", lambda: GenericEmailParser().parse(context))
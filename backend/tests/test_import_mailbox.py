@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.base import Base
+from app.db.models import IngestionRun, ProcessedEmail
+from app.scripts.import_mailbox import import_mailbox
+
+
+def _session() -> Session:
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+    return session_factory()
+
+
+def _mbox_message(index: int, *, sender: str, subject: str, body: str) -> str:
+    return "\n".join(
+        [
+            f"From 17000000000000{index}@xxx Tue Jul 28 10:00:00 +0000 2026",
+            f"X-GM-THRID: 17000000000000{index}",
+            f"Message-ID: <alert-{index}@example.com>",
+            f"From: {sender}",
+            "To: candidate@example.com",
+            f"Subject: {subject}",
+            "Date: Tue, 28 Jul 2026 10:00:00 +0000",
+            "Content-Type: text/plain; charset=utf-8",
+            "",
+            body,
+            "",
+        ]
+    )
+
+
+def test_import_mailbox_streams_mbox_and_skips_duplicates(tmp_path: Path) -> None:
+    mbox_path = tmp_path / "takeout.mbox"
+    mbox_path.write_text(
+        _mbox_message(1, sender="LinkedIn <jobs-listings@linkedin.com>", subject="LinkedIn job alert", body="Drilling Engineer\n>From the team")
+        + _mbox_message(2, sender="Friend <friend@example.com>", subject="Dinner", body="See you at 7")
+        + _mbox_message(3, sender="Careers <jobs@petroco.com>", subject="New role: Reservoir Engineer", body="Apply now"),
+        encoding="utf-8",
+    )
+    db = _session()
+    progress: list[str] = []
+
+    first = import_mailbox(db, mbox_path, batch_size=1, progress=progress.append)
+    second = import_mailbox(db, mbox_path, batch_size=10, progress=progress.append)
+
+    emails = db.scalars(select(ProcessedEmail).order_by(ProcessedEmail.id)).all()
+    assert (first.messages_read, first.emails_stored, first.non_job_alerts_skipped) == (3, 2, 1)
+    assert (second.emails_stored, second.duplicates_skipped) == (0, 2)
+    assert [email.subject for email in emails] == ["LinkedIn job alert", "New role: Reservoir Engineer"]
+    assert emails[0].gmail_thread_id == "170000000000001"
+    assert emails[0].plain_text_body.strip() == "Drilling Engineer\nFrom the team"
+    assert all(email.source == "mailbox_import" for email in emails)
+    assert len(progress) == 3
+    assert len(db.scalars(select(IngestionRun)).all()) == 2
+
+
+def test_import_mailbox_reads_eml_directories_and_skips_mail_already_ingested_from_gmail(tmp_path: Path) -> None:
+    sender = "LinkedIn <jobs-listings@linkedin.com>"
+    (tmp_path / "alerts").mkdir()
+    (tmp_path / "alerts" / "latin1.eml").write_bytes(
+        _mbox_message(1, sender=sender, subject="LinkedIn job alert", body="Ingénieur forage")
+        .split("\n", 1)[1]
+        .replace("charset=utf-8", "charset=iso-8859-1\nContent-Transfer-Encoding: 8bit")
+        .encode("iso-8859-1")
+    )
+    (tmp_path / "alerts" / "from-gmail.eml").write_text(
+        _mbox_message(2, sender=sender, subject="LinkedIn job alert", body="x").split("\n", 1)[1],
+        encoding="utf-8",
+    )
+    (tmp_path / "alerts" / "notes.txt").write_text("not an email", encoding="utf-8")
+    db = _session()
+    db.add(
+        ProcessedEmail(
+            gmail_message_id="gmail-2",
+            rfc822_message_id="<alert-2@example.com>",
+            recipients=[],
+            status="ingested",
+        )
+    )
+    db.commit()
+
+    result = import_mailbox(db, tmp_path, progress=lambda _: None)
+
+    imported = db.scalar(select(ProcessedEmail).where(ProcessedEmail.source == "mailbox_import"))
+    assert (result.messages_read, result.emails_stored, result.duplicates_skipped) == (2, 1, 1)
+    assert imported.rfc822_message_id == "<alert-1@example.com>"
+    assert imported.plain_text_body.strip() == "Ingénieur forage"
+    assert "Ingénieur forage" in imported.raw_mime
+
+
+def test_import_mailbox_keeps_the_first_copy_of_a_message_id_repeated_in_one_batch(tmp_path: Path) -> None:
+    mbox_path = tmp_path / "takeout.mbox"
+    mbox_path.write_text(
+        _mbox_message(1, sender="LinkedIn <jobs-listings@linkedin.com>", subject="LinkedIn job alert", body="First copy")
+        + _mbox_message(1, sender="LinkedIn <jobs-listings@linkedin.com>", subject="LinkedIn job alert", body="Second copy"),
+        encoding="utf-8",
+    )
+    db = _session()
+
+    result = import_mailbox(db, mbox_path, batch_size=10, progress=lambda _: None)
+
+    emails = db.scalars(select(ProcessedEmail)).all()
+    assert (result.messages_read, result.emails_stored, result.duplicates_skipped) == (2, 1, 1)
+    assert [email.plain_text_body.strip() for email in emails] == ["First copy"]
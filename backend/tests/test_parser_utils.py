@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import re
+
+from app.services.parsers.utils import line_urls, lines_without_boilerplate
+from tests.helpers import linkedin_text_digest
+
+
+def test_line_urls_match_a_per_line_scan() -> None:
+    lines = lines_without_boilerplate(
+        linkedin_text_digest(20) + "\nno links here\nhttps://a.example.com/x https://b.example.com/y"
+    )
+
+    assert list(line_urls(lines)) == [
+        (index, url) for index, line in enumerate(lines) for url in re.findall(r"https?://\S+", line)
+    ]
+    assert list(line_urls([])) == []
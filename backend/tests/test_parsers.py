@@ -5,6 +5,16 @@ import pytest
 from app.services.parsers import EmailParseContext, ParserRegistry
 from app.services.parsers.generic import GenericEmailParser
 from app.services.parsers.linkedin import LinkedInEmailParser, infer_linkedin_fields_from_text
+from app.services.parsers.templates import TemplateCache
+from app.services.parsers.utils import (
+    BlockIndex,
+    JobUrl,
+    analyze_job_url,
+    closest_repeating_block,
+    html_to_soup,
+    visible_text,
+)
+from tests.helpers import linkedin_table_digest_html
 
 
 def test_registry_selects_linkedin_for_linkedin_job_alert() -> None:
@@ -188,3 +198,182 @@ def test_generic_parser_extracts_job_blocks_and_ignores_boilerplate() -> None:
     assert jobs[0].location == "Doha, Qatar"
     assert jobs[0].job_url == "https://jobs.example.com/job/445566"
     assert jobs[1].job_title == "Maintenance Supervisor"
+
+
+@pytest.mark.parametrize("description_sentences", [0, 60])
+def test_block_index_finds_the_same_blocks_as_rendering_each_parent(description_sentences: int) -> None:
+    html = linkedin_table_digest_html(range(6), description_sentences=description_sentences)
+    html += "<div>\n  Drill &amp; Co<br>Houston\n\n  TX <a href='https://jobs.example.com/job/1'>Apply</a><!-- hidden --></div>"
+    soup = html_to_soup(html)
+    block_index = BlockIndex(soup)
+
+    for anchor in soup.find_all("a", href=True):
+        expected = anchor
+        for parent in anchor.parents:
+            text = visible_text(parent) or ""
+            if 20 <= len(text) <= 1200 and len(parent.find_all("a", href=True)) <= 8:
+                expected = parent
+                break
+        assert closest_repeating_block(anchor, block_index) is expected
+        assert closest_repeating_block(anchor) is expected
+
+
+def test_registry_routes_known_senders_and_subjects_without_sniffing_bodies(monkeypatch: pytest.MonkeyPatch) -> None:
+    registry = ParserRegistry()
+    monkeypatch.setattr(LinkedInEmailParser, "can_parse", lambda self, context: pytest.fail("sniffed the body"))
+    routed = [
+        EmailParseContext("LinkedIn <jobs-listings@e.linkedin.com>", "New jobs for you", "<p>x</p>", None),
+        EmailParseContext("Friend <friend@gmail.com>", "Fwd: LinkedIn Job Alert", "<p>x</p>", None),
+    ]
+
+    assert [type(registry.select_parser(context)) for context in routed] == [LinkedInEmailParser] * 2
+
+    monkeypatch.undo()
+    forwarded = EmailParseContext(
+        "friend@gmail.com",
+        "Fwd: openings",
+        '<a href="https://www.linkedin.com/jobs/view/1234567890/">Drilling Engineer</a> job alert',
+        None,
+    )
+    unknown = EmailParseContext("alerts@example.com", "Hello", None, None)
+
+    assert isinstance(registry.select_parser(forwarded), LinkedInEmailParser)
+    assert registry.select_parser(unknown) is None
+    assert registry.routing_stats() == {
+        "domain": 1,
+        "subject": 1,
+        "fallback": 1,
+        "unmatched": 1,
+        "hits": 2,
+        "misses": 2,
+    }
+
+
+@pytest.mark.parametrize(
+    ("sender", "subject", "expected"),
+    [
+        ("news@example.com", "Drilling vacancies in Qatar", True),
+        ("news@example.com", "3 new jobs for you", True),
+        ("friend@gmail.com", "Fwd: LinkedIn Job Alert", True),
+        ("alerts@e.linkedin.com", "Your weekly digest", True),
+        ("bank@example.com", "Your financial position this quarter", False),
+        ("news@example.com", "Jobsite safety briefing", False),
+        ("news@example.com", "Role-play night", False),
+        ("news@example.com", "Recruitment newsletter", False),
+    ],
+)
+def test_registry_job_alert_candidates_match_whole_words(sender: str, subject: str, expected: bool) -> None:
+    assert ParserRegistry().is_job_alert_candidate(sender, subject) is expected
+
+
+def test_linkedin_card_templates_match_the_heuristics() -> None:
+    card = (
+        '<tr><td><a href="https://www.linkedin.com/jobs/view/{job_id}/">{title}</a></td></tr>'
+        "<tr><td>{company}</td></tr><tr><td>{extra}</td></tr>"
+    )
+    cards = [
+        ("Drilling Engineer", "PetroCo · Houston, TX", "Actively recruiting"),
+        ("Promoted Subsea Manager 2 days ago", "Gulf Ops · Doha, Qatar", "Easy Apply"),
+        ("Easy Apply", "PetroCo · Houston, TX", "3 connections"),
+        ("Well Test Operator", "No separator here", "Aberdeen"),
+        ("Reservoir Analyst", "Unsubscribe · now", "Remote"),
+        ("Pipeline · Integrity Lead", "Gulf Ops · Doha", ""),
+        ("Mud Logger", "PetroCo · Perth, WA", "North · West Shelf"),
+    ]
+    digests = [
+        "<table>"
+        + "".join(
+            card.format(job_id=index * 100 + offset, title=title, company=company, extra=extra)
+            for offset, (title, company, extra) in enumerate(cards[index:] + cards[:index])
+        )
+        + "</table>"
+        for index in range(len(cards))
+    ]
+    digests.append(linkedin_table_digest_html(range(6), description_sentences=60))
+    digests.append("<div><a href='https://www.linkedin.com/jobs/view/77/'>Drilling\nEngineer</a><br>PetroCo · Houston</div>")
+    contexts = [EmailParseContext("jobs-listings@linkedin.com", "LinkedIn job alert", html, None) for html in digests]
+    templates = TemplateCache()
+    learning = LinkedInEmailParser(templates)
+    heuristic = LinkedInEmailParser(TemplateCache(0))
+
+    for context in contexts:
+        assert learning.parse(context) == heuristic.parse(context)
+    assert templates.hits > 0
+    assert templates.learned > 0
+
+
+def test_analyze_job_url_normalizes_once_per_distinct_url() -> None:
+    analyze_job_url.cache_clear()
+    tracked = "HTTPS://WWW.LinkedIn.com/comm/jobs/view/1234567890/?trk=eml&refId=abc#top"
+    html = "".join(f'<div><a href="{tracked}">Drilling Engineer</a> PetroCo · Houston</div>' for _ in range(5))
+
+    jobs = LinkedInEmailParser().parse(EmailParseContext("jobs-listings@linkedin.com", "Job alert", html, None))
+
+    assert [job.external_id for job in jobs] == ["1234567890"]
+    assert analyze_job_url(tracked) == JobUrl(
+        url="https://www.linkedin.com/comm/jobs/view/1234567890/?refId=abc",
+        host="www.linkedin.com",
+        is_linkedin_job=True,
+        linkedin_job_id="1234567890",
+        job_id=None,
+    )
+    assert analyze_job_url.cache_info().misses == 1
+    assert analyze_job_url("https://www.linkedin.com/jobs/search/?currentJobId=42").linkedin_job_id == "42"
+    assert analyze_job_url("https://careers.example.com/job/445566?utm_source=x").job_id == "445566"
+    assert analyze_job_url("mailto:jobs@example.com") == JobUrl(None)
+
+
+def test_generic_anchor_filter_analyzes_blocks_only_for_surviving_links() -> None:
+    html = """
+    <div><p>Join our talent community and apply today!</p>
+      <a href="https://www.facebook.com/petroco/jobs">Jobs on Facebook</a>
+      <a href="https://twitter.com/petroco">Follow our job news</a>
+      <a href="https://www.petroco.com/about">About us</a>
+    </div>
+    <div><p>Senior Reservoir Engineer</p><p>PetroCo</p><p>Houston, TX</p>
+      <a href="https://careers.petroco.com/roles/reservoir-engineer?src=email&cta=title">View job</a>
+      <a href="https://careers.petroco.com/roles/reservoir-engineer/?src=email&cta=button">Apply now</a>
+    </div>
+    <div><p>Drilling Supervisor</p><p>PetroCo</p><p>Aberdeen, UK</p>
+      <a href="https://careers.petroco.com/apply?posting=10452&src=email">Apply now</a>
+      <a href="https://careers.petroco.com/apply?posting=10453&src=email">Apply for the night shift</a>
+    </div>
+    <a href="https://careers.petroco.com/unsubscribe">Unsubscribe from job alerts</a>
+    """
+    parser = GenericEmailParser()
+
+    jobs = parser.parse(EmailParseContext("talent@petroco.com", "New roles", html, None))
+
+    assert [job.job_url for job in jobs] == [
+        "https://careers.petroco.com/roles/reservoir-engineer?src=email&cta=title",
+        "https://careers.petroco.com/apply?posting=10452&src=email",
+        "https://careers.petroco.com/apply?posting=10453&src=email",
+    ]
+    assert jobs[0].job_title == "Senior Reservoir Engineer"
+    assert parser.anchor_filter_stats() == {
+        "anchors": 8,
+        "rejected_url": 3,
+        "rejected_text": 1,
+        "duplicate": 1,
+        "rejected_block": 0,
+        "accepted": 3,
+        "selectivity": 0.375,
+    }
+    assert ParserRegistry([parser]).anchor_filter_stats()["generic"]["accepted"] == 3
+
+
+def test_generic_anchor_filter_keeps_postings_that_differ_only_in_query_slugs() -> None:
+    html = """
+    <div><p>Senior Drilling Engineer</p><p>PetroCo</p><p>Houston, TX</p>
+      <a href="https://careers.example.com/apply?role=senior-drilling-engineer&cta=title">Apply now</a></div>
+    <div><p>Process Engineer</p><p>PetroCo</p><p>Aberdeen, UK</p>
+      <a href="https://careers.example.com/apply?role=process-engineer&cta=title">Apply now</a>
+      <a href="https://careers.example.com/apply?role=process-engineer&cta=button&src=footer">Apply</a></div>
+    """
+
+    jobs = GenericEmailParser().parse(EmailParseContext("talent@example.com", "New roles", html, None))
+
+    assert [job.job_url for job in jobs] == [
+        "https://careers.example.com/apply?role=senior-drilling-engineer&cta=title",
+        "https://careers.example.com/apply?role=process-engineer&cta=title",
+    ]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import base64
 import json
 from datetime import UTC, datetime
 from pathlib import Path
@@ -7,20 +8,32 @@ from typing import Any
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine, select
+from sqlalchemy import create_engine, event, select
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.api.deps import get_db
 from app.api.routes import cron as cron_routes
 from app.core.config import get_settings
 from app.db.base import Base
-from app.db.models import Job, ProcessedEmail
+from app.db.models import GmailSyncCheckpoint, Job, ProcessedEmail
 from app.main import app
 from app.services.daily_ingestion_service import DailyIngestionResult, DailyIngestionService
 from app.services.extraction_service import ExtractionResult, ExtractionService
-from app.services.gmail_client import GmailClient, GmailCredentialsError, credentials_from_token_json
+from app.services.gmail_client import (
+    GmailClient,
+    GmailCredentialsError,
+    GmailHistoryExpiredError,
+    GmailHistoryPage,
+    credentials_from_token_json,
+    gmail_discovery_document,
+    raw_mime_from_message,
+)
 from app.services.gmail_ingestion_service import GmailIngestionResult, GmailIngestionService
+from app.services.parsers import ParserRegistry
+from app.services.parsers.generic import GenericEmailParser
+from app.services.parsers.linkedin import LinkedInEmailParser
 from app.services.source_ingestion_service import SourceIngestionResult, SourceIngestionService
+from tests.helpers import FakeGmailApi
 
 
 class StubDailyIngestionService:
@@ -41,8 +54,10 @@ class StubDailyIngestionService:
 
 
 class FakeGmailClient:
-    def __init__(self, messages: dict[str, dict[str, Any]]) -> None:
+    def __init__(self, messages: dict[str, dict[str, Any] | Exception]) -> None:
         self.messages = messages
+        self.batch_calls = 0
+        self.batch_requests: list[tuple[str, list[str]]] = []
 
     def list_message_ids(self, *, query: str, max_results: int) -> list[str]:
         return list(self.messages.keys())[:max_results]
@@ -53,6 +68,70 @@ class FakeGmailClient:
     def get_message_raw_mime(self, message_id: str) -> str | None:
         return self.messages[message_id]["raw"]
 
+    def get_messages_batch(
+        self,
+        message_ids: list[str],
+        *,
+        format: str,
+        metadata_headers: list[str] | None = None,
+    ) -> dict[str, dict[str, Any] | Exception]:
+        self.batch_calls += 1
+        self.batch_requests.append((format, list(message_ids)))
+        responses: dict[str, dict[str, Any] | Exception] = {}
+        for message_id in message_ids:
+            message = self.messages[message_id]
+            if isinstance(message, Exception):
+                responses[message_id] = message
+            elif format == "raw":
+                responses[message_id] = {
+                    "id": message_id,
+                    "threadId": message["full"]["threadId"],
+                    "internalDate": message["full"]["internalDate"],
+                    "raw": base64.urlsafe_b64encode(message["raw"].encode("utf-8")).decode("ascii"),
+                }
+            elif format == "metadata":
+                responses[message_id] = {
+                    **{key: value for key, value in message["full"].items() if key != "payload"},
+                    "payload": {"headers": message["full"]["payload"]["headers"]},
+                }
+            else:
+                responses[message_id] = message["full"]
+        return responses
+
+
+class HistoryGmailClient(FakeGmailClient):
+    def __init__(self, messages: dict[str, dict[str, Any] | Exception], *, history_id: str) -> None:
+        super().__init__(messages)
+        self.history_id = history_id
+        self.history_expired = False
+        self.list_calls = 0
+        self.history_requests: list[str] = []
+        self.history_label_ids: list[frozenset[str]] = []
+        self.profile_calls = 0
+        self.known_account_email: str | None = "petromatch@example.com"
+
+    def get_profile(self) -> dict[str, Any]:
+        self.profile_calls += 1
+        return {"emailAddress": "petromatch@example.com", "historyId": self.history_id}
+
+    def list_message_ids(self, *, query: str, max_results: int) -> list[str]:
+        self.list_calls += 1
+        return super().list_message_ids(query=query, max_results=max_results)
+
+    def list_history_message_ids(
+        self,
+        *,
+        start_history_id: str,
+        label_id: str | None,
+        max_results: int,
+        required_label_ids: frozenset[str] = frozenset(),
+    ) -> GmailHistoryPage:
+        self.history_requests.append(start_history_id)
+        self.history_label_ids.append(required_label_ids)
+        if self.history_expired:
+            raise GmailHistoryExpiredError("expired")
+        return GmailHistoryPage(message_ids=["gmail-2"], history_id=self.history_id)
+
 
 class StubGmailIngestionService:
     def __init__(self) -> None:
@@ -374,7 +453,7 @@ def test_local_token_file_loading_still_works(tmp_path: Path) -> None:
     assert credentials.valid is True
 
 
-def test_gmail_list_message_ids_uses_profile_diagnostics_without_live_gmail(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_gmail_list_message_ids_looks_up_the_profile_only_when_listing_fails(monkeypatch: pytest.MonkeyPatch) -> None:
     fake_service = FakeGmailService()
     client = GmailClient()
     monkeypatch.setattr(client, "build_service", lambda: fake_service)
@@ -382,7 +461,376 @@ def test_gmail_list_message_ids_uses_profile_diagnostics_without_live_gmail(monk
     message_ids = client.list_message_ids(query="is:unread", max_results=50)
 
     assert message_ids == ["message-1", "message-2"]
+    assert fake_service.profile_requested is False
+
+    fake_service.list_error = RuntimeError("quota exceeded")
+    with pytest.raises(RuntimeError, match="quota exceeded"):
+        client.list_message_ids(query="is:unread", max_results=50)
     assert fake_service.profile_requested is True
+    assert client.known_account_email == "petromatch@example.com"
+
+
+def test_gmail_client_uses_configured_account_and_cached_discovery_document(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake_service = FakeGmailService()
+    client = GmailClient(account_email="petromatch@example.com")
+    monkeypatch.setattr(client, "build_service", lambda: fake_service)
+
+    client.list_message_ids(query="is:unread", max_results=50)
+
+    assert fake_service.profile_requested is False
+    assert client.account_email() == "petromatch@example.com"
+    assert gmail_discovery_document() is gmail_discovery_document()
+    assert gmail_discovery_document()["name"] == "gmail"
+
+
+def test_gmail_client_batches_message_fetches() -> None:
+    message_ids = [f"message-{index}" for index in range(120)]
+    fake_api = FakeGmailApi(
+        {message_id: {"id": message_id, "raw": "RnJvbTogYUBleGFtcGxlLmNvbQ", "payload": {}} for message_id in message_ids}
+    )
+    client = GmailClient()
+    client.rate_limiter = None
+    client._new_service = lambda: fake_api
+
+    responses = client.get_messages_batch(message_ids, format="raw")
+
+    assert fake_api.round_trips == 2
+    assert set(responses) == set(message_ids)
+    assert raw_mime_from_message(responses["message-0"]) == "From: a@example.com"
+
+
+def test_gmail_ingestion_fetches_in_batches_and_isolates_message_failures(sqlite_session: Session) -> None:
+    gmail_client = FakeGmailClient(
+        {
+            "gmail-1": _gmail_message(
+                message_id="gmail-1",
+                url="https://www.linkedin.com/jobs/view/1234567890/",
+                title="Senior Drilling Engineer",
+            ),
+            "gmail-2": RuntimeError("message not found"),
+        }
+    )
+
+    result = GmailIngestionService(gmail_client=gmail_client).run_once(sqlite_session)
+    sqlite_session.commit()
+
+    emails = {email.gmail_message_id: email for email in sqlite_session.scalars(select(ProcessedEmail)).all()}
+    assert gmail_client.batch_calls == 2
+    assert result.new_emails_stored == 1
+    assert result.failures == 1
+    assert emails["gmail-1"].status == "ingested"
+    assert emails["gmail-1"].raw_mime is not None
+    assert emails["gmail-2"].status == "failed"
+
+
+def test_gmail_raw_only_mode_builds_records_from_mime(
+    sqlite_session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("GMAIL_RAW_ONLY", "true")
+    get_settings.cache_clear()
+    gmail_client = FakeGmailClient(
+        {
+            "gmail-1": _gmail_message(
+                message_id="gmail-1",
+                url="https://www.linkedin.com/jobs/view/1234567890/",
+                title="Senior Drilling Engineer",
+            )
+        }
+    )
+
+    try:
+        result = GmailIngestionService(gmail_client=gmail_client).run_once(sqlite_session)
+    finally:
+        get_settings.cache_clear()
+
+    email = sqlite_session.scalar(select(ProcessedEmail))
+    assert gmail_client.batch_calls == 1
+    assert result.new_emails_stored == 1
+    assert email.gmail_thread_id == "thread-gmail-1"
+    assert email.sender == "LinkedIn Jobs <jobs-listings@linkedin.com>"
+    assert email.subject == "LinkedIn job alert"
+    assert email.recipients == ["candidate@example.com"]
+    assert email.received_date.replace(tzinfo=UTC) == datetime(2026, 7, 28, 10, 0, tzinfo=UTC)
+    assert "Senior Drilling Engineer" in (email.raw_html_body or "")
+
+
+def test_gmail_incremental_sync_uses_history_checkpoint(
+    sqlite_session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("GMAIL_INCREMENTAL_SYNC", "true")
+    get_settings.cache_clear()
+    messages = {
+        message_id: _gmail_message(
+            message_id=message_id,
+            url=f"https://www.linkedin.com/jobs/view/{index}234567890/",
+            title="Senior Drilling Engineer",
+        )
+        for index, message_id in enumerate(("gmail-1", "gmail-2"), start=1)
+    }
+    gmail_client = HistoryGmailClient({"gmail-1": messages["gmail-1"]}, history_id="100")
+    service = GmailIngestionService(gmail_client=gmail_client)
+
+    try:
+        first = service.run_once(sqlite_session)
+        gmail_client.messages = messages
+        gmail_client.history_id = "150"
+        second = service.run_once(sqlite_session)
+        gmail_client.history_expired = True
+        third = service.run_once(sqlite_session)
+    finally:
+        get_settings.cache_clear()
+
+    checkpoint = sqlite_session.scalar(select(GmailSyncCheckpoint))
+    assert (first.sync_mode, second.sync_mode, third.sync_mode) == ("full", "incremental", "full")
+    assert second.emails_discovered == 1
+    assert second.new_emails_stored == 1
+    assert third.duplicates_skipped == 2
+    assert gmail_client.list_calls == 2
+    assert gmail_client.profile_calls == 2
+    assert gmail_client.history_requests == ["100", "150"]
+    assert gmail_client.history_label_ids == [frozenset({"UNREAD"}), frozenset({"UNREAD"})]
+    assert checkpoint.account_email == "petromatch@example.com"
+    assert checkpoint.history_id == "150"
+
+
+def test_gmail_incremental_sync_lists_with_the_query_when_it_is_not_label_only(
+    sqlite_session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("GMAIL_INCREMENTAL_SYNC", "true")
+    monkeypatch.setenv("GMAIL_QUERY", "is:unread from:jobs-listings@linkedin.com")
+    get_settings.cache_clear()
+    gmail_client = HistoryGmailClient(
+        {
+            "gmail-1": _gmail_message(
+                message_id="gmail-1",
+                url="https://www.linkedin.com/jobs/view/1234567890/",
+                title="Senior Drilling Engineer",
+            )
+        },
+        history_id="100",
+    )
+    service = GmailIngestionService(gmail_client=gmail_client)
+
+    try:
+        first = service.run_once(sqlite_session)
+        second = service.run_once(sqlite_session)
+    finally:
+        get_settings.cache_clear()
+
+    assert (first.sync_mode, second.sync_mode) == ("full", "full")
+    assert gmail_client.list_calls == 2
+    assert gmail_client.history_requests == []
+    assert sqlite_session.scalar(select(GmailSyncCheckpoint)) is None
+
+
+def test_gmail_full_sync_keeps_listing_until_it_fits_under_max_results(
+    sqlite_session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("GMAIL_INCREMENTAL_SYNC", "true")
+    monkeypatch.setenv("GMAIL_MAX_RESULTS", "2")
+    get_settings.cache_clear()
+    messages = {
+        message_id: _gmail_message(
+            message_id=message_id,
+            url=f"https://www.linkedin.com/jobs/view/{index}234567890/",
+            title="Senior Drilling Engineer",
+        )
+        for index, message_id in enumerate(("gmail-1", "gmail-2", "gmail-3"), start=1)
+    }
+    gmail_client = HistoryGmailClient(messages, history_id="100")
+    gmail_client.known_account_email = None
+    service = GmailIngestionService(gmail_client=gmail_client)
+
+    try:
+        truncated = service.run_once(sqlite_session)
+        del gmail_client.messages["gmail-1"]
+        del gmail_client.messages["gmail-2"]
+        completed = service.run_once(sqlite_session)
+    finally:
+        get_settings.cache_clear()
+
+    checkpoint = sqlite_session.scalar(select(GmailSyncCheckpoint))
+    assert (truncated.sync_mode, truncated.new_emails_stored) == ("full", 2)
+    assert (completed.sync_mode, completed.new_emails_stored) == ("full", 1)
+    assert gmail_client.profile_calls == 2
+    assert gmail_client.history_requests == []
+    assert checkpoint.account_email == "petromatch@example.com"
+    assert checkpoint.history_id == "100"
+
+
+def test_gmail_metadata_prefilter_skips_bodies_of_non_job_alerts(
+    sqlite_session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("GMAIL_METADATA_PREFILTER", "true")
+    get_settings.cache_clear()
+    newsletter = _gmail_message(
+        message_id="gmail-2",
+        url="https://example.com/blog/post",
+        title="Read our latest article",
+    )
+    newsletter["full"]["payload"]["headers"] = [
+        {"name": "From", "value": "News <news@example.com>"},
+        {"name": "Subject", "value": "Your weekly digest"},
+        {"name": "Date", "value": "Tue, 28 Jul 2026 11:00:00 +0000"},
+    ]
+    gmail_client = FakeGmailClient(
+        {
+            "gmail-1": _gmail_message(
+                message_id="gmail-1",
+                url="https://www.linkedin.com/jobs/view/1234567890/",
+                title="Senior Drilling Engineer",
+            ),
+            "gmail-2": newsletter,
+        }
+    )
+
+    try:
+        result = GmailIngestionService(gmail_client=gmail_client).run_once(sqlite_session)
+    finally:
+        get_settings.cache_clear()
+
+    emails = {email.gmail_message_id: email for email in sqlite_session.scalars(select(ProcessedEmail)).all()}
+    assert gmail_client.batch_requests == [
+        ("metadata", ["gmail-1", "gmail-2"]),
+        ("full", ["gmail-1"]),
+        ("raw", ["gmail-1"]),
+    ]
+    assert result.new_emails_stored == 1
+    assert result.non_job_alerts_skipped == 1
+    assert emails["gmail-2"].status == "skipped"
+    assert emails["gmail-2"].subject == "Your weekly digest"
+    assert emails["gmail-2"].raw_mime is None
+    assert emails["gmail-1"].status == "ingested"
+
+
+def test_gmail_refetches_skipped_messages_that_the_current_rules_accept(
+    sqlite_session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("GMAIL_METADATA_PREFILTER", "true")
+    get_settings.cache_clear()
+    bulletin = _gmail_message(
+        message_id="gmail-1",
+        url="https://careers.petroco.com/jobs/123",
+        title="Senior Drilling Engineer",
+    )
+    bulletin["full"]["payload"]["headers"] = [
+        {"name": "From", "value": "PetroCo <bulletin@petroco.com>"},
+        {"name": "Subject", "value": "PetroCo bulletin"},
+        {"name": "Date", "value": "Tue, 28 Jul 2026 11:00:00 +0000"},
+    ]
+    gmail_client = FakeGmailClient({"gmail-1": bulletin})
+    widened = GenericEmailParser()
+    widened.subject_keywords = ("bulletin",)
+
+    try:
+        first = GmailIngestionService(gmail_client=gmail_client).run_once(sqlite_session)
+        unchanged = GmailIngestionService(gmail_client=gmail_client).run_once(sqlite_session)
+        requests_before = list(gmail_client.batch_requests)
+        second = GmailIngestionService(
+            gmail_client=gmail_client,
+            parser_registry=ParserRegistry([LinkedInEmailParser(), widened]),
+        ).run_once(sqlite_session)
+    finally:
+        get_settings.cache_clear()
+
+    email = sqlite_session.scalar(select(ProcessedEmail))
+    assert first.non_job_alerts_skipped == 1
+    assert (unchanged.emails_discovered, unchanged.duplicates_skipped, unchanged.new_emails_stored) == (1, 1, 0)
+    assert requests_before.count(("metadata", ["gmail-1"])) == 1
+    assert (second.emails_discovered, second.duplicates_skipped, second.new_emails_stored) == (1, 0, 1)
+    assert gmail_client.batch_requests[-2:] == [("full", ["gmail-1"]), ("raw", ["gmail-1"])]
+    assert (email.gmail_message_id, email.status) == ("gmail-1", "ingested")
+
+
+def test_gmail_reevaluation_counts_unlisted_skipped_messages_and_respects_max_results(
+    sqlite_session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("GMAIL_METADATA_PREFILTER", "true")
+    monkeypatch.setenv("GMAIL_MAX_RESULTS", "2")
+    get_settings.cache_clear()
+    messages = {}
+    for index in range(1, 4):
+        message = _gmail_message(
+            message_id=f"gmail-{index}",
+            url=f"https://careers.petroco.com/jobs/{index}",
+            title="Senior Drilling Engineer",
+        )
+        message["full"]["payload"]["headers"] = [
+            {"name": "From", "value": "PetroCo <bulletin@petroco.com>"},
+            {"name": "Subject", "value": f"PetroCo bulletin {index}"},
+            {"name": "Date", "value": "Tue, 28 Jul 2026 11:00:00 +0000"},
+        ]
+        messages[f"gmail-{index}"] = message
+    gmail_client = FakeGmailClient(messages)
+    widened = GenericEmailParser()
+    widened.subject_keywords = ("bulletin",)
+    widened_registry = ParserRegistry([LinkedInEmailParser(), widened])
+
+    try:
+        monkeypatch.setattr(gmail_client, "list_message_ids", lambda *, query, max_results: ["gmail-1", "gmail-2"])
+        GmailIngestionService(gmail_client=gmail_client).run_once(sqlite_session)
+        monkeypatch.setattr(gmail_client, "list_message_ids", lambda *, query, max_results: ["gmail-3"])
+        GmailIngestionService(gmail_client=gmail_client).run_once(sqlite_session)
+        monkeypatch.setattr(gmail_client, "list_message_ids", lambda *, query, max_results: [])
+        first = GmailIngestionService(gmail_client=gmail_client, parser_registry=widened_registry).run_once(
+            sqlite_session
+        )
+        second = GmailIngestionService(gmail_client=gmail_client, parser_registry=widened_registry).run_once(
+            sqlite_session
+        )
+    finally:
+        get_settings.cache_clear()
+
+    statuses = dict(sqlite_session.execute(select(ProcessedEmail.gmail_message_id, ProcessedEmail.status)).all())
+    assert (first.emails_discovered, first.new_emails_stored, first.duplicates_skipped) == (2, 2, 0)
+    assert (second.emails_discovered, second.new_emails_stored, second.duplicates_skipped) == (1, 1, 0)
+    assert statuses == {"gmail-1": "ingested", "gmail-2": "ingested", "gmail-3": "ingested"}
+
+
+def test_gmail_ingestion_bulk_inserts_each_chunk_and_ignores_conflicts(sqlite_session: Session) -> None:
+    messages = {
+        f"gmail-{index}": _gmail_message(
+            message_id=f"gmail-{index}",
+            url=f"https://www.linkedin.com/jobs/view/{index}234567890/",
+            title="Senior Drilling Engineer",
+        )
+        for index in range(1, 4)
+    }
+    gmail_client = FakeGmailClient(messages)
+    original_batch = gmail_client.get_messages_batch
+    email_inserts: list[str] = []
+
+    def batch_with_concurrent_writer(message_ids: list[str], **kwargs: Any) -> dict[str, dict[str, Any] | Exception]:
+        if not sqlite_session.scalar(select(ProcessedEmail).where(ProcessedEmail.gmail_message_id == "gmail-3")):
+            sqlite_session.add(ProcessedEmail(gmail_message_id="gmail-3", status="ingested", recipients=[]))
+            sqlite_session.flush()
+        return original_batch(message_ids, **kwargs)
+
+    def record_insert(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.startswith("INSERT INTO processed_emails"):
+            email_inserts.append(statement)
+
+    gmail_client.get_messages_batch = batch_with_concurrent_writer
+    engine = sqlite_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record_insert)
+    try:
+        result = GmailIngestionService(gmail_client=gmail_client).run_once(sqlite_session)
+    finally:
+        event.remove(engine, "before_cursor_execute", record_insert)
+
+    assert result.new_emails_stored == 2
+    assert result.duplicates_skipped == 1
+    assert result.failures == 0
+    assert len(email_inserts) == 2
+    assert "ON CONFLICT (gmail_message_id) DO NOTHING" in email_inserts[-1]
+    assert len(sqlite_session.scalars(select(ProcessedEmail)).all()) == 3
 
 
 def _daily_service_with_messages(messages: dict[str, dict[str, Any]]) -> DailyIngestionService:
@@ -437,6 +885,7 @@ def _gmail_message(*, message_id: str, url: str, title: str) -> dict[str, Any]:
 class FakeGmailService:
     def __init__(self) -> None:
         self.profile_requested = False
+        self.list_error: Exception | None = None
 
     def users(self) -> "FakeGmailService":
         return self
@@ -454,6 +903,8 @@ class FakeGmailService:
         assert userId == "me"
         assert q == "is:unread"
         assert maxResults == 50
+        if self.list_error is not None:
+            raise self.list_error
         self._response = {"messages": [{"id": "message-1"}, {"id": "message-2"}], "resultSizeEstimate": 2}
         return self
 
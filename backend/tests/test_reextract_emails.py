@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.base import Base
+from app.db.models import Job, ProcessedEmail
+from app.scripts.reextract_emails import reextract_emails
+from app.services.extraction_service import ExtractionService
+from app.services.parsers import LinkedInEmailParser
+from tests.helpers import linkedin_digest_html
+
+
+def _session() -> Session:
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+    return session_factory()
+
+
+def _email(index: int, job_ids: list[int], *, parser_version: int) -> ProcessedEmail:
+    return ProcessedEmail(
+        gmail_message_id=f"gmail-{index}",
+        sender="jobs-listings@linkedin.com",
+        recipients=[],
+        subject="LinkedIn job alert",
+        received_date=datetime(2026, 7, 28, 10, index, tzinfo=UTC),
+        raw_html_body=linkedin_digest_html(job_ids),
+        status="ingested",
+        extraction_status="pending",
+        parser_version=parser_version,
+    )
+
+
+def test_extraction_records_parser_name_and_version() -> None:
+    db = _session()
+    db.add(_email(0, [1_000_000_001], parser_version=0))
+    db.commit()
+
+    ExtractionService().run_pending(db)
+
+    email = db.scalar(select(ProcessedEmail))
+    assert (email.parser_name, email.parser_version) == ("linkedin", LinkedInEmailParser.version)
+
+
+def test_reextract_updates_only_stale_emails_with_set_based_statements() -> None:
+    db = _session()
+    stale = [
+        _email(index, [1_000_000_000 + index * 10 + offset for offset in range(3)], parser_version=0)
+        for index in range(3)
+    ]
+    current = _email(3, [1_000_000_099], parser_version=0)
+    db.add_all([*stale, current])
+    db.commit()
+    ExtractionService().run_pending(db)
+    db.commit()
+    for email in stale:
+        email.parser_version = 0
+    stale_job = db.scalar(select(Job).where(Job.external_id == "1000000000"))
+    stale_job.job_title = "Old parser title"
+    removed_job = db.scalar(select(Job).where(Job.external_id == "1000000002"))
+    removed_job.job_url = "https://www.linkedin.com/jobs/view/999/"
+    removed_job.external_id = "999"
+    db.delete(db.scalar(select(Job).where(Job.external_id == "1000000011")))
+    db.commit()
+    statements: list[str] = []
+
+    @event.listens_for(db.get_bind(), "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement.split()[0])
+
+    result = reextract_emails(db, apply=True, chunk_size=10, progress=lambda message: None)
+
+    assert (result.emails_selected, result.emails_reextracted) == (3, 3)
+    assert (result.jobs_updated, result.jobs_created, result.jobs_removed) == (7, 2, 1)
+    assert db.get(Job, stale_job.id).job_title != "Old parser title"
+    assert db.get(Job, removed_job.id) is None
+    assert {email.parser_version for email in db.scalars(select(ProcessedEmail))} == {LinkedInEmailParser.version}
+    emails = db.scalars(select(ProcessedEmail).order_by(ProcessedEmail.id)).all()
+    assert [email.jobs_extracted_count for email in emails] == [3, 3, 3, 1]
+    assert statements.count("UPDATE") == 2
+    assert statements.count("DELETE") == 1
+    assert statements.count("INSERT") == 1
+
+
+def test_reextract_dry_run_leaves_rows_untouched() -> None:
+    db = _session()
+    db.add(_email(0, [1_000_000_001], parser_version=0))
+    db.commit()
+    ExtractionService().run_pending(db)
+    email = db.scalar(select(ProcessedEmail))
+    email.parser_version = 0
+    db.commit()
+
+    result = reextract_emails(db, apply=False, progress=lambda message: None)
+
+    assert (result.emails_selected, result.jobs_updated) == (1, 1)
+    assert db.scalar(select(ProcessedEmail)).parser_version == 0